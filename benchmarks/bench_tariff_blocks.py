@@ -0,0 +1,74 @@
+"""Benchmark: tariff block lookups, rule evaluation vs. precomputed tables.
+
+Run from the repository root:
+
+    python benchmarks/bench_tariff_blocks.py
+"""
+from __future__ import annotations
+
+import datetime
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from custom_components.gv_smart_home.helpers import energy  # noqa: E402
+
+NUMBER = 20_000
+NOW = datetime.datetime(2025, 3, 14, 13, 37)
+
+
+def _reference_prev_next(now: datetime.datetime) -> tuple[int, int, int]:
+    """Three rule evaluations, as get_prev_next_block_info() did before tables."""
+    prev = now - datetime.timedelta(hours=1)
+    nxt = now + datetime.timedelta(hours=1)
+    return (
+        energy._compute_block(prev.date(), prev.hour),
+        energy._compute_block(now.date(), now.hour),
+        energy._compute_block(nxt.date(), nxt.hour),
+    )
+
+
+def _per_call_us(stmt, number: int = NUMBER) -> float:
+    return min(timeit.repeat(stmt, number=number, repeat=5)) / number * 1e6
+
+
+def main() -> None:
+    date = NOW.date()
+    hour = NOW.hour
+
+    # Warm the table so we measure steady-state lookups
+    energy.get_current_block(date, hour)
+
+    cases = [
+        (
+            "get_current_block",
+            lambda: energy._compute_block(date, hour),
+            lambda: energy.get_current_block(date, hour),
+        ),
+        (
+            "get_prev_next_block_info",
+            lambda: _reference_prev_next(NOW),
+            lambda: energy.get_prev_next_block_info(NOW),
+        ),
+        (
+            "get_blocks_for_today",
+            lambda: [energy._compute_block(date, h) for h in range(24)],
+            lambda: energy.get_blocks_for_today(date),
+        ),
+    ]
+
+    print(f"{'function':<28}{'rules (us)':>12}{'table (us)':>12}{'speedup':>10}")
+    for name, reference, fast in cases:
+        ref_us = _per_call_us(reference)
+        fast_us = _per_call_us(fast)
+        print(f"{name:<28}{ref_us:>12.3f}{fast_us:>12.3f}{ref_us / fast_us:>9.1f}x")
+
+    energy.invalidate_block_tables()
+    build_ms = _per_call_us(lambda: energy._build_block_table(date.year), number=20) / 1000
+    print(f"\nbuild one year table: {build_ms:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+"""Benchmark suite for the hot paths, checked against stored baselines.
+
+Run from the repository root:
+
+    python benchmarks/run_benchmarks.py            # compare with baseline.json
+    python benchmarks/run_benchmarks.py --save     # record a new baseline
+
+Exits with status 1 if any case is slower than its baseline by more than
+the threshold (default 25 %). Each case counts its best time over several
+rounds. Baselines are machine specific: record them on the release
+hardware (the Raspberry Pi), on an otherwise idle system, before relying
+on the check.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import datetime
+import json
+import sys
+import time
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from custom_components.gv_smart_home.const import (  # noqa: E402
+    CONF_INSTRUMENTATION,
+    CONF_SAMPLING_MODE,
+    DECISION_TRACE_CAPACITY,
+    HC_SAMPLING_MODE_EVENT,
+    SCHEDULER_TICK_SECONDS,
+)
+from custom_components.gv_smart_home.consumption_sampler import HC_EVENT_MAX_SAMPLES  # noqa: E402
+from custom_components.gv_smart_home.decision_trace import DecisionTrace  # noqa: E402
+from custom_components.gv_smart_home.helpers import (  # noqa: E402
+    get_current_block,
+    get_next_holiday,
+    get_prev_next_block_info,
+    is_holiday,
+)
+from custom_components.gv_smart_home.helpers.energy import get_blocks_for_today  # noqa: E402
+from custom_components.gv_smart_home.replay import ReplayEngine, ReplayFleet  # noqa: E402
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+DEFAULT_THRESHOLD = 0.25
+DEFAULT_ROUNDS = 3
+REPEAT = 5
+
+NOW = datetime.datetime(2025, 3, 14, 13, 37)
+CONFIG = {
+    "block_1_power": 5,
+    "block_2_power": 6,
+    "block_3_power": 7,
+    "block_4_power": 8,
+    "block_5_power": 9,
+}
+# Up to a full event-mode buffer
+BUFFER_SIZES = (10, 100, 1000, HC_EVENT_MAX_SAMPLES)
+# Shared scheduler load: entries spread over sites (one grid sensor each)
+FLEET_ENTRIES = 50
+FLEET_SITES = 10
+FLEET_TICKS = 60
+
+
+def _per_call_us(stmt, number: int) -> float:
+    return min(timeit.repeat(stmt, number=number, repeat=REPEAT)) / number * 1e6
+
+
+def _filled_controller(samples: int, mode: str | None = None, instrumentation: bool = False):
+    """Controller whose sampler holds `samples` samples ending now."""
+    config = {**CONFIG, CONF_INSTRUMENTATION: instrumentation}
+    if mode:
+        config[CONF_SAMPLING_MODE] = mode
+    engine = ReplayEngine(config, plugged_in=("wallbox",))
+    step = datetime.timedelta(seconds=max(900 / samples, 0.05))
+    start = NOW - step * samples
+    hass, clock, sampler, controller = engine.build(start)
+    for i in range(samples):
+        moment = start + step * i
+        clock.set(moment)
+        sampler._record(moment, -1500 - (i % 7) * 100)
+    clock.set(NOW)
+    return hass, clock, sampler, controller
+
+
+def bench_tariff() -> dict[str, float]:
+    date = NOW.date()
+    hour = NOW.hour
+    get_current_block(date, hour)  # warm the table
+    return {
+        "get_current_block": _per_call_us(lambda: get_current_block(date, hour), 50_000),
+        "get_prev_next_block_info": _per_call_us(lambda: get_prev_next_block_info(NOW), 20_000),
+        "get_blocks_for_today": _per_call_us(lambda: get_blocks_for_today(date), 20_000),
+        "is_holiday": _per_call_us(lambda: is_holiday(date), 50_000),
+        "get_next_holiday": _per_call_us(lambda: get_next_holiday(date), 20_000),
+    }
+
+
+def bench_sampler() -> dict[str, float]:
+    results = {}
+
+    hass, clock, sampler, controller = _filled_controller(100)
+    hass.set_state(controller.coordinator.settings.grid_entity, "-1500")
+    moment = [NOW]
+    tick = datetime.timedelta(seconds=10)
+
+    def sample():
+        moment[0] += tick
+        clock.set(moment[0])
+        sampler._sample_now(None)
+
+    results["sample_now"] = _per_call_us(sample, 10_000)
+
+    for size in BUFFER_SIZES:
+        _, _, _, controller = _filled_controller(size, HC_SAMPLING_MODE_EVENT)
+        results[f"average_grid_power_{size}"] = _per_call_us(
+            controller.compute_average_grid_power, 10_000
+        )
+    return results
+
+
+def bench_control_tick(number: int = 2_000) -> dict[str, float]:
+    async def run(controller) -> float:
+        best = float("inf")
+        for _ in range(REPEAT):
+            started = time.perf_counter()
+            for _ in range(number):
+                await controller.async_control_tick(None)
+            best = min(best, time.perf_counter() - started)
+        return best / number * 1e6
+
+    # the instrumented case shows the cost of the timers when enabled
+    return {
+        "async_control_tick": asyncio.run(run(_filled_controller(100)[3])),
+        "async_control_tick_instrumented": asyncio.run(
+            run(_filled_controller(100, instrumentation=True)[3])
+        ),
+        "decision_trace_record": bench_trace_record(),
+    }
+
+
+def bench_trace_record() -> float:
+    """One decision trace record, as every control tick writes it."""
+    trace = DecisionTrace(DECISION_TRACE_CAPACITY)
+    available = {"wallbox": True, "mg4": False}
+    allocation = {"wallbox": 6, "mg4": 0}
+
+    def record():
+        trace.record(
+            NOW, -1500, -1480, -1450.0, None, 4140.0, 3, 2, 23, 7000, 7000,
+            -5600.0, 1400.0, None, 5540, 5540, 4800, available, allocation, "normal", 60.0,
+        )
+
+    return _per_call_us(record, 20_000)
+
+
+def bench_scheduler() -> dict[str, float]:
+    """Mean event loop time per shared scheduler tick for a fleet.
+
+    Every tick samples all entries; the control ticks come due every few
+    ticks, as in the live loop.
+    """
+    fleet = ReplayFleet(CONFIG, FLEET_ENTRIES, FLEET_SITES, NOW)
+
+    async def run() -> float:
+        await fleet.async_start()
+        total = 0.0
+        for _ in range(FLEET_TICKS):
+            total += await fleet.async_tick(SCHEDULER_TICK_SECONDS)
+        return total / FLEET_TICKS * 1e6
+
+    return {f"scheduler_tick_{FLEET_ENTRIES}_entries": asyncio.run(run())}
+
+
+def run_all(rounds: int) -> dict[str, float]:
+    """Best timing per case over several rounds.
+
+    Interleaving the rounds keeps a burst of background load from skewing
+    a single case.
+    """
+    results: dict[str, float] = {}
+    for _ in range(rounds):
+        for bench in (bench_tariff, bench_sampler, bench_control_tick, bench_scheduler):
+            for name, value in bench().items():
+                results[name] = min(results.get(name, float("inf")), value)
+    return results
+
+
+def compare(results: dict[str, float], baseline: dict[str, float], threshold: float) -> list[str]:
+    """Print a table and return the names of regressed cases."""
+    regressions = []
+    print(f"{'case':<28}{'baseline':>12}{'now (us)':>12}{'change':>10}")
+    for name, value in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:<28}{'-':>12}{value:>12.3f}{'new':>10}")
+            continue
+        change = value / base - 1
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<28}{base:>12.3f}{value:>12.3f}{change:>+9.0%}{flag}")
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="GV Smart Home hot-path benchmarks")
+    parser.add_argument("--save", action="store_true", help="store the results as the baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown as a fraction (default 0.25)")
+    parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS,
+                        help="rounds over all cases; the best time counts")
+    args = parser.parse_args(argv)
+
+    results = run_all(args.rounds)
+
+    if args.save:
+        baseline = {name: round(value, 3) for name, value in results.items()}
+        BASELINE_PATH.write_text(json.dumps(baseline, indent=2) + "\n")
+        print(f"Baseline written to {BASELINE_PATH}")
+        return 0
+
+    baseline = json.loads(BASELINE_PATH.read_text()) if BASELINE_PATH.exists() else {}
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} case(s) regressed by more than {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,30 +1,43 @@
 from __future__ import annotations
 
+import importlib
 import logging
+import time
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.start import async_at_started
 from homeassistant.helpers.typing import ConfigType
 
-from .const import DOMAIN
-from .consumption_sampler import ConsumptionSampler
-from .charge_controller import HomeChargingController
+from .const import DOMAIN, LEGACY_CHARGING_DEVICE_ID, LIVE_TUNABLE_KEYS
+from .coordinator import GVChargingCoordinator, charging_device_id
+from .services import async_setup_services
+from .store import GVStateStore
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS: list[Platform] = [
     Platform.SENSOR,
+    Platform.NUMBER,
 ]
 
 
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
-    """YAML setup (not used)."""
+    """Set up the domain services (YAML config is not used)."""
+    async_setup_services(hass)
     return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    """Set up GV Smart Home from a config entry."""
+    """Set up GV Smart Home from a config entry.
+
+    Setup is staged: only the coordinator and its lightweight entities are
+    created here. Sampling and control start once Home Assistant has
+    started (see _async_start_runtime), so they stay off the boot path.
+    """
     _LOGGER.debug("Setting up GV Smart Home entry: %s", entry.entry_id)
+    started = time.perf_counter()
 
     # Prepare domain storage
     hass.data.setdefault(DOMAIN, {})
@@ -34,43 +47,112 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # ----------------------------------------------------------
     # 1) Create coordinator (must receive entry!)
     # ----------------------------------------------------------
-    from .coordinator import GVChargingCoordinator
     coordinator = GVChargingCoordinator(hass, entry)
     data["coordinator"] = coordinator
+    _migrate_charging_device(hass, entry)
+
+    # ----------------------------------------------------------
+    # 2) Setup sensor platform(s); their values arrive once the
+    #    controller runs
+    # ----------------------------------------------------------
+    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+
+    # ----------------------------------------------------------
+    # 3) Start sampling and control after Home Assistant started
+    #    (right away when the entry is reloaded)
+    # ----------------------------------------------------------
+    async def start_runtime(hass: HomeAssistant) -> None:
+        await _async_start_runtime(hass, entry)
+
+    entry.async_on_unload(async_at_started(hass, start_runtime))
+
+    # ----------------------------------------------------------
+    # 4) Setup live reload when options change
+    # ----------------------------------------------------------
+    entry.async_on_unload(
+        entry.add_update_listener(async_reload_entry)
+    )
+
+    setup_ms = round((time.perf_counter() - started) * 1000, 1)
+    await coordinator.async_set(setup_ms=setup_ms)
+    _LOGGER.debug("GV Smart Home entry set up in %.1f ms", setup_ms)
+    return True
+
+
+async def _async_start_runtime(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Second setup stage: restore the runtime state, start sampling and control.
+
+    The sampler, controller and scheduler modules are only imported here,
+    in the import executor so loading them does not block the event loop.
+    """
+    started = time.perf_counter()
+    controller_module, sampler_module, scheduler_module = [
+        await hass.async_add_import_executor_job(importlib.import_module, f"{__name__}.{name}")
+        for name in ("charge_controller", "consumption_sampler", "scheduler")
+    ]
+
+    data = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+    if data is None:
+        return
+    coordinator = data["coordinator"]
+
+    # ----------------------------------------------------------
+    # 1) Load persisted runtime state (history, ramp)
+    # ----------------------------------------------------------
+    store = GVStateStore(hass, entry.entry_id)
+    stored = await store.async_load() or {}
+    if hass.data.get(DOMAIN, {}).get(entry.entry_id) is not data:
+        return  # unloaded while loading
+    data["store"] = store
 
     # ----------------------------------------------------------
     # 2) Create sampler (needs coordinator!)
+    #    Sampling and control of all entries share one timer
     # ----------------------------------------------------------
-    sampler = ConsumptionSampler(hass, entry, coordinator)
+    scheduler = scheduler_module.async_get_scheduler(hass)
+    sampler = sampler_module.ConsumptionSampler(hass, entry, coordinator, scheduler=scheduler)
+    sampler.restore(stored.get("sampler", {}))
     await sampler.start()
     data["sampler"] = sampler
 
     # ----------------------------------------------------------
     # 3) Create charging controller (also needs coordinator!)
     # ----------------------------------------------------------
-    controller = HomeChargingController(
+    controller = controller_module.HomeChargingController(
         hass=hass,
         sampler=sampler,
         entry=entry,
         coordinator=coordinator,
+        scheduler=scheduler,
     )
+    controller.restore(stored.get("controller", {}), stored.get("saved_at"))
     controller.start()
     data["controller"] = controller
 
-    # ----------------------------------------------------------
-    # 4) Setup sensor platform(s)
-    # ----------------------------------------------------------
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
-
-    # ----------------------------------------------------------
-    # 5) Setup live reload when options change
-    # ----------------------------------------------------------
-    entry.async_on_unload(
-        entry.add_update_listener(async_reload_entry)
+    store.start(
+        lambda: {"sampler": sampler.dump(), "controller": controller.dump()}
     )
 
-    _LOGGER.debug("GV Smart Home entry initialized successfully.")
-    return True
+    startup_ms = round((time.perf_counter() - started) * 1000, 1)
+    await coordinator.async_set(startup_ms=startup_ms)
+    _LOGGER.debug("GV Smart Home entry %s started in %.1f ms", entry.entry_id, startup_ms)
+
+
+@callback
+def _migrate_charging_device(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Give the device all entries used to share to this entry.
+
+    Keeps the entities, areas and names of single-entry installs on the
+    same device; other entries get a device of their own.
+    """
+    registry = dr.async_get(hass)
+    device = registry.async_get_device(identifiers={(DOMAIN, LEGACY_CHARGING_DEVICE_ID)})
+    if device is None or entry.entry_id not in device.config_entries:
+        return
+    registry.async_update_device(
+        device.id, new_identifiers={(DOMAIN, charging_device_id(entry.entry_id))}
+    )
+    _LOGGER.debug("Moved the shared charging device to entry %s", entry.entry_id)
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -80,6 +162,7 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     if data:
         sampler = data.get("sampler")
         controller = data.get("controller")
+        store = data.get("store")
 
         if sampler:
             await sampler.stop()
@@ -87,11 +170,33 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         if controller:
             controller.stop()
 
+        # Save last, so the stored state reflects the stopped components
+        if store:
+            await store.async_stop()
+
         hass.data[DOMAIN].pop(entry.entry_id, None)
 
     return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete persisted state when the entry is removed."""
+    await GVStateStore(hass, entry.entry_id).async_remove()
+
+
 async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry):
-    """Reload when user changes configuration in UI."""
+    """Reload when user changes configuration in UI.
+
+    Changes that only touch live-tunable values (block limits, ramp) are
+    applied in place: running components read them on their next tick.
+    """
+    data = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+    if data:
+        coordinator = data["coordinator"]
+        changed = coordinator.apply_config_update()
+        if changed <= LIVE_TUNABLE_KEYS:
+            _LOGGER.debug("Applied %s without reload", sorted(changed))
+            coordinator.async_update_listeners()
+            return
+
     await hass.config_entries.async_reload(entry.entry_id)
@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+from typing import Optional
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+
+from .allocation import ChargerSpec
+from .clock import Clock, SYSTEM_CLOCK
+from .const import ACTUATOR_TIMEOUT_SECONDS
+
+_LOGGER = logging.getLogger(__name__)
+
+_AMPS_RE = re.compile(r"\d+(?:\.\d+)?")
+
+
+def parse_amps(value) -> Optional[float]:
+    """Amps from a number state or a select option like "16A"."""
+    if value is None:
+        return None
+    match = _AMPS_RE.search(str(value))
+    return float(match.group()) if match else None
+
+
+def pick_select_option(options: list[str], amps: int) -> Optional[str]:
+    """Largest option not above amps, or the smallest option if none is.
+
+    0 A is never rounded up: without an option for it there is no match.
+    """
+    parsed: list[tuple[float, str]] = []
+    for option in options:
+        value = parse_amps(option)
+        if value is not None:
+            parsed.append((value, option))
+    if not parsed:
+        return None
+    below = [item for item in parsed if item[0] <= amps]
+    if below:
+        return max(below)[1]
+    if amps <= 0:
+        return None
+    return min(parsed)[1]
+
+
+class ChargerActuator:
+    """Writes the current setpoint of one charger.
+
+    Setpoints identical to the last one written are dropped, and increases
+    are rate-limited so cloud-backed entities are not called every tick.
+
+    0 A is never raised to the entity's minimum. Where the entity cannot
+    take 0, charging is stopped with the charger's pause switch (and the
+    switch is turned back on with the next current); without a switch the
+    write is skipped with a warning.
+    """
+
+    def __init__(self, hass: HomeAssistant, spec: ChargerSpec):
+        self.hass = hass
+        self.spec = spec
+        self.last_amps: Optional[int] = None
+        self._last_change: Optional[float] = None
+
+        self.writes = 0
+        self.skipped = 0
+        self.failures = 0
+        self._warned = False
+
+    def plan(self, amps: int, now: float) -> Optional[tuple[str, str, dict, int]]:
+        """Service call and the amps it sets, or None if nothing needs to be written."""
+        if not self.spec.entity_id:
+            return None
+
+        amps = min(amps, self.spec.max_amps)
+        if amps == self.last_amps:
+            self.skipped += 1
+            return None
+
+        if (
+            self.last_amps is not None
+            and amps > self.last_amps
+            and self._last_change is not None
+            and now - self._last_change < self.spec.min_interval_s
+        ):
+            self.skipped += 1
+            return None
+
+        return self._service_call(self.spec.entity_id, amps)
+
+    def _service_call(self, entity_id: str, amps: int) -> Optional[tuple[str, str, dict, int]]:
+        domain = entity_id.split(".", 1)[0]
+        state = self.hass.states.get(entity_id)
+        attributes = state.attributes if state else {}
+
+        if domain in ("select", "input_select"):
+            options = list(attributes.get("options") or [])
+            option = pick_select_option(options, amps)
+            if option is None:
+                if amps <= 0 and any(parse_amps(item) is not None for item in options):
+                    return self._pause_call()
+                self._warn_once("no usable current options on %s", entity_id)
+                return None
+            written = int(parse_amps(option) or 0)
+            if state is not None and state.state == option and not self._paused(written):
+                self.last_amps = written
+                return None
+            return domain, "select_option", {"entity_id": entity_id, "option": option}, written
+
+        if domain in ("number", "input_number"):
+            if amps <= 0 and float(attributes.get("min", 0)) > 0:
+                return self._pause_call()
+            value = float(amps)
+            if "min" in attributes:
+                value = max(value, float(attributes["min"]))
+            if "max" in attributes:
+                value = min(value, float(attributes["max"]))
+            if state is not None and parse_amps(state.state) == value and not self._paused(value):
+                self.last_amps = int(value)
+                return None
+            return domain, "set_value", {"entity_id": entity_id, "value": value}, int(value)
+
+        self._warn_once("unsupported current entity %s", entity_id)
+        return None
+
+    def _paused(self, amps: float) -> bool:
+        """True if the pause switch is off while amps should flow."""
+        pause = self.spec.pause_entity_id
+        if amps <= 0 or not pause:
+            return False
+        state = self.hass.states.get(pause)
+        return state is not None and state.state == "off"
+
+    def _pause_call(self) -> Optional[tuple[str, str, dict, int]]:
+        """Stop charging where the current entity cannot be set to 0 A."""
+        pause = self.spec.pause_entity_id
+        if not pause:
+            self._warn_once(
+                "%s cannot be set to 0 A and no pause switch is configured;"
+                " the charger keeps its last current", self.spec.entity_id,
+            )
+            return None
+        state = self.hass.states.get(pause)
+        if state is not None and state.state == "off":
+            self.last_amps = 0
+            return None
+        return pause.split(".", 1)[0], "turn_off", {"entity_id": pause}, 0
+
+    def _warn_once(self, message: str, *args) -> None:
+        if not self._warned:
+            self._warned = True
+            _LOGGER.warning("%s: " + message, self.spec.name, *args)
+
+    async def async_write(self, domain: str, service: str, data: dict, amps: int, now: float) -> bool:
+        # Counts as a change even if it fails, so a failing API is not
+        # retried faster than the rate limit allows
+        self._last_change = now
+        try:
+            await asyncio.wait_for(
+                self.hass.services.async_call(domain, service, data, blocking=True),
+                timeout=ACTUATOR_TIMEOUT_SECONDS,
+            )
+            pause = self.spec.pause_entity_id
+            if pause and self._paused(amps):
+                # resume after a pause, with the new current already set
+                await asyncio.wait_for(
+                    self.hass.services.async_call(
+                        pause.split(".", 1)[0], "turn_on", {"entity_id": pause}, blocking=True
+                    ),
+                    timeout=ACTUATOR_TIMEOUT_SECONDS,
+                )
+        except asyncio.TimeoutError:
+            self.failures += 1
+            _LOGGER.warning("%s: setting %s A timed out", self.spec.name, amps)
+            return False
+        except HomeAssistantError as err:
+            self.failures += 1
+            _LOGGER.warning("%s: setting %s A failed: %s", self.spec.name, amps, err)
+            return False
+        except Exception:  # noqa: BLE001 - a broken integration must not stop the other chargers
+            self.failures += 1
+            _LOGGER.exception("%s: setting %s A failed", self.spec.name, amps)
+            return False
+
+        self.writes += 1
+        self.last_amps = amps
+        _LOGGER.debug("%s: set %s to %s A", self.spec.name, data["entity_id"], amps)
+        return True
+
+
+class ChargingActuator:
+    """Applies per-charger current setpoints; service calls run concurrently."""
+
+    def __init__(self, hass: HomeAssistant, specs: list[ChargerSpec], clock: Clock = SYSTEM_CLOCK):
+        self.chargers = {spec.name: ChargerActuator(hass, spec) for spec in specs}
+        self.clock = clock
+
+    async def async_apply(self, targets_a: dict[str, int]) -> None:
+        now = self.clock.monotonic()
+        writes = []
+        for name, amps in targets_a.items():
+            charger = self.chargers.get(name)
+            if charger is None:
+                continue
+            call = charger.plan(amps, now)
+            if call is not None:
+                writes.append(charger.async_write(*call, now))
+
+        if writes:
+            results = await asyncio.gather(*writes, return_exceptions=True)
+            for result in results:
+                if isinstance(result, Exception):
+                    _LOGGER.error("Charger setpoint write failed", exc_info=result)
+
+    def setpoints(self) -> dict[str, Optional[int]]:
+        return {name: charger.last_amps for name, charger in self.chargers.items()}
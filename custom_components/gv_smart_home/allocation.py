@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Mapping, Optional, Sequence
+
+from .const import (
+    CHARGER_VOLTAGE_V,
+    CHARGER_MIN_AMPS,
+    ALLOCATION_POLICY_PRIORITY,
+)
+
+
+@dataclass(frozen=True, slots=True)
+class ChargerSpec:
+    """Static description of one charger and its current setpoint entity."""
+
+    name: str
+    entity_id: Optional[str]
+    phases: int
+    max_amps: int
+    # Lower value is served first
+    priority: int
+    # Minimum time between two increases; decreases are never delayed
+    min_interval_s: float
+    min_amps: int = CHARGER_MIN_AMPS
+    # Switch that stops charging where the current entity cannot be set to 0
+    pause_entity_id: Optional[str] = None
+
+
+def watts_to_amps(power_w: float, phases: int, voltage_v: float = CHARGER_VOLTAGE_V) -> int:
+    """Whole amps per phase that stay within power_w (0 below the EV minimum)."""
+    if power_w <= 0:
+        return 0
+    amps = int(power_w // (voltage_v * phases))
+    return amps if amps >= CHARGER_MIN_AMPS else 0
+
+
+def amps_to_watts(amps: float, phases: int, voltage_v: float = CHARGER_VOLTAGE_V) -> int:
+    return int(amps * phases * voltage_v)
+
+
+def allocate(
+    power_w: float,
+    chargers: Sequence[ChargerSpec],
+    available: Mapping[str, bool],
+    policy: str = ALLOCATION_POLICY_PRIORITY,
+    voltage_v: float = CHARGER_VOLTAGE_V,
+) -> dict[str, int]:
+    """Split power_w into whole amps per phase for each charger.
+
+    A charger only gets current if at least its minimum fits. With the
+    priority policy chargers are filled one after another; with fair share
+    every admitted charger first gets its minimum and the rest is handed
+    out one amp at a time to the charger drawing the least power. The
+    work is bounded by the number of amp steps, not by power_w.
+    """
+    result = {spec.name: 0 for spec in chargers}
+    remaining = max(float(power_w), 0.0)
+    active = sorted(
+        (spec for spec in chargers if available.get(spec.name)),
+        key=lambda spec: spec.priority,
+    )
+
+    if policy == ALLOCATION_POLICY_PRIORITY:
+        for spec in active:
+            step_w = voltage_v * spec.phases
+            amps = min(spec.max_amps, int(remaining // step_w))
+            if amps < spec.min_amps:
+                continue
+            result[spec.name] = amps
+            remaining -= amps * step_w
+        return result
+
+    admitted = []
+    for spec in active:
+        min_w = spec.min_amps * voltage_v * spec.phases
+        if min_w <= remaining:
+            result[spec.name] = spec.min_amps
+            remaining -= min_w
+            admitted.append(spec)
+
+    while True:
+        best = None
+        best_w = 0.0
+        for spec in admitted:
+            step_w = voltage_v * spec.phases
+            if result[spec.name] >= spec.max_amps or step_w > remaining:
+                continue
+            drawn_w = result[spec.name] * step_w
+            if best is None or drawn_w < best_w:
+                best, best_w = spec, drawn_w
+        if best is None:
+            return result
+        result[best.name] += 1
+        remaining -= voltage_v * best.phases
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import math
+from datetime import datetime
+from typing import Optional
+
+from .const import BILLING_INTERVAL_MINUTES, BILLING_MIN_REMAINING_SECONDS
+
+BILLING_INTERVAL_SECONDS = BILLING_INTERVAL_MINUTES * 60
+
+
+def interval_start(moment: datetime) -> datetime:
+    """Start of the wall-clock aligned billing interval containing moment."""
+    return moment.replace(
+        minute=moment.minute - moment.minute % BILLING_INTERVAL_MINUTES,
+        second=0,
+        microsecond=0,
+    )
+
+
+class BillingIntervalTracker:
+    """Grid import energy within the current billing interval.
+
+    The network tariff bills the average import power of wall-clock aligned
+    15-minute intervals. Grid power samples are integrated as held values
+    (negative = import, export counts as zero), so the tracker knows the
+    energy imported so far and can project the interval's final average.
+    """
+
+    __slots__ = (
+        "_start_ts",
+        "_end_ts",
+        "_energy_ws",
+        "_covered_s",
+        "_last_ts",
+        "_last_power",
+        "_moment",
+        "_moment_ts",
+        "_last_end_ts",
+        "_last_energy_ws",
+        "_last_covered_s",
+        "last_average_w",
+    )
+
+    def __init__(self) -> None:
+        self._start_ts = 0.0
+        self._end_ts = 0.0
+        self._energy_ws = 0.0
+        self._covered_s = 0.0
+        self._last_ts = 0.0
+        self._last_power: Optional[float] = None
+        # Moment the tracker was last advanced to; a control tick reads
+        # several values at the same moment
+        self._moment: Optional[datetime] = None
+        self._moment_ts = 0.0
+        # Average import of the last completed interval
+        self.last_average_w: Optional[float] = None
+        self._last_end_ts = 0.0
+        self._last_energy_ws = 0.0
+        self._last_covered_s = 0.0
+
+    # ------------------------------------------------------------------
+    # WRITE
+    # ------------------------------------------------------------------
+    def update(self, ts: datetime, grid_power_w: Optional[float]) -> None:
+        """Add a sample; its value is held until the next one."""
+        self._advance(ts)
+        if grid_power_w is None or math.isnan(grid_power_w):
+            self._last_power = None
+        else:
+            self._last_power = float(grid_power_w)
+
+    def _advance(self, moment: datetime) -> float:
+        """Integrate up to moment; returns its timestamp."""
+        if moment is self._moment:
+            return self._moment_ts
+        ts = moment.timestamp()
+        first = self._moment is None
+        self._moment = moment
+        self._moment_ts = ts
+        if first:
+            self._open(moment)
+            self._last_ts = ts
+            return ts
+
+        while ts >= self._end_ts:
+            self._integrate(self._end_ts)
+            self.last_average_w = self._energy_ws / BILLING_INTERVAL_SECONDS
+            self._last_end_ts = self._end_ts
+            self._last_energy_ws = self._energy_ws
+            self._last_covered_s = self._covered_s
+            self._start_ts = self._end_ts
+            self._end_ts = self._start_ts + BILLING_INTERVAL_SECONDS
+            self._energy_ws = 0.0
+            self._covered_s = 0.0
+            if ts >= self._end_ts:
+                # Gap of more than one interval: realign to the wall clock
+                self._open(moment)
+                self._last_ts = max(self._last_ts, self._start_ts)
+        self._integrate(ts)
+        return ts
+
+    def _open(self, moment: datetime) -> None:
+        self._start_ts = interval_start(moment).timestamp()
+        self._end_ts = self._start_ts + BILLING_INTERVAL_SECONDS
+        self._energy_ws = 0.0
+        self._covered_s = 0.0
+
+    def _integrate(self, ts: float) -> None:
+        dt = ts - self._last_ts
+        if dt <= 0:
+            return
+        if self._last_power is not None:
+            self._energy_ws += max(-self._last_power, 0.0) * dt
+            self._covered_s += dt
+        self._last_ts = ts
+
+    # ------------------------------------------------------------------
+    # READ
+    # ------------------------------------------------------------------
+    def energy_ws(self, now: datetime, grid_power_w: Optional[float] = None) -> float:
+        """Estimated import energy of the current interval up to now.
+
+        Parts of the interval without data (before start-up or while the
+        sensor was unknown) are filled with the average of the known part,
+        or with grid_power_w if nothing is known yet.
+        """
+        elapsed = self._advance(now) - self._start_ts
+        missing = max(elapsed - self._covered_s, 0.0)
+        if not missing:
+            return self._energy_ws
+        if self._covered_s > 0:
+            fill_w = self._energy_ws / self._covered_s
+        else:
+            fill_w = max(-(grid_power_w or 0.0), 0.0)
+        return self._energy_ws + fill_w * missing
+
+    def completed_average_w(self, now: datetime) -> Optional[float]:
+        """Average import of the interval that ended when the current one began.
+
+        Averaged over the part with data; None if that interval had none
+        or was skipped by a gap.
+        """
+        self._advance(now)
+        if self._last_end_ts != self._start_ts or not self._last_covered_s:
+            return None
+        return self._last_energy_ws / self._last_covered_s
+
+    def remaining_seconds(self, now: datetime) -> float:
+        return self._end_ts - self._advance(now)
+
+    def projected_average_w(self, now: datetime, grid_power_w: float) -> float:
+        """Interval average import if grid_power_w holds until its end."""
+        energy = self.energy_ws(now, grid_power_w)
+        remaining = self.remaining_seconds(now)
+        return (energy + max(-grid_power_w, 0.0) * remaining) / BILLING_INTERVAL_SECONDS
+
+    def headroom_w(self, now: datetime, limit_w: float, grid_power_w: float) -> float:
+        """Extra power that can be drawn for the rest of the interval.
+
+        Adding this on top of grid_power_w brings the interval's average
+        import exactly to limit_w; negative if the interval is already
+        heading over it. The remaining time is floored so the budget does
+        not explode in the last seconds of an interval.
+        """
+        energy = self.energy_ws(now, grid_power_w)
+        remaining = max(self.remaining_seconds(now), BILLING_MIN_REMAINING_SECONDS)
+        budget_w = (limit_w * BILLING_INTERVAL_SECONDS - energy) / remaining
+        return budget_w + grid_power_w
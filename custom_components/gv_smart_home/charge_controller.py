@@ -1,71 +1,315 @@
 from __future__ import annotations
+import asyncio
 import logging
+import math
+import struct
+import time
+import zlib
 from collections import deque
-from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Optional, Any
 
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
 from homeassistant.config_entries import ConfigEntry
 
-from .coordinator import GVChargingCoordinator
+from .actuator import ChargingActuator
+from .allocation import ChargerSpec, allocate, amps_to_watts
+from .charge_planner import SLOT, ChargePlan, ChargeTarget, plan_charging
+from .charger_state import ChargerState, ChargerStateCache
+from .clock import Clock, SYSTEM_CLOCK
+from .coordinator import ControlCoordinator
+from .decision_trace import DecisionTrace
+from .instrumentation import (
+    LATE_TICKS,
+    MISSED_TICKS,
+    SAMPLE_GAPS,
+    SAMPLES_UNAVAILABLE,
+    STAGE_ACTUATION,
+    STAGE_AVERAGING,
+    STAGE_CONTROL_TICK,
+    STAGE_COORDINATOR_PUSH,
+    STAGE_SAMPLE,
+    STAGE_STATE_EVALUATION,
+    STAGE_TICK_LATENESS,
+    Instrumentation,
+)
+from .load_forecaster import LoadForecaster, slot_of, slot_start
+from .store import decode_blob, encode_blob
 from .const import (
-    CONF_WB_POWER, CONF_WB_SET_CURRENT,
-    CONF_WB_CABLE, CONF_WB_STATUS,
-    CONF_MG_ACTIVE, CONF_MG_SET_CURRENT, CONF_MG_GUN_STATE,
-    CC_INTERVAL_MINUTES, RAMP_DOWN_MINUTES_BEFORE,
-    RAMP_UP_MAX_STEP_W, HC_WINDOW_MINUTES
+    CC_INTERVAL_MINUTES, CC_FAST_INTERVAL_SECONDS, CC_IDLE_INTERVAL_SECONDS,
+    CC_FAST_HEADROOM_W, CC_FAST_TRANSITION_MINUTES, RAMP_DOWN_MINUTES_BEFORE,
+    RAMP_UP_MAX_STEP_W, HC_WINDOW_MINUTES, HC_SPIKE_WINDOW_MINUTES,
+    FC_HORIZON_MINUTES, FC_QUANTILE,
+    WB_PHASES, WB_MAX_AMPS, WB_PRIORITY, WB_MIN_CHANGE_INTERVAL_SECONDS,
+    MG_PHASES, MG_MAX_AMPS, MG_PRIORITY, MG_MIN_CHANGE_INTERVAL_SECONDS,
+    INSTR_LATE_TICK_SECONDS, DECISION_TRACE_CAPACITY,
 )
 
 _LOGGER = logging.getLogger(__name__)
 CONTROL_INTERVAL = timedelta(minutes=CC_INTERVAL_MINUTES)
 
 
-@dataclass
-class ChargerState:
-    available: bool
-    state: str
-    reasons: list[str]
+class HomeChargingController:
+    """EV charging logic controller.
+
+    The control loop reschedules itself after every tick: fast while the
+    headroom is small or a block transition is close, slow while no charger
+    can take power. Charger plug-in events wake it immediately.
 
+    With a charge target set, the charging power is further capped by the
+    departure plan, which is recomputed on every tick.
 
-class HomeChargingController:
-    """EV charging logic controller (1-minute interval)."""
+    The inputs and outputs of every tick are kept in a bounded decision
+    trace.
+    """
 
-    def __init__(self, hass: HomeAssistant, sampler, entry: ConfigEntry, coordinator: GVChargingCoordinator):
+    def __init__(
+        self, hass: HomeAssistant, sampler, entry: Optional[ConfigEntry],
+        coordinator: ControlCoordinator, clock: Clock = SYSTEM_CLOCK,
+        scheduler=None,
+    ):
         self.hass = hass
+        self.clock = clock
+        # Shared GVScheduler; without one the loop runs its own timer
+        self.scheduler = scheduler
         self.sampler = sampler
         self.samples = sampler.samples
         self.entry = entry
         self.coordinator = coordinator
 
         self.last_target_power_w = 0
-        self._unsub_control = None
+        self._unsub_control: Optional[CALLBACK_TYPE] = None
+        self._running = False
+        self._tick_lock = asyncio.Lock()
+        self._wake_pending = False
+        self._last_tick_monotonic: Optional[float] = None
+        self._due_monotonic: Optional[float] = None
+        self._scheduled_delay_s = 0.0
+
+        # Scheduler state, published for inspection
+        self.interval_s: float = CONTROL_INTERVAL.total_seconds()
+        self.cadence = "normal"
+        self.tick_count = 0
+        self.wake_count = 0
+
+        self.forecaster = LoadForecaster()
+        self._last_slot: Optional[int] = None
+        # EV energy charged in the current slot and the time it covers
+        self._slot_ev_ws = 0.0
+        self._slot_ev_s = 0.0
+        self._held_ev_w = 0.0
+        self._last_learn_dt: Optional[datetime] = None
+
+        settings = coordinator.settings
+        self.chargers = [
+            ChargerSpec(
+                "wallbox", settings.wb_set_current,
+                WB_PHASES, WB_MAX_AMPS, WB_PRIORITY, WB_MIN_CHANGE_INTERVAL_SECONDS,
+            ),
+            ChargerSpec(
+                "mg4", settings.mg_set_current,
+                MG_PHASES, MG_MAX_AMPS, MG_PRIORITY, MG_MIN_CHANGE_INTERVAL_SECONDS,
+                pause_entity_id=settings.mg_active,
+            ),
+        ]
+        self.actuator = ChargingActuator(hass, self.chargers, clock)
+        self._allocated_w: dict[str, int] = {}
+
+        self.charger_cache = ChargerStateCache(hass, settings, self._handle_charger_change)
+
+        self.charge_target: Optional[ChargeTarget] = None
+        self.charge_plan: Optional[ChargePlan] = None
+        self._delivered_wh = 0.0
+        self._last_energy_monotonic: Optional[float] = None
+
+        self.trace = DecisionTrace(DECISION_TRACE_CAPACITY)
 
     # ------------------------------------------------------------------
     # START/STOP
     # ------------------------------------------------------------------
     def start(self):
-        self._unsub_control = async_track_time_interval(
-            self.hass, self.async_control_tick, CONTROL_INTERVAL
-        )
+        self._running = True
+        self.charger_cache.start()
+        self._schedule(self.interval_s)
         _LOGGER.debug("HomeChargingController started")
 
     def stop(self):
+        self._running = False
         if self._unsub_control:
             self._unsub_control()
             self._unsub_control = None
+        self.charger_cache.stop()
         _LOGGER.debug("HomeChargingController stopped")
 
+    # ------------------------------------------------------------------
+    # SCHEDULING
+    # ------------------------------------------------------------------
+    @callback
+    def _schedule(self, delay_s: float) -> None:
+        if self._unsub_control:
+            self._unsub_control()
+        self._due_monotonic = self.clock.monotonic() + delay_s
+        self._scheduled_delay_s = delay_s
+        if self.scheduler is not None:
+            self._unsub_control = self.scheduler.async_call_later(delay_s, self._handle_timer)
+        else:
+            self._unsub_control = async_call_later(self.hass, delay_s, self._handle_timer)
+
+    async def _handle_timer(self, now) -> None:
+        self._unsub_control = None
+        await self.async_run_tick(now)
+
+    async def async_run_tick(self, now=None) -> None:
+        """Run one control tick and schedule the next one."""
+        async with self._tick_lock:
+            self._wake_pending = False
+            self.tick_count += 1
+            inst = self.instrumentation()
+            if inst is not None:
+                self.record_lateness(inst)
+            try:
+                await self.async_control_tick(now)
+            finally:
+                if self._running:
+                    self._schedule(0 if self._wake_pending else self.interval_s)
+
+    @callback
+    def async_wake(self) -> None:
+        """Run a tick as soon as possible."""
+        if not self._running:
+            return
+        self.wake_count += 1
+        if self._tick_lock.locked():
+            self._wake_pending = True
+        else:
+            self._schedule(0)
+
+    @callback
+    def _handle_charger_change(self, name: str, old: ChargerState, new: ChargerState) -> None:
+        # plug-in, unplug or a charger becoming (un)available
+        self.async_wake()
+
+    def compute_next_interval(
+        self, headroom_w: float, minutes_to_next, ramp_down_minutes: int,
+        chargers_available: bool, interval_remaining_s: Optional[float] = None,
+        block_changes: bool = True,
+    ) -> tuple[str, float]:
+        """Cadence and delay until the next tick.
+
+        The transition to the next block only speeds up the cadence if the
+        block (and with it the limit) actually changes.
+        """
+        if not chargers_available:
+            return "idle", CC_IDLE_INTERVAL_SECONDS
+        if headroom_w < CC_FAST_HEADROOM_W:
+            return "fast", CC_FAST_INTERVAL_SECONDS
+        # the end of a billing interval resets the budget
+        if interval_remaining_s is not None and interval_remaining_s <= CC_FAST_TRANSITION_MINUTES * 60:
+            return "fast", CC_FAST_INTERVAL_SECONDS
+        if block_changes and minutes_to_next is not None and (
+            minutes_to_next <= CC_FAST_TRANSITION_MINUTES
+            or 0 <= minutes_to_next - ramp_down_minutes <= CC_FAST_TRANSITION_MINUTES
+        ):
+            return "fast", CC_FAST_INTERVAL_SECONDS
+        return "normal", CONTROL_INTERVAL.total_seconds()
+
+    def instrumentation(self) -> Optional[Instrumentation]:
+        """The entry's instrumentation while it is enabled, else None."""
+        if self.coordinator.settings.instrumentation:
+            return self.sampler.instrumentation
+        return None
+
+    def record_lateness(self, inst: Instrumentation) -> None:
+        """How far behind its due time this tick started."""
+        if self._due_monotonic is None:
+            return
+        lateness_s = max(self.clock.monotonic() - self._due_monotonic, 0.0)
+        inst.record(STAGE_TICK_LATENESS, lateness_s)
+        if lateness_s > INSTR_LATE_TICK_SECONDS:
+            inst.count(LATE_TICKS)
+        if self._scheduled_delay_s > 0 and lateness_s >= self._scheduled_delay_s:
+            inst.count(MISSED_TICKS, int(lateness_s // self._scheduled_delay_s))
+
+    def perf_values(self, inst: Optional[Instrumentation]) -> dict:
+        """Coordinator values for the diagnostic sensors (none while disabled)."""
+        if inst is None:
+            return {}
+        control_p95_us = inst.p95_us(STAGE_CONTROL_TICK)
+        last_tick_s = inst.last_s.get(STAGE_CONTROL_TICK)
+        return {
+            "perf_control_tick_ms": None if last_tick_s is None else round(last_tick_s * 1000, 2),
+            "perf_control_tick_p95_ms": None if control_p95_us is None else control_p95_us / 1000,
+            "perf_sample_p95_us": inst.p95_us(STAGE_SAMPLE),
+            "perf_late_ticks": inst.counters.get(LATE_TICKS, 0),
+            "perf_missed_ticks": inst.counters.get(MISSED_TICKS, 0),
+            "perf_sample_gaps": inst.counters.get(SAMPLE_GAPS, 0),
+            "perf_samples_unavailable": inst.counters.get(SAMPLES_UNAVAILABLE, 0),
+        }
+
+    def ramp_step_w(self, step_per_minute_w: int) -> int:
+        """Ramp-up step for the time since the last tick (at most one minute)."""
+        now = self.clock.monotonic()
+        last, self._last_tick_monotonic = self._last_tick_monotonic, now
+        if last is None:
+            return int(step_per_minute_w)
+        elapsed_s = min(now - last, CONTROL_INTERVAL.total_seconds())
+        return int(step_per_minute_w * elapsed_s / CONTROL_INTERVAL.total_seconds())
+
+    # ------------------------------------------------------------------
+    # PERSISTENCE
+    # ------------------------------------------------------------------
+    def dump(self) -> dict:
+        data = {
+            "last_target_power_w": self.last_target_power_w,
+            "load_profile": encode_blob(self.forecaster.to_bytes()),
+        }
+        if self.charge_target is not None:
+            data["charge_target"] = {
+                "energy_kwh": self.charge_target.energy_kwh,
+                "departure": self.charge_target.departure.isoformat(),
+                "delivered_wh": self._delivered_wh,
+            }
+        return data
+
+    def restore(self, data: dict, saved_at: float | None) -> None:
+        """Restore the load profile; resume the ramp unless it is stale."""
+        profile = data.get("load_profile")
+        if profile:
+            try:
+                self.forecaster.restore(decode_blob(profile))
+            except (ValueError, TypeError, zlib.error, struct.error) as err:
+                _LOGGER.warning("Discarding stored load profile: %s", err)
+
+        # an expired target is dropped on the first tick
+        target = data.get("charge_target")
+        if target:
+            try:
+                self.charge_target = ChargeTarget(
+                    float(target["energy_kwh"]),
+                    datetime.fromisoformat(target["departure"]),
+                )
+                self._delivered_wh = float(target.get("delivered_wh", 0.0))
+            except (KeyError, ValueError, TypeError) as err:
+                _LOGGER.warning("Discarding stored charge target: %s", err)
+
+        if saved_at is None or time.time() - saved_at > HC_WINDOW_MINUTES * 60:
+            return
+        self.last_target_power_w = int(data.get("last_target_power_w", 0))
+
     # ------------------------------------------------------------------
     # MAIN LOOP
     # ------------------------------------------------------------------
     async def async_control_tick(self, _now):
-        cfg = self.coordinator.config
+        settings = self.coordinator.settings
 
         if not self.samples:
             return
 
+        inst = self.instrumentation()
+        if inst is not None:
+            started = stage_started = time.perf_counter()
+
         avg_grid_power_w = self.compute_average_grid_power()
         if avg_grid_power_w is None:
             return
@@ -82,14 +326,89 @@ class HomeChargingController:
             current_limit_w=current_limit_w,
             next_limit_w=next_limit_w,
             minutes_to_next=minutes_to_next,
+            ramp_down_minutes=settings.ramp_down_minutes,
         )
 
-        # negative avg = import
-        available_power_w = max(int(effective_limit_w + avg_grid_power_w), 0)
-        target_power_w = self.apply_ramp(available_power_w)
-
-        wb_state = self.evaluate_wallbox_state(cfg)
-        mg_state = self.evaluate_mg4_state(cfg)
+        now_dt = self.clock.now()
+        self.track_delivered_energy()
+        # EV power already flows through the grid sensor
+        ev_power_w = self.ev_power_w()
+        self.learn_load_profile(now_dt, ev_power_w)
+        forecast_grid_power_w = self.forecast_grid_power(now_dt)
+
+        # negative = import; the billing interval is projected with the
+        # short-window grid power, or the forecast if it expects more import
+        stats = self.sampler.stats()
+        if inst is not None:
+            stage_started = self._record_stage(inst, STAGE_AVERAGING, stage_started)
+
+        control_grid_power_w = self.compute_control_grid_power(
+            avg_grid_power_w, stats, forecast_grid_power_w
+        )
+        billing = self.sampler.billing
+        quarter_average_w = billing.projected_average_w(now_dt, control_grid_power_w)
+        headroom_w = billing.headroom_w(now_dt, effective_limit_w, control_grid_power_w)
+        # the headroom comes on top of what the chargers draw now
+        headroom_power_w = available_power_w = max(int(ev_power_w + headroom_w), 0)
+
+        wb_state = self.charger_cache.wallbox
+        mg_state = self.charger_cache.mg4
+        available = {"wallbox": wb_state.available, "mg4": mg_state.available}
+
+        plan = self.update_charge_plan(now_dt, avg_grid_power_w + ev_power_w, available)
+        plan_power_w = None
+        if plan is not None:
+            plan_power_w = round(plan.power_at(now_dt))
+            available_power_w = min(available_power_w, plan_power_w)
+
+        if any(available.values()):
+            target_power_w = self.apply_ramp(
+                available_power_w,
+                max_step_w=self.ramp_step_w(settings.ramp_up_step_w),
+            )
+        else:
+            # nothing can charge: ramp up from 0 once a charger is available
+            target_power_w = self.last_target_power_w = 0
+
+        self.cadence, self.interval_s = self.compute_next_interval(
+            headroom_w,
+            minutes_to_next,
+            settings.ramp_down_minutes,
+            wb_state.available or mg_state.available,
+            billing.remaining_seconds(now_dt),
+            next_block != current_block,
+        )
+        allocation = self.allocate_power(target_power_w, available, settings.allocation_policy)
+
+        self._allocated_w = {
+            spec.name: amps_to_watts(allocation[spec.name], spec.phases)
+            for spec in self.chargers
+        }
+        self.trace.record(
+            now_dt,
+            latest["grid_power_w"],
+            avg_grid_power_w,
+            control_grid_power_w,
+            forecast_grid_power_w,
+            ev_power_w,
+            current_block,
+            next_block,
+            minutes_to_next,
+            current_limit_w,
+            effective_limit_w,
+            quarter_average_w,
+            headroom_w,
+            plan_power_w,
+            headroom_power_w,
+            available_power_w,
+            target_power_w,
+            available,
+            allocation,
+            self.cadence,
+            self.interval_s,
+        )
+        if inst is not None:
+            stage_started = self._record_stage(inst, STAGE_STATE_EVALUATION, stage_started)
 
         await self.coordinator.async_set(
             avg_grid_power_w=avg_grid_power_w,
@@ -99,89 +418,222 @@ class HomeChargingController:
             current_block=current_block,
             next_block=next_block,
             minutes_to_next=minutes_to_next,
+            forecast_grid_power_w=forecast_grid_power_w,
+            quarter_average_w=round(quarter_average_w),
+            quarter_headroom_w=round(headroom_w),
+            plan_power_w=plan_power_w,
+            plan_remaining_kwh=self.remaining_target_kwh(),
+            plan_shortfall_kwh=round(plan.shortfall_kwh, 2) if plan is not None else None,
+            control_interval_s=self.interval_s,
+            control_tick_count=self.tick_count,
+            control_wake_count=self.wake_count,
+            **{f"{name}_allocated_w": power_w for name, power_w in self._allocated_w.items()},
+            **stats,
+            **self.perf_values(inst),
         )
+        if inst is not None:
+            stage_started = self._record_stage(inst, STAGE_COORDINATOR_PUSH, stage_started)
 
-        if not wb_state.available and not mg_state.available:
-            await self.async_apply_charging_power(0)
-            return
+        await self.async_apply_charging_power(allocation)
+        if inst is not None:
+            self._record_stage(inst, STAGE_ACTUATION, stage_started)
+            self._record_stage(inst, STAGE_CONTROL_TICK, started)
 
-        await self.async_apply_charging_power(target_power_w)
+    @staticmethod
+    def _record_stage(inst: Instrumentation, stage: str, started: float) -> float:
+        """Record the time since started; returns now, the next stage's start."""
+        now = time.perf_counter()
+        inst.record(stage, now - started)
+        return now
 
     # ------------------------------------------------------------------
     # CALCULATIONS
     # ------------------------------------------------------------------
     def compute_average_grid_power(self) -> Optional[float]:
-        cutoff = datetime.now() - timedelta(minutes=HC_WINDOW_MINUTES)
-        values = [
-            float(s["grid_power_w"])
-            for s in self.samples
-            if s.get("ts") and s.get("grid_power_w") is not None and s["ts"] >= cutoff
+        mean = self.sampler.average_grid_power(HC_WINDOW_MINUTES)
+        if mean is None:
+            return None
+        return round(mean)
+
+    def compute_control_grid_power(self, avg_grid_power_w, stats, forecast_grid_power_w=None) -> int:
+        """Grid power expected for the rest of the billing interval.
+
+        The short-window mean, or the forecast if it shows more import;
+        the trailing average when neither is known.
+        """
+        candidates = [
+            value
+            for value in (
+                stats.get(f"grid_mean_{HC_SPIKE_WINDOW_MINUTES}m_w"),
+                forecast_grid_power_w,
+            )
+            if value is not None
         ]
-        if not values:
+        return min(candidates) if candidates else avg_grid_power_w
+
+    # ------------------------------------------------------------------
+    # CHARGE PLAN
+    # ------------------------------------------------------------------
+    def set_charge_target(self, energy_kwh: float, departure: datetime) -> None:
+        """Charge energy_kwh by departure (local time), in the cheapest blocks."""
+        self.charge_target = ChargeTarget(float(energy_kwh), departure)
+        self.charge_plan = None
+        self._delivered_wh = 0.0
+        self.async_wake()
+
+    def clear_charge_target(self) -> None:
+        """Go back to charging whenever there is headroom."""
+        self.charge_target = None
+        self.charge_plan = None
+        self.async_wake()
+
+    def remaining_target_kwh(self) -> Optional[float]:
+        if self.charge_target is None:
+            return None
+        return self._remaining_kwh(self.charge_target)
+
+    def _remaining_kwh(self, target: ChargeTarget) -> float:
+        return round(max(target.energy_kwh - self._delivered_wh / 1000, 0.0), 2)
+
+    def track_delivered_energy(self) -> None:
+        """Count the EV energy since the last tick towards the target."""
+        now = self.clock.monotonic()
+        last, self._last_energy_monotonic = self._last_energy_monotonic, now
+        if self.charge_target is not None and last is not None:
+            self._delivered_wh += self.ev_power_w() * (now - last) / 3600
+
+    def update_charge_plan(
+        self, now_dt: datetime, house_w: float, available: dict[str, bool]
+    ) -> Optional[ChargePlan]:
+        """Re-plan the rest of the target from now; None without a target.
+
+        house_w is the current house-only grid power, used for slots the
+        load profile has not learned yet. Once the energy is delivered the
+        plan holds charging at 0 until the departure, when the target is
+        dropped.
+        """
+        target = self.charge_target
+        if target is None or now_dt >= target.departure:
+            if target is not None:
+                _LOGGER.debug("Charge target expired: %s", target)
+            self.charge_target = None
+            self.charge_plan = None
             return None
-        return round(sum(values) / len(values))
 
-    def compute_effective_limit(self, current_limit_w, next_limit_w, minutes_to_next):
+        # plan with the chargers that can charge now, or all of them
+        specs = [spec for spec in self.chargers if available.get(spec.name)] or self.chargers
+        count = math.ceil((target.departure - slot_start(now_dt)) / SLOT)
+        self.charge_plan = plan_charging(
+            now_dt,
+            target,
+            self._remaining_kwh(target),
+            self.coordinator.settings.block_limits_w,
+            max_power_w=sum(amps_to_watts(spec.max_amps, spec.phases) for spec in specs),
+            min_power_w=min(amps_to_watts(spec.min_amps, spec.phases) for spec in specs),
+            house_w=self.forecaster.predict_slots(slot_start(now_dt), count, quantile=FC_QUANTILE),
+            default_house_w=house_w,
+        )
+        return self.charge_plan
+
+    # ------------------------------------------------------------------
+    # LOAD FORECAST
+    # ------------------------------------------------------------------
+    def learn_load_profile(self, now_dt: datetime, ev_power_w: float) -> None:
+        """Feed the finished 15-minute slot to the forecaster.
+
+        The slot's average import comes from the billing tracker; the EV
+        energy charged in the slot (each tick's power held until the next)
+        is added back so the profile is house load only.
+        """
+        held_w, self._held_ev_w = self._held_ev_w, ev_power_w
+        last, self._last_learn_dt = self._last_learn_dt, now_dt
+        slot = slot_of(now_dt)
+        if slot == self._last_slot:
+            self._add_slot_ev(held_w, last, now_dt)
+            return
+
+        start = slot_start(now_dt)
+        # only the slot right before this one is complete
+        if self._last_slot == slot_of(start - SLOT):
+            self._add_slot_ev(held_w, last, start)
+            import_w = self.sampler.billing.completed_average_w(now_dt)
+            if import_w is not None:
+                ev_w = self._slot_ev_ws / self._slot_ev_s if self._slot_ev_s else 0.0
+                self.forecaster.learn(self._last_slot, ev_w - import_w)
+        self._last_slot = slot
+        self._slot_ev_ws = self._slot_ev_s = 0.0
+        if last is not None:
+            self._add_slot_ev(held_w, max(last, start), now_dt)
+
+    def _add_slot_ev(self, power_w: float, since: Optional[datetime], until: datetime) -> None:
+        if since is None:
+            return
+        seconds = (until - since).total_seconds()
+        if seconds > 0:
+            self._slot_ev_ws += power_w * seconds
+            self._slot_ev_s += seconds
+
+    def forecast_grid_power(self, now_dt: datetime) -> Optional[int]:
+        """Expected grid power over the horizon if EV charging continues."""
+        house_w = self.forecaster.predict(now_dt, FC_HORIZON_MINUTES, quantile=FC_QUANTILE)
+        if house_w is None:
+            return None
+        return round(house_w - self.ev_power_w())
+
+    def ev_power_w(self) -> float:
+        """EV charging power currently drawn from the grid.
+
+        The wallbox power sensor when it reports a value, else the current
+        last written to the wallbox; plus the MG4 allocation. A charger
+        that is not available draws nothing.
+        """
+        wallbox, mg4 = self.charger_cache.wallbox, self.charger_cache.mg4
+        wallbox_w = wallbox.power_w
+        if wallbox_w is None:
+            wallbox_w = self.written_power_w("wallbox") if wallbox.available else 0
+        mg4_w = self._allocated_w.get("mg4", 0) if mg4.available else 0
+        return wallbox_w + mg4_w
+
+    def written_power_w(self, name: str) -> int:
+        """Power of the current last written to a charger; 0 if none was."""
+        charger = self.actuator.chargers.get(name)
+        if charger is None or not charger.last_amps:
+            return 0
+        return amps_to_watts(charger.last_amps, charger.spec.phases)
+
+    def compute_effective_limit(
+        self, current_limit_w, next_limit_w, minutes_to_next,
+        ramp_down_minutes=RAMP_DOWN_MINUTES_BEFORE,
+    ):
         if minutes_to_next is None:
             return current_limit_w
-        if next_limit_w < current_limit_w and minutes_to_next <= RAMP_DOWN_MINUTES_BEFORE:
+        if next_limit_w < current_limit_w and minutes_to_next <= ramp_down_minutes:
             return next_limit_w
         return current_limit_w
 
-    def apply_ramp(self, new_power: int) -> int:
+    def allocate_power(self, target_power_w: int, available: dict[str, bool], policy: str) -> dict[str, int]:
+        """Whole amps per phase for each charger within target_power_w."""
+        return allocate(target_power_w, self.chargers, available, policy)
+
+    def apply_ramp(self, new_power: int, max_step_w: int = RAMP_UP_MAX_STEP_W) -> int:
         old = self.last_target_power_w
         if new_power == old:
             return old
         if new_power < old:
             self.last_target_power_w = new_power
             return new_power
-        ramped = min(new_power, old + RAMP_UP_MAX_STEP_W)
+        ramped = min(new_power, old + int(max_step_w))
         self.last_target_power_w = ramped
         return ramped
 
-    # ------------------------------------------------------------------
-    # CHARGER STATE
-    # ------------------------------------------------------------------
-    def evaluate_wallbox_state(self, cfg) -> ChargerState:
-        wb_status = cfg.get(CONF_WB_STATUS)
-        wb_cable = cfg.get(CONF_WB_CABLE)
-
-        if not wb_status and not wb_cable:
-            return ChargerState(False, "unavailable", ["no_entities"])
-
-        cable = self.get_state(cfg.get(CONF_WB_CABLE))
-        status = self.get_state(cfg.get(CONF_WB_STATUS))
-
-        reasons = []
-        if cable in (None, "disconnected", "false", "off"):
-            reasons.append("cable_disconnected")
-        if status in ("fault", "error", None):
-            if status not in ("ready", "charging"):
-                reasons.append(f"status_{status}")
-
-        state = "charging" if status == "charging" else ("ready" if not reasons else "idle")
-        return ChargerState(not reasons, state, reasons)
-
-    def evaluate_mg4_state(self, cfg) -> ChargerState:
-        gun = self.get_state(cfg.get(CONF_MG_GUN_STATE))
-        reasons = []
-        if gun in (None, "disconnected", "false", "off"):
-            reasons.append("gun_disconnected")
-
-        active = self.get_state(cfg.get(CONF_MG_ACTIVE))
-        state = "charging" if active == "on" else ("ready" if not reasons else "idle")
-        return ChargerState(not reasons, state, reasons)
-
     # ------------------------------------------------------------------
     # HA helpers
     # ------------------------------------------------------------------
-    def get_state(self, entity_id: str | None):
-        if not entity_id:
-            return None
-        st = self.hass.states.get(entity_id)
-        if not st or st.state in ("unknown", "unavailable"):
-            return None
-        return st.state
-
-    async def async_apply_charging_power(self, allowed_power_w: int) -> None:
-        _LOGGER.info("controller: allowed_charging_power = %s W (stub)", allowed_power_w)
+    async def async_apply_charging_power(self, allocation: dict[str, int]) -> None:
+        """Send the allocated currents to the chargers.
+
+        Chargers that are not available are allocated 0 A; the actuator
+        writes that once and drops the repeats.
+        """
+        _LOGGER.debug("controller: allocated currents = %s", allocation)
+        await self.actuator.async_apply(allocation)
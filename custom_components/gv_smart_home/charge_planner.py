@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional, Sequence
+
+from .helpers import get_tariff_schedule
+from .load_forecaster import SLOT_MINUTES, slot_start
+
+SLOT = timedelta(minutes=SLOT_MINUTES)
+SLOT_HOURS = SLOT_MINUTES / 60
+
+
+@dataclass(frozen=True, slots=True)
+class ChargeTarget:
+    """Energy the car needs by the departure time."""
+
+    energy_kwh: float
+    departure: datetime
+
+
+@dataclass(frozen=True, slots=True)
+class ChargePlan:
+    """Planned average charging power per 15-minute slot.
+
+    Slots are aligned with the billing intervals; the first one starts at
+    or before the planning moment, the last one ends at the departure.
+    """
+
+    start: datetime
+    departure: datetime
+    power_w: tuple[float, ...]
+    blocks: bytes
+    energy_kwh: float
+    shortfall_kwh: float
+
+    def power_at(self, moment: datetime) -> float:
+        """Planned power for the slot containing moment (0 outside the plan)."""
+        if moment < self.start or moment >= self.departure:
+            return 0.0
+        index = int((moment - self.start) / SLOT)
+        return self.power_w[index] if index < len(self.power_w) else 0.0
+
+
+def slot_blocks(start: datetime, count: int) -> bytes:
+    """Tariff block of each slot from start (slot aligned)."""
+    last = start + SLOT * (count - 1)
+    hours = get_tariff_schedule(start.date(), last.date()).blocks
+    per_hour = 60 // SLOT_MINUTES
+    first = start.hour * per_hour + start.minute // SLOT_MINUTES
+    return bytes(hours[(first + i) // per_hour] for i in range(count))
+
+
+def plan_charging(
+    now: datetime,
+    target: ChargeTarget,
+    remaining_kwh: float,
+    block_limits_w: Sequence[int],
+    max_power_w: float,
+    min_power_w: float,
+    house_w: Sequence[Optional[float]] = (),
+    default_house_w: float = 0.0,
+) -> Optional[ChargePlan]:
+    """Plan remaining_kwh into the cheapest slots before the departure.
+
+    A slot can take the block limit minus the expected house import
+    (house_w per slot, grid sign; default_house_w where it is None or
+    missing), capped at max_power_w. Higher blocks are cheaper, so slots
+    are filled from the highest block down, earlier slots first within a
+    block. With only per-slot caps that greedy fill is optimal. A slot is
+    either left empty or planned at least at min_power_w.
+
+    Returns None if the departure is not in the future.
+    """
+    if target.departure <= now:
+        return None
+
+    start = slot_start(now)
+    count = math.ceil((target.departure - start) / SLOT)
+    blocks = slot_blocks(start, count)
+
+    # Hours of each slot that are still ahead
+    hours = [SLOT_HOURS] * count
+    hours[0] -= (now - start).total_seconds() / 3600
+    hours[-1] -= (start + SLOT * count - target.departure).total_seconds() / 3600
+
+    capacity = []
+    for i in range(count):
+        house = house_w[i] if i < len(house_w) else None
+        house_import = max(-(default_house_w if house is None else house), 0.0)
+        power = min(block_limits_w[blocks[i]] - house_import, max_power_w)
+        capacity.append(power if power >= min_power_w and hours[i] > 0 else 0.0)
+
+    power_w = [0.0] * count
+    needed_wh = remaining_kwh * 1000
+    for i in sorted(range(count), key=lambda i: (-blocks[i], i)):
+        if needed_wh <= 0:
+            break
+        if not capacity[i]:
+            continue
+        power = min(capacity[i], max(needed_wh / hours[i], min_power_w))
+        power_w[i] = power
+        needed_wh -= power * hours[i]
+
+    planned_kwh = sum(p * h for p, h in zip(power_w, hours)) / 1000
+    return ChargePlan(
+        start=start,
+        departure=target.departure,
+        power_w=tuple(power_w),
+        blocks=blocks,
+        energy_kwh=planned_kwh,
+        shortfall_kwh=max(needed_wh, 0.0) / 1000,
+    )
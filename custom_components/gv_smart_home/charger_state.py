@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import Callable, Optional
+
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    EventStateChangedData,
+    HomeAssistant,
+    State,
+    callback,
+)
+from homeassistant.helpers.event import async_track_state_change_event
+
+from .settings import GVSettings
+
+_LOGGER = logging.getLogger(__name__)
+
+_DISCONNECTED = (None, "disconnected", "false", "off")
+
+
+class ChargerStatus(StrEnum):
+    UNAVAILABLE = "unavailable"
+    IDLE = "idle"
+    READY = "ready"
+    CHARGING = "charging"
+
+
+@dataclass(frozen=True, slots=True)
+class ChargerState:
+    available: bool
+    state: ChargerStatus
+    reasons: tuple[str, ...]
+    connected: bool = False
+    # Measured charging power in W, None if not configured or unknown
+    power_w: Optional[float] = None
+
+
+UNAVAILABLE = ChargerState(False, ChargerStatus.UNAVAILABLE, ("no_entities",))
+
+
+def _state_value(state: Optional[State]) -> Optional[str]:
+    if state is None or state.state in ("unknown", "unavailable"):
+        return None
+    return state.state
+
+
+def _power_value(state: Optional[State]) -> Optional[float]:
+    value = _state_value(state)
+    if state is None or value is None:
+        return None
+    try:
+        power = float(value)
+    except ValueError:
+        return None
+    if state.attributes.get("unit_of_measurement") == "kW":
+        power *= 1000
+    return power
+
+
+def evaluate_wallbox(
+    cable: Optional[str], status: Optional[str], power_w: Optional[float], has_entities: bool,
+) -> ChargerState:
+    if not has_entities:
+        return UNAVAILABLE
+
+    reasons = []
+    if cable in _DISCONNECTED:
+        reasons.append("cable_disconnected")
+    if status in ("fault", "error", None):
+        reasons.append(f"status_{status}")
+
+    if status == "charging":
+        state = ChargerStatus.CHARGING
+    else:
+        state = ChargerStatus.READY if not reasons else ChargerStatus.IDLE
+    return ChargerState(not reasons, state, tuple(reasons), cable not in _DISCONNECTED, power_w)
+
+
+def evaluate_mg4(gun: Optional[str], active: Optional[str]) -> ChargerState:
+    reasons = []
+    if gun in _DISCONNECTED:
+        reasons.append("gun_disconnected")
+
+    if active == "on":
+        state = ChargerStatus.CHARGING
+    else:
+        state = ChargerStatus.READY if not reasons else ChargerStatus.IDLE
+    return ChargerState(not reasons, state, tuple(reasons), gun not in _DISCONNECTED)
+
+
+class ChargerStateCache:
+    """Parsed charger state, kept current by state-change events.
+
+    Subscribes once to every configured charger entity; the controller reads
+    the snapshots as plain attributes. on_change is called when a charger
+    connects, disconnects or changes availability.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        settings: GVSettings,
+        on_change: Optional[Callable[[str, ChargerState, ChargerState], None]] = None,
+    ):
+        self.hass = hass
+        self.settings = settings
+        self._on_change = on_change
+        self._values: dict[str, Optional[str]] = {}
+        self._wb_power_w: Optional[float] = None
+        self._unsub: Optional[CALLBACK_TYPE] = None
+
+        self.wallbox: ChargerState = UNAVAILABLE
+        self.mg4: ChargerState = UNAVAILABLE
+
+    @property
+    def entity_ids(self) -> list[str]:
+        s = self.settings
+        return [
+            entity_id
+            for entity_id in (s.wb_cable, s.wb_status, s.wb_power, s.mg_gun_state, s.mg_active)
+            if entity_id
+        ]
+
+    def start(self) -> None:
+        self.refresh()
+        entity_ids = self.entity_ids
+        if entity_ids:
+            self._unsub = async_track_state_change_event(
+                self.hass, entity_ids, self._handle_event
+            )
+
+    def stop(self) -> None:
+        if self._unsub:
+            self._unsub()
+            self._unsub = None
+
+    def refresh(self) -> None:
+        """Read all charger entities from the state machine."""
+        for entity_id in self.entity_ids:
+            self._store(entity_id, self.hass.states.get(entity_id))
+        self._evaluate()
+
+    def _store(self, entity_id: str, state: Optional[State]) -> None:
+        if entity_id == self.settings.wb_power:
+            self._wb_power_w = _power_value(state)
+        else:
+            self._values[entity_id] = _state_value(state)
+
+    def _value(self, entity_id: Optional[str]) -> Optional[str]:
+        if not entity_id:
+            return None
+        return self._values.get(entity_id)
+
+    @callback
+    def _handle_event(self, event: Event[EventStateChangedData]) -> None:
+        self._store(event.data["entity_id"], event.data.get("new_state"))
+        self._evaluate()
+
+    def _evaluate(self) -> None:
+        s = self.settings
+        wallbox = evaluate_wallbox(
+            self._value(s.wb_cable),
+            self._value(s.wb_status),
+            self._wb_power_w,
+            bool(s.wb_status or s.wb_cable),
+        )
+        mg4 = evaluate_mg4(self._value(s.mg_gun_state), self._value(s.mg_active))
+
+        old_wallbox, old_mg4 = self.wallbox, self.mg4
+        self.wallbox, self.mg4 = wallbox, mg4
+
+        if self._on_change is None:
+            return
+        for name, old, new in (("wallbox", old_wallbox, wallbox), ("mg4", old_mg4, mg4)):
+            if old.connected != new.connected or old.available != new.available:
+                _LOGGER.debug("%s: %s -> %s", name, old.state, new.state)
+                self._on_change(name, old, new)
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import time
+from datetime import datetime
+
+
+class Clock:
+    """Wall-clock and monotonic time for the sampler and the controller.
+
+    Live code uses SYSTEM_CLOCK; the replay engine passes a SimulatedClock
+    so the same logic runs against recorded data.
+    """
+
+    def now(self) -> datetime:
+        """Local wall-clock time (naive, like the sample timestamps)."""
+        return datetime.now()
+
+    def monotonic(self) -> float:
+        return time.monotonic()
+
+
+SYSTEM_CLOCK = Clock()
+
+
+class SimulatedClock(Clock):
+    """Clock that only moves when set; monotonic time follows it."""
+
+    def __init__(self, start: datetime):
+        self._start = start
+        self._now = start
+
+    def now(self) -> datetime:
+        return self._now
+
+    def monotonic(self) -> float:
+        return (self._now - self._start).total_seconds()
+
+    def set(self, moment: datetime) -> None:
+        if moment < self._now:
+            raise ValueError("Simulated time cannot go backwards")
+        self._now = moment
@@ -5,7 +5,7 @@ from homeassistant import config_entries
 from homeassistant.core import HomeAssistant
 from homeassistant.core import callback
 
-from gv_smart_home.flow_schema import schema_step_blocks, schema_step_wallbox, schema_step_mg4
+from .flow_schema import schema_step_blocks, schema_step_wallbox, schema_step_mg4
 from .const import DOMAIN
 
 async def async_has_unique_instance(hass: HomeAssistant) -> bool:
@@ -8,21 +8,140 @@ HC_SAMPLE_INTERVAL_SECONDS = 10
 # How long history we keep (minutes)
 HC_WINDOW_MINUTES = 15
 
+# Sampling modes: poll the grid sensor on a fixed interval, or record every
+# state change of the grid sensor with its real timestamp.
+HC_SAMPLING_MODE_INTERVAL = "interval"
+HC_SAMPLING_MODE_EVENT = "event"
+# In event mode, re-record the held value this often (keeps block data fresh)
+HC_EVENT_HEARTBEAT_SECONDS = 60
+# In event mode, buffer room for this many updates per second
+HC_EVENT_MAX_RATE_HZ = 2
+
+# Trailing windows (minutes) for grid power statistics (mean/min/max)
+HC_STATS_WINDOWS_MINUTES = (1, 5, 15)
+# Time constant of the grid power EWMA (seconds)
+HC_EWMA_TAU_SECONDS = 60
+# Short window used by the controller to react to import spikes
+HC_SPIKE_WINDOW_MINUTES = 1
+
+# Network tariff billing: wall-clock aligned intervals of average import.
+# Headroom budgets assume at least this much of the interval is left.
+BILLING_INTERVAL_MINUTES = 15
+BILLING_MIN_REMAINING_SECONDS = 60
+
+# House load forecast: horizon used by the controller, and which quantile
+# of the learned slot profile (grid sign: low quantile = high import)
+FC_HORIZON_MINUTES = 30
+FC_QUANTILE = 0.1
+
 # Charging controller ow often control loop runs
 CC_INTERVAL_MINUTES = 1
+# Adaptive cadence: fast when headroom is small or a block transition is
+# close, slow when no charger can take power
+CC_FAST_INTERVAL_SECONDS = 10
+CC_IDLE_INTERVAL_SECONDS = 300
+CC_FAST_HEADROOM_W = 1500
+CC_FAST_TRANSITION_MINUTES = 2
 RAMP_DOWN_MINUTES_BEFORE=10
 # Block transition rules
 RAMP_UP_MAX_STEP_W = 2300  # ≈ 2 A per minute ramp-up
 
+# Charger actuation: current setpoints are whole amps per phase
+CHARGER_VOLTAGE_V = 230
+CHARGER_MIN_AMPS = 6
+WB_PHASES = 3
+WB_MAX_AMPS = 16
+MG_PHASES = 3
+MG_MAX_AMPS = 16
+# Lower value is served first by the priority allocation policy
+WB_PRIORITY = 0
+MG_PRIORITY = 1
+ALLOCATION_POLICY_PRIORITY = "priority"
+ALLOCATION_POLICY_FAIR_SHARE = "fair_share"
+# Minimum seconds between two setpoint increases (the MG4 entity is cloud backed)
+WB_MIN_CHANGE_INTERVAL_SECONDS = 10
+MG_MIN_CHANGE_INTERVAL_SECONDS = 120
+ACTUATOR_TIMEOUT_SECONDS = 10
+
+# Services
+SERVICE_TARIFF_SCHEDULE = "generate_tariff_schedule"
+SERVICE_SET_CHARGE_TARGET = "set_charge_target"
+SERVICE_CLEAR_CHARGE_TARGET = "clear_charge_target"
+SERVICE_EXPORT_DECISION_TRACE = "export_decision_trace"
+# Longest range the schedule service generates in one call
+TARIFF_SCHEDULE_MAX_YEARS = 50
+# Furthest departure a charge target may plan for
+CHARGE_PLAN_MAX_HOURS = 7 * 24
+
+# Shared scheduler: one timer for all entries; sampling and control
+# delays are rounded to this tick
+DATA_SCHEDULER = f"{DOMAIN}_scheduler"
+SCHEDULER_TICK_SECONDS = HC_SAMPLE_INTERVAL_SECONDS
+
+# Instrumentation: a control tick starting this much after its due time
+# counts as late (the shared scheduler already rounds up to one tick)
+INSTR_LATE_TICK_SECONDS = 2 * SCHEDULER_TICK_SECONDS
+# Consecutive samples further apart than this many periods count as a gap
+INSTR_SAMPLE_GAP_PERIODS = 2
+
+# Decision trace: control ticks kept per entry (two days at the normal
+# cadence, less while ticking fast)
+DECISION_TRACE_CAPACITY = 2880
+
+# Device identifier shared by all entries before each got its own
+LEGACY_CHARGING_DEVICE_ID = "gv_charging_controller"
+
 COORDINATOR_INTERVAL_MINUTES = 3
 
+# Coordinator values are only republished when they move by more than this
+# (absolute deadband per key; keys not listed publish on any change)
+COORDINATOR_DEADBANDS = {
+    "avg_grid_power_w": 20,
+    "available_power_w": 50,
+    "forecast_grid_power_w": 50,
+    "quarter_average_w": 20,
+    "quarter_headroom_w": 50,
+    "plan_power_w": 50,
+    "plan_remaining_kwh": 0.1,
+}
+# Deadband for all sampler statistics keys (grid_mean_*, grid_min_*, ...)
+COORDINATOR_STATS_DEADBAND_W = 20
+
+# Persistent runtime state (sampler history, ramp state)
+STORAGE_VERSION = 1
+# How often the state is queued for saving, and how long writes are batched
+STORAGE_SAVE_INTERVAL_MINUTES = 5
+STORAGE_SAVE_DELAY_SECONDS = 30
+
 CONF_BLOCK_1 = "block_1_power"
 CONF_BLOCK_2 = "block_2_power"
 CONF_BLOCK_3 = "block_3_power"
 CONF_BLOCK_4 = "block_4_power"
 CONF_BLOCK_5 = "block_5_power"
 
+# Tunables that can be changed at runtime without reloading the entry
+CONF_RAMP_UP_STEP = "ramp_up_step_w"
+CONF_RAMP_DOWN_MINUTES = "ramp_down_minutes"
+CONF_ALLOCATION_POLICY = "allocation_policy"
+# Time the hot paths (histograms in diagnostics, diagnostic sensors)
+CONF_INSTRUMENTATION = "instrumentation"
+
+LIVE_TUNABLE_KEYS = frozenset({
+    CONF_BLOCK_1,
+    CONF_BLOCK_2,
+    CONF_BLOCK_3,
+    CONF_BLOCK_4,
+    CONF_BLOCK_5,
+    CONF_RAMP_UP_STEP,
+    CONF_RAMP_DOWN_MINUTES,
+    CONF_ALLOCATION_POLICY,
+    CONF_INSTRUMENTATION,
+})
+
 CONF_GRID_POWER_ENTITY = "house_consumption_entity"
+CONF_SAMPLING_MODE = "sampling_mode"
+# Publish minute-granular countdown attributes on the energy info sensor
+CONF_ENERGY_COUNTDOWN = "energy_minute_countdown"
 
 CONF_WB_POWER = "wallbox_charging_power"
 CONF_WB_SET_CURRENT = "wallbox_set_current"
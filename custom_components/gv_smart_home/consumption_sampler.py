@@ -1,95 +1,264 @@
 from __future__ import annotations
 
 import logging
+import struct
+import time
+import zlib
 from datetime import datetime, timedelta
-from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers.event import async_track_time_interval
+from typing import Optional
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, State, callback
+from homeassistant.helpers.event import (
+    async_track_state_change_event,
+    async_track_time_interval,
+)
 
 from .const import (
     HC_SAMPLE_INTERVAL_SECONDS,
     HC_WINDOW_MINUTES,
-    CONF_GRID_POWER_ENTITY,
-    CONF_BLOCK_1,
-    CONF_BLOCK_2,
-    CONF_BLOCK_3,
-    CONF_BLOCK_4,
-    CONF_BLOCK_5,
+    HC_SAMPLING_MODE_EVENT,
+    HC_EVENT_HEARTBEAT_SECONDS,
+    HC_EVENT_MAX_RATE_HZ,
+    HC_STATS_WINDOWS_MINUTES,
+    HC_EWMA_TAU_SECONDS,
+    INSTR_SAMPLE_GAP_PERIODS,
+)
+from .billing_interval import BillingIntervalTracker
+from .instrumentation import (
+    SAMPLE_GAPS,
+    SAMPLES_UNAVAILABLE,
+    STAGE_BLOCK_LOOKUP,
+    STAGE_SAMPLE,
+    STAGE_SAMPLE_JITTER,
+    Instrumentation,
 )
+from .clock import Clock, SYSTEM_CLOCK
 from .helpers import get_current_block, get_prev_next_block_info
+from .sample_buffer import SampleBuffer, TimeEwma
+from .store import decode_blob, encode_blob
 
 _LOGGER = logging.getLogger(__name__)
 
 HC_SAMPLE_INTERVAL = timedelta(seconds=HC_SAMPLE_INTERVAL_SECONDS)
-HC_MAX_SAMPLES = int((60 / HC_SAMPLE_INTERVAL_SECONDS) * HC_WINDOW_MINUTES)
+HC_HISTORY_MINUTES = max(HC_WINDOW_MINUTES, *HC_STATS_WINDOWS_MINUTES)
+# +1: the sample in effect at the start of the longest window is kept
+HC_MAX_SAMPLES = int((60 / HC_SAMPLE_INTERVAL_SECONDS) * HC_HISTORY_MINUTES) + 1
+HC_EVENT_HEARTBEAT = timedelta(seconds=HC_EVENT_HEARTBEAT_SECONDS)
+HC_EVENT_MAX_SAMPLES = HC_EVENT_MAX_RATE_HZ * 60 * HC_HISTORY_MINUTES + 1
+
+
+def stats_keys(minutes: int) -> tuple[str, str, str]:
+    """Return the (mean, min, max) stats keys for a window."""
+    return (
+        f"grid_mean_{minutes}m_w",
+        f"grid_min_{minutes}m_w",
+        f"grid_max_{minutes}m_w",
+    )
+
+
+def _round(value: Optional[float]) -> Optional[int]:
+    return None if value is None else round(value)
+
+
+def parse_grid_power(state: Optional[State]) -> Optional[int]:
+    """Return grid power in W from a state, or None if unknown."""
+    if state is None or state.state in ("unknown", "unavailable"):
+        return None
+    try:
+        return int(float(state.state))
+    except ValueError:
+        return None
 
 
 class ConsumptionSampler:
-    """Takes 10-second samples of grid power and block limits."""
+    """Samples grid power and block limits.
+
+    Interval mode takes a sample every 10 seconds and averages are plain
+    sample means. Event mode records every state change of the grid sensor
+    with its real timestamp and averages are time-weighted.
+    """
 
-    def __init__(self, hass: HomeAssistant, entry, coordinator):
+    def __init__(
+        self, hass: HomeAssistant, entry, coordinator, clock: Clock = SYSTEM_CLOCK,
+        scheduler=None,
+    ):
         self.hass = hass
         self.entry = entry
         self.coordinator = coordinator
-        self.samples = []
-        self._unsub = None
+        self.clock = clock
+        # Shared GVScheduler; without one the sampler runs its own timers
+        self.scheduler = scheduler
+        self.mode = coordinator.settings.sampling_mode
+        self.samples = SampleBuffer(
+            HC_EVENT_MAX_SAMPLES if self.mode == HC_SAMPLING_MODE_EVENT else HC_MAX_SAMPLES
+        )
+        self._windows = {
+            minutes: self.samples.add_window(minutes * 60)
+            for minutes in sorted({HC_WINDOW_MINUTES, *HC_STATS_WINDOWS_MINUTES})
+        }
+        self._stats_windows = [
+            (self._windows[minutes], stats_keys(minutes)) for minutes in HC_STATS_WINDOWS_MINUTES
+        ]
+        self._ewma = TimeEwma(HC_EWMA_TAU_SECONDS)
+        self.billing = BillingIntervalTracker()
+        self._unsubs: list[CALLBACK_TYPE] = []
 
-    async def start(self):
-        self._unsub = async_track_time_interval(
-            self.hass, self._sample_now, HC_SAMPLE_INTERVAL
+        # Shared with the controller; only fed while enabled in the options
+        self.instrumentation = Instrumentation()
+        self._period_s = (
+            HC_EVENT_HEARTBEAT_SECONDS if self.mode == HC_SAMPLING_MODE_EVENT
+            else HC_SAMPLE_INTERVAL_SECONDS
         )
-        _LOGGER.debug("Sampler started")
+        self._last_sample_dt: Optional[datetime] = None
+
+    async def start(self):
+        grid_entity = self.coordinator.settings.grid_entity
+
+        if self.mode == HC_SAMPLING_MODE_EVENT and grid_entity:
+            self._unsubs.append(
+                async_track_state_change_event(
+                    self.hass, [grid_entity], self._handle_grid_event
+                )
+            )
+            # Heartbeat keeps block data fresh while the sensor is quiet
+            self._unsubs.append(self._track_interval(HC_EVENT_HEARTBEAT))
+            self._sample_now(None)
+        else:
+            self._unsubs.append(self._track_interval(HC_SAMPLE_INTERVAL))
+        _LOGGER.debug("Sampler started (%s mode)", self.mode)
 
     async def stop(self):
-        if self._unsub:
-            self._unsub()
-            self._unsub = None
+        while self._unsubs:
+            self._unsubs.pop()()
+
+    def _track_interval(self, interval: timedelta):
+        if self.scheduler is not None:
+            return self.scheduler.add_sampler(self, interval.total_seconds())
+        return async_track_time_interval(self.hass, self._sample_now, interval)
+
+    # ------------------------------------------------------------------
+    # PERSISTENCE
+    # ------------------------------------------------------------------
+    def dump(self) -> dict:
+        return {"samples": encode_blob(self.samples.to_bytes())}
+
+    def restore(self, data: dict) -> None:
+        """Restore samples saved by dump(), dropping those too old to matter."""
+        blob = data.get("samples")
+        if not blob:
+            return
+
+        not_before = self.clock.now() - timedelta(minutes=HC_HISTORY_MINUTES)
+        try:
+            kept = self.samples.restore(decode_blob(blob), not_before=not_before)
+        except (ValueError, TypeError, zlib.error, struct.error) as err:
+            _LOGGER.warning("Discarding stored sampler history: %s", err)
+            return
+
+        for sample in self.samples:
+            self._ewma.update(sample["ts"], sample["grid_power_w"])
+            self.billing.update(sample["ts"], sample["grid_power_w"])
+        _LOGGER.debug("Sampler restored %s samples", kept)
 
+    # ------------------------------------------------------------------
+    # AVERAGES
+    # ------------------------------------------------------------------
+    def average_grid_power(self, minutes: int = HC_WINDOW_MINUTES) -> Optional[float]:
+        """Average grid power over a trailing window (None if no data).
+
+        Time-weighted in event mode, a plain sample mean in interval mode.
+        """
+        window = self._windows[minutes]
+        if self.mode == HC_SAMPLING_MODE_EVENT:
+            return window.mean(self.clock.now())
+        return window.sample_mean(self.clock.now())
+
+    def stats(self) -> dict[str, Optional[int]]:
+        """Incrementally maintained grid power statistics.
+
+        Time-weighted mean, min and max per configured window plus an EWMA,
+        keyed like the coordinator values (e.g. ``grid_mean_5m_w``).
+        """
+        now_dt = self.clock.now()
+        stats = {"grid_ewma_w": _round(self._ewma.value(now_dt))}
+        for window, keys in self._stats_windows:
+            for key, value in zip(keys, window.stats(now_dt)):
+                stats[key] = _round(value)
+        return stats
+
+    # ------------------------------------------------------------------
+    # SAMPLING
+    # ------------------------------------------------------------------
     @callback
     def _sample_now(self, _now):
-        cfg = self.coordinator.config
-
-        grid_entity = cfg.get(CONF_GRID_POWER_ENTITY)
+        grid_entity = self.coordinator.settings.grid_entity
         if not grid_entity:
             return
 
-        state = self.hass.states.get(grid_entity)
-        grid_power_w = None
-        if state and state.state not in ("unknown", "unavailable"):
-            try:
-                grid_power_w = int(float(state.state))
-            except ValueError:
-                grid_power_w = None
+        self.sample_state(self.clock.now(), self.hass.states.get(grid_entity))
 
-        now_dt = datetime.now()
-        block = get_current_block(now_dt.date(), now_dt.hour)
-        info = get_prev_next_block_info(now_dt)
+    @callback
+    def sample_state(self, now_dt: datetime, state: Optional[State]) -> None:
+        """Record a grid sensor state read by the caller."""
+        self._record(now_dt, parse_grid_power(state))
 
-        # Read ALWAYS from dynamic config
-        block_limits = {
-            1: cfg.get(CONF_BLOCK_1),
-            2: cfg.get(CONF_BLOCK_2),
-            3: cfg.get(CONF_BLOCK_3),
-            4: cfg.get(CONF_BLOCK_4),
-            5: cfg.get(CONF_BLOCK_5),
-        }
+    @callback
+    def _handle_grid_event(self, event: Event) -> None:
+        new_state = event.data.get("new_state")
+        if new_state is None:
+            return
 
-        current_limit_kw = block_limits[block]
-        current_limit_w = int(current_limit_kw * 1000)
+        # Local wall-clock time of the actual update
+        ts = datetime.fromtimestamp(new_state.last_updated.timestamp())
+        self._record(ts, parse_grid_power(new_state))
 
+    def _record(self, now_dt: datetime, grid_power_w: Optional[int]) -> None:
+        # Read ALWAYS from the current config snapshot (limits in W)
+        settings = self.coordinator.settings
+        block_limits_w = settings.block_limits_w
+        inst = self.instrumentation if settings.instrumentation else None
+        if inst is not None:
+            started = time.perf_counter()
+
+        block = get_current_block(now_dt.date(), now_dt.hour)
+        info = get_prev_next_block_info(now_dt)
+        if inst is not None:
+            inst.record(STAGE_BLOCK_LOOKUP, time.perf_counter() - started)
+
+        current_limit_w = block_limits_w[block]
         next_block = info["next_block"]
         minutes_to_next = info["minutes_to_next"]
-        next_limit_kw = block_limits[next_block]
-        next_limit_w = int(next_limit_kw * 1000)
-
-        self.samples.append({
-            "ts": now_dt,
-            "grid_power_w": grid_power_w,
-            "current_block": block,
-            "next_block": next_block,
-            "minutes_to_next": minutes_to_next,
-            "current_block_limit_w": current_limit_w,
-            "next_block_limit_w": next_limit_w,
-        })
-
-        if len(self.samples) > HC_MAX_SAMPLES:
-            self.samples.pop(0)
+        next_limit_w = block_limits_w[next_block]
+
+        self._ewma.update(now_dt, grid_power_w)
+        self.billing.update(now_dt, grid_power_w)
+
+        # Oldest sample is overwritten once the buffer is full
+        self.samples.append(
+            ts=now_dt,
+            grid_power_w=grid_power_w,
+            current_block=block,
+            next_block=next_block,
+            minutes_to_next=minutes_to_next,
+            current_block_limit_w=current_limit_w,
+            next_block_limit_w=next_limit_w,
+        )
+
+        if inst is not None:
+            self._instrument_sample(inst, now_dt, grid_power_w)
+            inst.record(STAGE_SAMPLE, time.perf_counter() - started)
+
+    def _instrument_sample(
+        self, inst: Instrumentation, now_dt: datetime, grid_power_w: Optional[int]
+    ) -> None:
+        """Count unavailable samples and gaps; time the sampling jitter."""
+        if grid_power_w is None:
+            inst.count(SAMPLES_UNAVAILABLE)
+        last, self._last_sample_dt = self._last_sample_dt, now_dt
+        if last is None:
+            return
+        elapsed = (now_dt - last).total_seconds()
+        if elapsed > self._period_s * INSTR_SAMPLE_GAP_PERIODS:
+            inst.count(SAMPLE_GAPS)
+        elif self.mode != HC_SAMPLING_MODE_EVENT:
+            # event mode samples whenever the sensor changes
+            inst.record(STAGE_SAMPLE_JITTER, abs(elapsed - self._period_s))
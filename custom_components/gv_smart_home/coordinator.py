@@ -1,13 +1,28 @@
 from __future__ import annotations
 import logging
-from homeassistant.core import HomeAssistant
+from typing import Any, Callable, Protocol
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
-from .const import DOMAIN
+from .const import DOMAIN, COORDINATOR_DEADBANDS, COORDINATOR_STATS_DEADBAND_W
+from .settings import GVSettings
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def charging_device_id(entry_id: str) -> str:
+    return f"{entry_id}_charging"
+
+
+class ControlCoordinator(Protocol):
+    """What the controller uses of the coordinator (the replay passes its own)."""
+
+    settings: GVSettings
+
+    async def async_set(self, **values: Any) -> list[str]: ...
+
+
 class GVChargingCoordinator(DataUpdateCoordinator):
     """Coordinator for EV charging logic and configuration access."""
 
@@ -21,6 +36,10 @@ class GVChargingCoordinator(DataUpdateCoordinator):
         self.hass = hass
         self.entry = entry
         self.data = {}
+        self._key_listeners: dict[str, list[Callable[[], None]]] = {}
+        # Built once per entry update; shared by all consumers
+        self._config = self._merge_config()
+        self.settings = GVSettings.from_config(self._config)
 
     # ------------------------------------------------------------------
     # REQUIRED BY DataUpdateCoordinator (for CoordinatorEntity support)
@@ -35,19 +54,81 @@ class GVChargingCoordinator(DataUpdateCoordinator):
     # ------------------------------------------------------------------
     # RUNTIME CONFIG ACCESS (MERGED)
     # ------------------------------------------------------------------
+    def _merge_config(self) -> dict:
+        return {**self.entry.data, **self.entry.options}
+
     @property
     def config(self) -> dict:
-        """Merged config (options override data)."""
-        return {**self.entry.data, **self.entry.options}
+        """Merged config (options override data), as last applied."""
+        return self._config
+
+    @property
+    def device_info(self) -> dict:
+        """Device of this entry's charging controller."""
+        return {
+            "identifiers": {(DOMAIN, charging_device_id(self.entry.entry_id))},
+            "name": "GV Smart Charging",
+            "manufacturer": "Gogi",
+            "model": "EV Charging Logic",
+        }
 
     def get(self, key, default=None):
         """Helper for safe key access."""
-        return self.config.get(key, default)
+        return self._config.get(key, default)
+
+    def apply_config_update(self) -> set[str]:
+        """Rebuild the config snapshot from the entry; return the changed keys."""
+        old = self._config
+        new = self._merge_config()
+        self._config = new
+        self.settings = GVSettings.from_config(new)
+        return {key for key in old.keys() | new.keys() if old.get(key) != new.get(key)}
 
     # ------------------------------------------------------------------
     # Values pushed by controller
     # ------------------------------------------------------------------
+    @callback
+    def async_add_key_listener(self, key: str, update_callback: Callable[[], None]) -> CALLBACK_TYPE:
+        """Listen for changes of a single value; returns a remove callback."""
+        listeners = self._key_listeners.setdefault(key, [])
+        listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            listeners.remove(update_callback)
+
+        return remove_listener
+
+    @staticmethod
+    def deadband(key: str) -> float:
+        if key.startswith("grid_"):
+            return COORDINATOR_STATS_DEADBAND_W
+        return COORDINATOR_DEADBANDS.get(key, 0)
+
+    def _is_change(self, key: str, old: Any, new: Any) -> bool:
+        if old == new:
+            return False
+        if old is None or new is None or isinstance(new, bool):
+            return True
+        try:
+            return abs(new - old) > self.deadband(key)
+        except TypeError:
+            return True
+
     async def async_set(self, **values):
-        """Push sensor updates and notify listeners."""
-        self.data.update(values)
-        self.async_set_updated_data(self.data)
+        """Push sensor updates; notify only listeners of changed keys.
+
+        A value that stays within its key's deadband is not stored, so the
+        deadband is measured from the last published value.
+        """
+        changed = [
+            key
+            for key, value in values.items()
+            if key not in self.data or self._is_change(key, self.data[key], value)
+        ]
+        for key in changed:
+            self.data[key] = values[key]
+        for key in changed:
+            for update_callback in list(self._key_listeners.get(key, ())):
+                update_callback()
+        return changed
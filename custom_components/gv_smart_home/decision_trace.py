@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import math
+import struct
+import zlib
+from datetime import datetime
+from typing import Iterator, NamedTuple, Optional
+
+_NAN = float("nan")
+
+# Cadence name <-> code in the trace
+CADENCES = ("idle", "normal", "fast")
+
+# Charger flags: bit set while the charger can take power
+FLAG_WALLBOX_AVAILABLE = 1
+FLAG_MG4_AVAILABLE = 2
+
+# Serialized form (zlib compressed): header, then the records oldest first.
+# Records are little-endian with the fields of TraceRecord in order.
+_EXPORT_MAGIC = b"GVDT"
+_EXPORT_VERSION = 1
+_EXPORT_HEADER = struct.Struct("<4sBHI")
+_RECORD = struct.Struct("<dfifffBBhiifffiiiBBBBf")
+
+
+class TraceRecord(NamedTuple):
+    """Inputs and outputs of one control tick.
+
+    Powers are in W; grid powers have the grid sign (negative = import),
+    quarter_average_w is the projected import of the billing interval. NaN
+    stands for an unknown value and -1 for an unknown minutes_to_next.
+    """
+
+    ts: float                   # epoch seconds
+    grid_w: float               # latest raw sample
+    avg_grid_power_w: int
+    control_grid_power_w: float
+    forecast_grid_power_w: float
+    ev_power_w: float
+    current_block: int
+    next_block: int
+    minutes_to_next: int
+    current_limit_w: int
+    effective_limit_w: int
+    quarter_average_w: float
+    headroom_w: float
+    plan_power_w: float
+    headroom_power_w: int       # EV power plus the headroom
+    available_power_w: int      # after the charge plan cap
+    target_power_w: int
+    charger_flags: int
+    wallbox_amps: int
+    mg4_amps: int
+    cadence: int
+    interval_s: float
+
+    @property
+    def house_w(self) -> float:
+        """Grid power without EV charging."""
+        return self.grid_w + self.ev_power_w
+
+
+FIELDS = TraceRecord._fields
+
+
+def _optional(value: Optional[float]) -> float:
+    return _NAN if value is None else value
+
+
+class DecisionTrace:
+    """Fixed-capacity ring buffer of control tick decisions.
+
+    Every record is packed into one preallocated bytearray, so recording is
+    a single struct pack and the trace never grows; cheap enough to stay on
+    permanently. Once full, the oldest record is overwritten.
+    """
+
+    __slots__ = ("capacity", "_data", "_next", "_len")
+
+    def __init__(self, capacity: int):
+        if capacity <= 0:
+            raise ValueError(f"Invalid capacity: {capacity}")
+        self.capacity = capacity
+        self._data = bytearray(capacity * _RECORD.size)
+        self._next = 0
+        self._len = 0
+
+    def __len__(self) -> int:
+        return self._len
+
+    def clear(self) -> None:
+        self._next = 0
+        self._len = 0
+
+    def record(
+        self,
+        moment: datetime,
+        grid_w: Optional[float],
+        avg_grid_power_w: int,
+        control_grid_power_w: float,
+        forecast_grid_power_w: Optional[float],
+        ev_power_w: float,
+        current_block: int,
+        next_block: int,
+        minutes_to_next: Optional[int],
+        current_limit_w: int,
+        effective_limit_w: int,
+        quarter_average_w: float,
+        headroom_w: float,
+        plan_power_w: Optional[float],
+        headroom_power_w: int,
+        available_power_w: int,
+        target_power_w: int,
+        available: dict[str, bool],
+        allocation: dict[str, int],
+        cadence: str,
+        interval_s: float,
+    ) -> None:
+        """Append one tick; moment is the naive local tick time."""
+        flags = (
+            (FLAG_WALLBOX_AVAILABLE if available.get("wallbox") else 0)
+            | (FLAG_MG4_AVAILABLE if available.get("mg4") else 0)
+        )
+        _RECORD.pack_into(
+            self._data,
+            self._next * _RECORD.size,
+            moment.timestamp(),
+            _optional(grid_w),
+            avg_grid_power_w,
+            control_grid_power_w,
+            _optional(forecast_grid_power_w),
+            ev_power_w,
+            current_block,
+            next_block,
+            -1 if minutes_to_next is None else minutes_to_next,
+            current_limit_w,
+            effective_limit_w,
+            quarter_average_w,
+            headroom_w,
+            _optional(plan_power_w),
+            headroom_power_w,
+            available_power_w,
+            target_power_w,
+            flags,
+            allocation.get("wallbox", 0),
+            allocation.get("mg4", 0),
+            CADENCES.index(cadence),
+            interval_s,
+        )
+        self._next = (self._next + 1) % self.capacity
+        if self._len < self.capacity:
+            self._len += 1
+
+    def copy(self) -> "DecisionTrace":
+        trace = DecisionTrace(self.capacity)
+        trace._data[:] = self._data
+        trace._next = self._next
+        trace._len = self._len
+        return trace
+
+    def _ordered(self) -> bytes:
+        """Packed records, oldest first."""
+        size = _RECORD.size
+        start = (self._next - self._len) % self.capacity
+        end = start + self._len
+        if end <= self.capacity:
+            return bytes(self._data[start * size:end * size])
+        return bytes(self._data[start * size:]) + bytes(self._data[:self._next * size])
+
+    def __iter__(self) -> Iterator[TraceRecord]:
+        for values in _RECORD.iter_unpack(self._ordered()):
+            yield TraceRecord._make(values)
+
+    def last(self, count: int) -> list[TraceRecord]:
+        records = list(self)
+        return records[-count:] if count > 0 else []
+
+    # ------------------------------------------------------------------
+    # EXPORT
+    # ------------------------------------------------------------------
+    def to_bytes(self) -> bytes:
+        header = _EXPORT_HEADER.pack(_EXPORT_MAGIC, _EXPORT_VERSION, _RECORD.size, self._len)
+        return zlib.compress(header + self._ordered())
+
+    @classmethod
+    def from_bytes(cls, blob: bytes, capacity: Optional[int] = None) -> "DecisionTrace":
+        """Trace holding the exported records (at least their count as capacity)."""
+        raw = zlib.decompress(blob)
+        magic, version, size, count = _EXPORT_HEADER.unpack_from(raw)
+        if magic != _EXPORT_MAGIC or version != _EXPORT_VERSION or size != _RECORD.size:
+            raise ValueError("Not a decision trace of this version")
+        payload = raw[_EXPORT_HEADER.size:]
+        if len(payload) != count * size:
+            raise ValueError("Decision trace is truncated")
+
+        trace = cls(max(capacity or count, count, 1))
+        trace._data[:len(payload)] = payload
+        trace._len = count
+        trace._next = count % trace.capacity
+        return trace
+
+    def to_csv(self) -> str:
+        """One row per tick; time as local ISO, unknown values left empty."""
+        rows = [",".join(("time", *FIELDS[1:]))]
+        for record in self:
+            values = [datetime.fromtimestamp(record.ts).isoformat(timespec="seconds")]
+            for name, value in zip(FIELDS[1:], record[1:]):
+                if isinstance(value, float):
+                    text = "" if math.isnan(value) else str(round(value, 1))
+                elif name == "minutes_to_next" and value < 0:
+                    text = ""
+                elif name == "cadence":
+                    text = CADENCES[value]
+                else:
+                    text = str(value)
+                values.append(text)
+            rows.append(",".join(values))
+        return "\n".join(rows) + "\n"
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DATA_SCHEDULER, DOMAIN
+from .store import encode_blob
+
+# Decision trace records shown as readable rows (the full trace is in "data")
+TRACE_PREVIEW_RECORDS = 20
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Diagnostics download: settings, live values, hot path timings and
+    the decision trace.
+
+    The config only holds entity ids and limits, so nothing is redacted.
+    """
+    data = hass.data.get(DOMAIN, {}).get(entry.entry_id, {})
+    coordinator = data.get("coordinator")
+    sampler = data.get("sampler")
+    controller = data.get("controller")
+    scheduler = hass.data.get(DATA_SCHEDULER)
+
+    result: dict[str, Any] = {"entry": {"title": entry.title, "version": entry.version}}
+    if coordinator is not None:
+        result["settings"] = asdict(coordinator.settings)
+        result["values"] = dict(coordinator.data)
+        result["startup"] = {
+            # sampling and control start after Home Assistant has started
+            "runtime_started": controller is not None,
+            "setup_ms": coordinator.data.get("setup_ms"),
+            "startup_ms": coordinator.data.get("startup_ms"),
+        }
+    if sampler is not None:
+        result["sampler"] = {
+            "mode": sampler.mode,
+            "samples": len(sampler.samples),
+            "last_quarter_average_w": sampler.billing.last_average_w,
+        }
+        if coordinator is not None and coordinator.settings.instrumentation:
+            result["instrumentation"] = sampler.instrumentation.as_dict()
+        else:
+            result["instrumentation"] = {"enabled": False}
+    if controller is not None:
+        result["controller"] = {
+            "cadence": controller.cadence,
+            "interval_s": controller.interval_s,
+            "tick_count": controller.tick_count,
+            "wake_count": controller.wake_count,
+            "charge_target": (
+                None if controller.charge_target is None
+                else {
+                    "energy_kwh": controller.charge_target.energy_kwh,
+                    "departure": controller.charge_target.departure.isoformat(),
+                    "remaining_kwh": controller.remaining_target_kwh(),
+                }
+            ),
+            "actuators": {
+                name: {
+                    "last_amps": charger.last_amps,
+                    "writes": charger.writes,
+                    "skipped": charger.skipped,
+                    "failures": charger.failures,
+                }
+                for name, charger in controller.actuator.chargers.items()
+            },
+        }
+        trace = controller.trace
+        result["decision_trace"] = {
+            "records": len(trace),
+            "capacity": trace.capacity,
+            "latest": [
+                {
+                    name: round(value, 1) if isinstance(value, float) else value
+                    for name, value in record._asdict().items()
+                }
+                for record in trace.last(TRACE_PREVIEW_RECORDS)
+            ],
+            # zlib compressed, base64; the replay tool reads this file directly
+            "data": encode_blob(trace.to_bytes()),
+        }
+    if scheduler is not None:
+        result["scheduler"] = {
+            "tick_count": scheduler.tick_count,
+            "last_sample_ms": round(scheduler.last_sample_s * 1000, 3),
+            "last_control_ms": round(scheduler.last_control_s * 1000, 3),
+            "max_tick_ms": round(scheduler.max_tick_s * 1000, 3),
+        }
+    return result
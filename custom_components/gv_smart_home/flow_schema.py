@@ -1,7 +1,7 @@
 from homeassistant.helpers import selector
 import voluptuous as vol
 
-from gv_smart_home.const import *
+from .const import *
 
 
 def schema_step_blocks(values: dict):
@@ -64,7 +64,35 @@ def schema_step_blocks(values: dict):
                 domain=["sensor"],
                 device_class="power",
             )
-        )
+        ),
+        vol.Required(
+            CONF_SAMPLING_MODE,
+            default=values.get(CONF_SAMPLING_MODE, HC_SAMPLING_MODE_INTERVAL)
+        ): selector.SelectSelector(
+            selector.SelectSelectorConfig(
+                options=[HC_SAMPLING_MODE_INTERVAL, HC_SAMPLING_MODE_EVENT],
+                translation_key=CONF_SAMPLING_MODE,
+                mode=selector.SelectSelectorMode.DROPDOWN,
+            )
+        ),
+        vol.Required(
+            CONF_ENERGY_COUNTDOWN,
+            default=values.get(CONF_ENERGY_COUNTDOWN, False)
+        ): selector.BooleanSelector(),
+        vol.Required(
+            CONF_ALLOCATION_POLICY,
+            default=values.get(CONF_ALLOCATION_POLICY, ALLOCATION_POLICY_PRIORITY)
+        ): selector.SelectSelector(
+            selector.SelectSelectorConfig(
+                options=[ALLOCATION_POLICY_PRIORITY, ALLOCATION_POLICY_FAIR_SHARE],
+                translation_key=CONF_ALLOCATION_POLICY,
+                mode=selector.SelectSelectorMode.DROPDOWN,
+            )
+        ),
+        vol.Required(
+            CONF_INSTRUMENTATION,
+            default=values.get(CONF_INSTRUMENTATION, False)
+        ): selector.BooleanSelector(),
     })
 
 
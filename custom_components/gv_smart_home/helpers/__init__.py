@@ -12,12 +12,22 @@ from .calendar import (
     get_holiday_name,
     get_next_holiday,
     is_holiday,
+    get_work_free_days,
+    invalidate_holiday_caches,
 )
 from .energy import (
     is_high_season,
     get_base_block,
     get_current_block,
     get_prev_next_block_info,
+    invalidate_block_tables,
+)
+from .schedule import (
+    TariffSchedule,
+    get_tariff_schedule,
+    get_block_transitions,
+    schedule_as_dict,
+    schedule_as_csv,
 )
 
 __all__ = [
@@ -28,9 +38,18 @@ __all__ = [
     "get_holiday_name",
     "get_next_holiday",
     "is_holiday",
+    "get_work_free_days",
+    "invalidate_holiday_caches",
     # energy
     "is_high_season",
     "get_base_block",
     "get_current_block",
     "get_prev_next_block_info",
+    "invalidate_block_tables",
+    # schedule
+    "TariffSchedule",
+    "get_tariff_schedule",
+    "get_block_transitions",
+    "schedule_as_dict",
+    "schedule_as_csv",
 ]
@@ -1,4 +1,7 @@
+import bisect
 import datetime
+from functools import lru_cache
+from typing import NamedTuple
 
 def is_weekday(date: datetime.date) -> bool:
     """Return True if given date is a weekday (Monday–Friday)."""
@@ -70,19 +73,39 @@ def _get_holidays_for_year(year: int) -> list[tuple[datetime.date, str]]:
     return holidays
 
 
+class _HolidayIndex(NamedTuple):
+    """Lookup structures for the holidays of a single year."""
+
+    names: dict[datetime.date, str]
+    ordinals: list[int]
+    dates: list[datetime.date]
+
+
+# Bounded: a handful of years around "today" is all we ever need at runtime.
+@lru_cache(maxsize=8)
+def _get_holiday_index(year: int) -> _HolidayIndex:
+    """Return the cached holiday index for a given year."""
+    holidays = _get_holidays_for_year(year)
+    return _HolidayIndex(
+        names=dict(holidays),
+        ordinals=[h_date.toordinal() for h_date, _ in holidays],
+        dates=[h_date for h_date, _ in holidays],
+    )
+
+
 def is_holiday(date: datetime.date) -> bool:
     """Return True if given date is a Slovenian holiday."""
-    holidays = _get_holidays_for_year(date.year)
-    return any(h_date == date for h_date, _ in holidays)
+    return date in _get_holiday_index(date.year).names
 
 
 def get_holiday_name(date: datetime.date) -> str | None:
     """Return the holiday name for the given date, or None if not a holiday."""
-    holidays = _get_holidays_for_year(date.year)
-    for h_date, name in holidays:
-        if h_date == date:
-            return name
-    return None
+    return _get_holiday_index(date.year).names.get(date)
+
+
+# Safety bound for get_next_holiday; every year has holidays, so this is
+# never reached in practice.
+_NEXT_HOLIDAY_MAX_YEARS = 2
 
 
 def get_next_holiday(date: datetime.date) -> tuple[datetime.date | None, str | None]:
@@ -90,13 +113,41 @@ def get_next_holiday(date: datetime.date) -> tuple[datetime.date | None, str | N
 
     Returns (holiday_date, holiday_name) or (None, None) if none is found.
     """
-    # We include holidays from this year and next year to handle year-end.
-    holidays = _get_holidays_for_year(date.year) + _get_holidays_for_year(date.year + 1)
+    ordinal = date.toordinal()
+
+    for year in range(date.year, date.year + _NEXT_HOLIDAY_MAX_YEARS + 1):
+        index = _get_holiday_index(year)
+        pos = bisect.bisect_right(index.ordinals, ordinal)
+        if pos < len(index.ordinals):
+            next_date = index.dates[pos]
+            return next_date, index.names[next_date]
+
+    return None, None
+
+
+@lru_cache(maxsize=8)
+def get_work_free_days(year: int) -> bytes:
+    """Return one byte per day of the year: 1 if work-free, else 0.
+
+    Weekends are set by striding over the year, holidays from the index,
+    so a whole year costs a few slice assignments instead of 365 lookups.
+    """
+    first = datetime.date(year, 1, 1)
+    days = (datetime.date(year + 1, 1, 1) - first).days
+    flags = bytearray(days)
+
+    for weekday in (5, 6):
+        day = (weekday - first.weekday()) % 7
+        flags[day::7] = b"\x01" * len(range(day, days, 7))
+
+    base = first.toordinal()
+    for ordinal in _get_holiday_index(year).ordinals:
+        flags[ordinal - base] = 1
+
+    return bytes(flags)
 
-    future = [(h_date, name) for h_date, name in holidays if h_date > date]
-    if not future:
-        return None, None
 
-    # Since holidays list is sorted, the first future one is the next holiday.
-    next_date, next_name = future[0]
-    return next_date, next_name
+def invalidate_holiday_caches() -> None:
+    """Drop the cached holiday indexes and work-free day flags."""
+    _get_holiday_index.cache_clear()
+    get_work_free_days.cache_clear()
@@ -4,6 +4,7 @@ import datetime
 from .calendar import (
     is_weekend,
     is_holiday,
+    invalidate_holiday_caches,
 )
 
 
@@ -53,6 +54,84 @@ def get_base_block(hour: int) -> int:
     raise ValueError(f"Invalid hour: {hour}")
 
 
+# Mapping: (is_high_season, is_free_day) -> offset
+_SEASON_OFFSETS = {
+    (True, False): 0,   # high season, workday
+    (True, True): 1,    # high season, free day
+    (False, False): 1,  # low season, workday
+    (False, True): 2,   # low season, free day
+}
+
+# How many yearly block tables are kept in memory at once.
+_BLOCK_TABLES_MAX_YEARS = 4
+
+# year -> (ordinal of January 1st, one byte per hour of the year)
+_BLOCK_TABLES: dict[int, tuple[int, bytes]] = {}
+
+
+def _compute_block(date: datetime.date, hour: int) -> int:
+    """Compute the block for a single hour directly from the tariff rules.
+
+    This is the reference implementation used to build the yearly block
+    tables; runtime lookups go through get_current_block().
+    """
+    base = get_base_block(hour)
+    is_work_free = is_weekend(date) or is_holiday(date)
+    high = is_high_season(date)
+    return base + _SEASON_OFFSETS[(high, is_work_free)]
+
+
+def _build_block_table(year: int) -> tuple[int, bytes]:
+    """Build the block table for every hour of the given year."""
+    base_blocks = [get_base_block(hour) for hour in range(24)]
+    day_templates = {
+        offset: bytes(block + offset for block in base_blocks)
+        for offset in set(_SEASON_OFFSETS.values())
+    }
+
+    first = datetime.date(year, 1, 1)
+    days = (datetime.date(year + 1, 1, 1) - first).days
+
+    rows = []
+    for day in range(days):
+        date = first + datetime.timedelta(days=day)
+        is_work_free = is_weekend(date) or is_holiday(date)
+        offset = _SEASON_OFFSETS[(is_high_season(date), is_work_free)]
+        rows.append(day_templates[offset])
+
+    return first.toordinal(), b"".join(rows)
+
+
+def _get_block_table(year: int) -> tuple[int, bytes]:
+    """Return the (lazily built) block table for the given year."""
+    table = _BLOCK_TABLES.get(year)
+    if table is None:
+        if len(_BLOCK_TABLES) >= _BLOCK_TABLES_MAX_YEARS:
+            # Drop the year furthest away from the one being requested
+            del _BLOCK_TABLES[max(_BLOCK_TABLES, key=lambda y: abs(y - year))]
+        table = _BLOCK_TABLES[year] = _build_block_table(year)
+    return table
+
+
+def block_table_for_year(year: int) -> tuple[int, bytes]:
+    """Return (ordinal of January 1st, one block per hour) for the given year.
+
+    A cached table is reused; other years are built without caching them,
+    so long date ranges do not evict the years in use at runtime.
+    """
+    return _BLOCK_TABLES.get(year) or _build_block_table(year)
+
+
+def invalidate_block_tables() -> None:
+    """Drop the cached block tables and the holiday caches they are built from.
+
+    The tariff rules and holidays are fixed in code, so nothing calls this
+    at runtime; tests and benchmarks use it to rebuild from patched rules.
+    """
+    invalidate_holiday_caches()
+    _BLOCK_TABLES.clear()
+
+
 def get_current_block(date: datetime.date, hour: int) -> int:
     """
     Compute the current block based on:
@@ -68,21 +147,14 @@ def get_current_block(date: datetime.date, hour: int) -> int:
       Low season:
         workday       -> base + 1
         work-free day -> base + 2
-    """
-    base = get_base_block(hour)
-    is_work_free = is_weekend(date) or is_holiday(date)
-    high = is_high_season(date)
 
-    # Mapping: (is_high_season, is_free_day) -> offset
-    RULES = {
-        (True, False): 0,   # high season, workday
-        (True, True): 1,    # high season, free day
-        (False, False): 1,  # low season, workday
-        (False, True): 2,   # low season, free day
-    }
+    The result is read from a precomputed per-year table.
+    """
+    if not 0 <= hour <= 23:
+        raise ValueError(f"Invalid hour: {hour}")
 
-    offset = RULES[(high, is_work_free)]
-    return base + offset
+    first_ordinal, table = _get_block_table(date.year)
+    return table[(date.toordinal() - first_ordinal) * 24 + hour]
 
 
 def get_prev_next_block_info(now: datetime.datetime):
@@ -134,11 +206,9 @@ def get_prev_next_block_info(now: datetime.datetime):
         "minutes_to_next": minutes_to_next,
     }
 
+
 def get_blocks_for_today(date: datetime.date) -> list[int]:
     """Return a list of 24 tariff blocks for the given date."""
-    blocks: list[int] = []
-
-    for hour in range(24):
-        blocks.append(get_current_block(date, hour))
-
-    return blocks
\ No newline at end of file
+    first_ordinal, table = _get_block_table(date.year)
+    start = (date.toordinal() - first_ordinal) * 24
+    return list(table[start:start + 24])
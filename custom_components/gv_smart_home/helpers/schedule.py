@@ -0,0 +1,104 @@
+"""Tariff block schedules for whole date ranges.
+
+Built by slicing the yearly block tables instead of looking up every hour,
+so a year is a handful of byte copies and a decade stays in milliseconds.
+"""
+import datetime
+import itertools
+import operator
+from typing import NamedTuple
+
+from .calendar import get_work_free_days
+from .energy import block_table_for_year
+
+# Block value -> ASCII digit
+_DIGITS = bytes.maketrans(bytes(range(10)), b"0123456789")
+
+
+class TariffSchedule(NamedTuple):
+    """Blocks and work-free flags for consecutive days.
+
+    Like the block tables, every day has 24 hourly blocks (local time).
+    """
+
+    start: datetime.date
+    blocks: bytes     # 24 bytes per day
+    work_free: bytes  # 1 byte per day (0/1)
+
+    @property
+    def days(self) -> int:
+        return len(self.work_free)
+
+    @property
+    def end(self) -> datetime.date:
+        return self.start + datetime.timedelta(days=self.days - 1)
+
+
+def get_tariff_schedule(start: datetime.date, end: datetime.date) -> TariffSchedule:
+    """Return the schedule from start to end (both inclusive)."""
+    if end < start:
+        raise ValueError(f"End date {end} is before start date {start}")
+
+    blocks = []
+    work_free = []
+    for year in range(start.year, end.year + 1):
+        first_ordinal, table = block_table_for_year(year)
+        first_day = max(start, datetime.date(year, 1, 1)).toordinal() - first_ordinal
+        last_day = min(end, datetime.date(year, 12, 31)).toordinal() - first_ordinal
+        blocks.append(table[first_day * 24:(last_day + 1) * 24])
+        work_free.append(get_work_free_days(year)[first_day:last_day + 1])
+
+    return TariffSchedule(start, b"".join(blocks), b"".join(work_free))
+
+
+def get_block_transitions(schedule: TariffSchedule) -> list[tuple[datetime.datetime, int]]:
+    """Return (start of hour, new block) for every block change.
+
+    The first hour of the schedule is always included.
+    """
+    blocks = memoryview(schedule.blocks)
+    changed = itertools.compress(
+        range(1, len(blocks)), map(operator.ne, blocks[1:], blocks[:-1])
+    )
+    origin = datetime.datetime.combine(schedule.start, datetime.time())
+    hour = datetime.timedelta(hours=1)
+    return [
+        (origin + hour * index, blocks[index])
+        for index in itertools.chain((0,), changed)
+    ]
+
+
+def schedule_as_dict(schedule: TariffSchedule) -> dict:
+    """Compact JSON-serializable form.
+
+    blocks has one 24-digit string per day, work_free one digit per day.
+    """
+    digits = schedule.blocks.translate(_DIGITS).decode()
+    return {
+        "start": schedule.start.isoformat(),
+        "end": schedule.end.isoformat(),
+        "days": schedule.days,
+        "blocks": [digits[i:i + 24] for i in range(0, len(digits), 24)],
+        "work_free": schedule.work_free.translate(_DIGITS).decode(),
+        "transitions": [
+            [moment.isoformat(timespec="minutes"), block]
+            for moment, block in get_block_transitions(schedule)
+        ],
+    }
+
+
+def schedule_as_csv(schedule: TariffSchedule) -> str:
+    """One row per hour: date,hour,block,work_free."""
+    digits = schedule.blocks.translate(_DIGITS).decode()
+    free = schedule.work_free.translate(_DIGITS).decode()
+    rows = ["date,hour,block,work_free"]
+    date = schedule.start
+    day = datetime.timedelta(days=1)
+    for index in range(schedule.days):
+        prefix = date.isoformat()
+        rows.extend(
+            f"{prefix},{hour},{digits[index * 24 + hour]},{free[index]}"
+            for hour in range(24)
+        )
+        date += day
+    return "\n".join(rows) + "\n"
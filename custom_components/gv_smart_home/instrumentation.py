@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+
+# Histogram bucket upper edges in µs; one more bucket takes everything above
+BUCKET_EDGES_US = (
+    10, 20, 50, 100, 200, 500,
+    1_000, 2_000, 5_000, 10_000, 20_000, 50_000,
+    100_000, 200_000, 500_000, 1_000_000, 5_000_000, 10_000_000,
+)
+_EDGES_S = tuple(edge / 1e6 for edge in BUCKET_EDGES_US)
+
+# Stages timed by the sampler and the controller
+STAGE_SAMPLE = "sample"
+STAGE_BLOCK_LOOKUP = "block_lookup"
+STAGE_CONTROL_TICK = "control_tick"
+STAGE_AVERAGING = "averaging"
+STAGE_STATE_EVALUATION = "state_evaluation"
+STAGE_COORDINATOR_PUSH = "coordinator_push"
+STAGE_ACTUATION = "actuation"
+# How far behind schedule a control tick started, and how far the
+# interval between two samples was off
+STAGE_TICK_LATENESS = "tick_lateness"
+STAGE_SAMPLE_JITTER = "sample_jitter"
+
+# Counters
+LATE_TICKS = "late_ticks"
+MISSED_TICKS = "missed_ticks"
+SAMPLE_GAPS = "sample_gaps"
+SAMPLES_UNAVAILABLE = "samples_unavailable"
+
+
+class LatencyHistogram:
+    """Durations in fixed logarithmic buckets.
+
+    Recording is a bisect and an increment; quantiles are read back as the
+    upper edge of the bucket they fall in.
+    """
+
+    __slots__ = ("counts", "count", "total_s", "max_s")
+
+    def __init__(self):
+        self.counts = array("Q", [0]) * (len(_EDGES_S) + 1)
+        self.count = 0
+        self.total_s = 0.0
+        self.max_s = 0.0
+
+    def record(self, seconds: float) -> None:
+        self.counts[bisect_left(_EDGES_S, seconds)] += 1
+        self.count += 1
+        self.total_s += seconds
+        if seconds > self.max_s:
+            self.max_s = seconds
+
+    def quantile_us(self, q: float) -> float | None:
+        """Upper bucket edge below which a fraction q of the values fall."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                if index < len(BUCKET_EDGES_US):
+                    return float(BUCKET_EDGES_US[index])
+                return self.max_s * 1e6
+        return self.max_s * 1e6
+
+    def as_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "mean_us": round(self.total_s / self.count * 1e6, 1) if self.count else None,
+            "max_us": round(self.max_s * 1e6, 1),
+            "p50_us": self.quantile_us(0.5),
+            "p95_us": self.quantile_us(0.95),
+            "p99_us": self.quantile_us(0.99),
+            # upper edge in µs -> count; "inf" for the open bucket
+            "buckets": {
+                str(edge): count
+                for edge, count in zip((*BUCKET_EDGES_US, "inf"), self.counts)
+                if count
+            },
+        }
+
+
+class Instrumentation:
+    """Hot path timings and counters of one entry.
+
+    Callers time with time.perf_counter() and only touch this object while
+    instrumentation is enabled; when it is off, the hot paths skip it with
+    a single None check per stage.
+    """
+
+    def __init__(self):
+        self.stages: dict[str, LatencyHistogram] = {}
+        self.counters: dict[str, int] = {}
+        self.last_s: dict[str, float] = {}
+
+    def record(self, stage: str, seconds: float) -> None:
+        histogram = self.stages.get(stage)
+        if histogram is None:
+            histogram = self.stages[stage] = LatencyHistogram()
+        histogram.record(seconds)
+        self.last_s[stage] = seconds
+
+    def count(self, name: str, amount: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def reset(self) -> None:
+        self.stages.clear()
+        self.counters.clear()
+        self.last_s.clear()
+
+    def p95_us(self, stage: str) -> float | None:
+        histogram = self.stages.get(stage)
+        return histogram.quantile_us(0.95) if histogram else None
+
+    def as_dict(self) -> dict:
+        return {
+            "bucket_edges_us": list(BUCKET_EDGES_US),
+            "stages": {name: hist.as_dict() for name, hist in sorted(self.stages.items())},
+            "counters": dict(sorted(self.counters.items())),
+        }
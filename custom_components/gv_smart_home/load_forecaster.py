@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import math
+import struct
+import sys
+import zlib
+from array import array
+from datetime import datetime, timedelta
+from typing import Optional
+
+SLOT_MINUTES = 15
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+SLOTS_PER_WEEK = 7 * SLOTS_PER_DAY
+
+# Quantiles tracked per slot
+QUANTILES = (0.1, 0.5, 0.9)
+
+# Observations after which a slot adapts at a constant rate (~8 weeks)
+MAX_EFFECTIVE_COUNT = 8
+# A slot is trusted for prediction after this many observations
+MIN_OBSERVATIONS = 2
+# Quantile estimates move by this fraction of the slot's std per update
+QUANTILE_RATE = 0.2
+QUANTILE_MIN_STEP_W = 25.0
+
+_EXPORT_VERSION = 1
+_EXPORT_HEADER = struct.Struct("<BHB")
+
+
+def slot_of(moment: datetime) -> int:
+    """Slot-of-week index (Monday 00:00 = 0) for a moment."""
+    return (
+        moment.weekday() * SLOTS_PER_DAY
+        + moment.hour * (60 // SLOT_MINUTES)
+        + moment.minute // SLOT_MINUTES
+    )
+
+
+def slot_start(moment: datetime) -> datetime:
+    return moment.replace(
+        minute=moment.minute - moment.minute % SLOT_MINUTES, second=0, microsecond=0
+    )
+
+
+class LoadForecaster:
+    """Learns a weekly house load profile in 15-minute slots.
+
+    Every slot of the week keeps an exponentially weighted mean and
+    variance plus streaming quantile estimates, updated in O(1) per
+    observation. Values are grid power without EV charging, in the same
+    sign convention as the grid sensor (negative = import).
+    """
+
+    def __init__(self):
+        self._count = array("H", [0]) * SLOTS_PER_WEEK
+        self._mean = array("d", [0.0]) * SLOTS_PER_WEEK
+        self._var = array("d", [0.0]) * SLOTS_PER_WEEK
+        # Quantiles stored slot-major: slot * len(QUANTILES) + q
+        self._quantiles = array("d", [0.0]) * (SLOTS_PER_WEEK * len(QUANTILES))
+
+    # ------------------------------------------------------------------
+    # LEARNING
+    # ------------------------------------------------------------------
+    def learn(self, slot: int, value_w: float) -> None:
+        """Add one observed slot average."""
+        count = self._count[slot]
+        n_q = len(QUANTILES)
+        base = slot * n_q
+
+        if count == 0:
+            self._mean[slot] = value_w
+            self._var[slot] = 0.0
+            for k in range(n_q):
+                self._quantiles[base + k] = value_w
+            self._count[slot] = 1
+            return
+
+        alpha = 1.0 / min(count + 1, MAX_EFFECTIVE_COUNT)
+        delta = value_w - self._mean[slot]
+        self._mean[slot] += alpha * delta
+        self._var[slot] = (1.0 - alpha) * (self._var[slot] + alpha * delta * delta)
+
+        step = max(math.sqrt(self._var[slot]) * QUANTILE_RATE, QUANTILE_MIN_STEP_W)
+        for k, q in enumerate(QUANTILES):
+            estimate = self._quantiles[base + k]
+            if value_w > estimate:
+                self._quantiles[base + k] = min(estimate + step * q, value_w)
+            elif value_w < estimate:
+                self._quantiles[base + k] = max(estimate - step * (1.0 - q), value_w)
+
+        self._count[slot] = min(count + 1, 0xFFFF)
+
+    # ------------------------------------------------------------------
+    # PREDICTION
+    # ------------------------------------------------------------------
+    def slot_stats(self, slot: int) -> Optional[dict]:
+        count = self._count[slot]
+        if count < MIN_OBSERVATIONS:
+            return None
+        base = slot * len(QUANTILES)
+        return {
+            "count": count,
+            "mean": self._mean[slot],
+            "std": math.sqrt(self._var[slot]),
+            **{
+                f"q{round(q * 100)}": self._quantiles[base + k]
+                for k, q in enumerate(QUANTILES)
+            },
+        }
+
+    def predict(
+        self, now: datetime, horizon_minutes: int, quantile: Optional[float] = None
+    ) -> Optional[float]:
+        """Expected value over (now, now + horizon], overlap-weighted per slot.
+
+        With quantile, the slot quantile is used instead of the mean. Returns
+        None if any slot in the horizon has not been learned yet.
+        """
+        k = QUANTILES.index(quantile) if quantile is not None else None
+        end = now + timedelta(minutes=horizon_minutes)
+
+        total = 0.0
+        weight = 0.0
+        start = now
+        while start < end:
+            slot = slot_of(start)
+            if self._count[slot] < MIN_OBSERVATIONS:
+                return None
+            slot_end = slot_start(start) + timedelta(minutes=SLOT_MINUTES)
+            seconds = (min(slot_end, end) - start).total_seconds()
+            if k is None:
+                value = self._mean[slot]
+            else:
+                value = self._quantiles[slot * len(QUANTILES) + k]
+            total += value * seconds
+            weight += seconds
+            start = slot_end
+
+        if weight <= 0:
+            return None
+        return total / weight
+
+    def predict_slots(
+        self, start: datetime, count: int, quantile: Optional[float] = None
+    ) -> list[Optional[float]]:
+        """Per-slot values for count slots from start; None where not learned."""
+        k = QUANTILES.index(quantile) if quantile is not None else None
+        first = slot_of(start)
+        values: list[Optional[float]] = []
+        for i in range(count):
+            slot = (first + i) % SLOTS_PER_WEEK
+            if self._count[slot] < MIN_OBSERVATIONS:
+                values.append(None)
+            elif k is None:
+                values.append(self._mean[slot])
+            else:
+                values.append(self._quantiles[slot * len(QUANTILES) + k])
+        return values
+
+    # ------------------------------------------------------------------
+    # PERSISTENCE
+    # ------------------------------------------------------------------
+    def to_bytes(self) -> bytes:
+        parts = [_EXPORT_HEADER.pack(_EXPORT_VERSION, SLOTS_PER_WEEK, len(QUANTILES))]
+        for column in (self._count, self._mean, self._var, self._quantiles):
+            data = array(column.typecode, column)
+            if sys.byteorder != "little":
+                data.byteswap()
+            parts.append(data.tobytes())
+        return zlib.compress(b"".join(parts))
+
+    def restore(self, blob: bytes) -> None:
+        raw = zlib.decompress(blob)
+        version, slots, n_q = _EXPORT_HEADER.unpack_from(raw)
+        if version != _EXPORT_VERSION or slots != SLOTS_PER_WEEK or n_q != len(QUANTILES):
+            raise ValueError("Stored load profile does not match this version")
+
+        offset = _EXPORT_HEADER.size
+        columns = []
+        for column in (self._count, self._mean, self._var, self._quantiles):
+            data = array(column.typecode)
+            size = len(column) * data.itemsize
+            data.frombytes(raw[offset:offset + size])
+            if len(data) != len(column):
+                raise ValueError("Stored load profile is truncated")
+            if sys.byteorder != "little":
+                data.byteswap()
+            columns.append(data)
+            offset += size
+
+        self._count, self._mean, self._var, self._quantiles = columns
@@ -0,0 +1,27 @@
+from .const import DOMAIN
+from .number_entities.config_number import GVConfigNumber, CONFIG_NUMBERS
+
+
+async def async_setup_entry(
+        hass,
+        entry,
+        async_add_entities
+) -> None:
+    data = hass.data[DOMAIN][entry.entry_id]
+    coordinator = data["coordinator"]
+
+    async_add_entities(
+        GVConfigNumber(
+            coordinator=coordinator,
+            entry=entry,
+            key=key,
+            name=name,
+            unit=unit,
+            icon=icon,
+            min_value=min_value,
+            max_value=max_value,
+            step=step,
+            default=default,
+        )
+        for key, name, unit, icon, min_value, max_value, step, default in CONFIG_NUMBERS
+    )
@@ -0,0 +1 @@
+from .config_number import GVConfigNumber, CONFIG_NUMBERS
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from homeassistant.components.number import NumberEntity, NumberMode
+from homeassistant.const import EntityCategory
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from ..const import (
+    CONF_BLOCK_1,
+    CONF_BLOCK_2,
+    CONF_BLOCK_3,
+    CONF_BLOCK_4,
+    CONF_BLOCK_5,
+    CONF_RAMP_UP_STEP,
+    CONF_RAMP_DOWN_MINUTES,
+    RAMP_UP_MAX_STEP_W,
+    RAMP_DOWN_MINUTES_BEFORE,
+)
+
+# (config key, name, unit, icon, min, max, step, default)
+CONFIG_NUMBERS = [
+    (CONF_BLOCK_1, "GV Block 1 Limit", "kW", "mdi:numeric-1-box", 0, 13, 0.1, 5.0),
+    (CONF_BLOCK_2, "GV Block 2 Limit", "kW", "mdi:numeric-2-box", 0, 13, 0.1, 5.0),
+    (CONF_BLOCK_3, "GV Block 3 Limit", "kW", "mdi:numeric-3-box", 0, 13, 0.1, 5.0),
+    (CONF_BLOCK_4, "GV Block 4 Limit", "kW", "mdi:numeric-4-box", 0, 13, 0.1, 5.0),
+    (CONF_BLOCK_5, "GV Block 5 Limit", "kW", "mdi:numeric-5-box", 0, 13, 0.1, 5.0),
+    (CONF_RAMP_UP_STEP, "GV Ramp Up Step", "W", "mdi:stairs-up", 0, 11000, 100, RAMP_UP_MAX_STEP_W),
+    (CONF_RAMP_DOWN_MINUTES, "GV Ramp Down Lead Time", "min", "mdi:timer-sand",
+     0, 30, 1, RAMP_DOWN_MINUTES_BEFORE),
+]
+
+
+class GVConfigNumber(CoordinatorEntity, NumberEntity):
+    """Live-tunable setting stored in the config entry options.
+
+    Setting a value updates the entry options; the update listener applies
+    it in place, without reloading the entry, and then updates the state
+    from the new snapshot.
+    """
+
+    _attr_entity_category = EntityCategory.CONFIG
+    _attr_mode = NumberMode.BOX
+
+    def __init__(self, coordinator, entry, key, name, unit, icon, min_value, max_value, step, default):
+        super().__init__(coordinator)
+        self._entry = entry
+        self._key = key
+        self._default = default
+        self._attr_name = name
+        self._attr_unique_id = f"{entry.entry_id}_{key}"
+        self._attr_native_unit_of_measurement = unit
+        self._attr_icon = icon
+        self._attr_native_min_value = min_value
+        self._attr_native_max_value = max_value
+        self._attr_native_step = step
+
+    @property
+    def native_value(self):
+        return self.coordinator.get(self._key, self._default)
+
+    async def async_set_native_value(self, value: float) -> None:
+        self.hass.config_entries.async_update_entry(
+            self._entry,
+            options={**self._entry.options, self._key: value},
+        )
+
+    @property
+    def device_info(self):
+        return self.coordinator.device_info
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from homeassistant import config_entries
 
-from gv_smart_home.flow_schema import schema_step_blocks, schema_step_wallbox, schema_step_mg4
+from .flow_schema import schema_step_blocks, schema_step_wallbox, schema_step_mg4
 
 class GVSmartHomeOptionsFlow(config_entries.OptionsFlow):
     """Options flow for editing settings after installation."""
@@ -0,0 +1,611 @@
+"""Headless replay of the sampler and charging controller.
+
+Runs ConsumptionSampler and HomeChargingController with a simulated clock
+against a recorded house grid power series (without EV charging; negative
+= import). The simulated EVs draw whatever current the controller sets, so
+the report shows what the controller would have done:
+
+    python -m custom_components.gv_smart_home.replay grid.csv --limits 5,6,7,8,9
+
+Input is CSV (``timestamp,grid_power_w``; timestamp as ISO or epoch
+seconds), the compact binary format written by ``--convert``, or a decision
+trace: a diagnostics download or export_decision_trace response (``.json``)
+or a binary trace (``.trace``). A trace is replayed as the house load it
+recorded at each control tick, so a fix can be checked against the
+situation that produced a surprising decision; ``--trace`` writes the
+replayed decisions for comparison.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import csv
+import json
+import math
+import struct
+import sys
+import time
+import zlib
+from array import array
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Iterable, Mapping, Optional, cast
+
+from homeassistant.core import HomeAssistant
+
+from .allocation import amps_to_watts
+from .charge_controller import HomeChargingController
+from .charge_planner import ChargeTarget
+from .clock import Clock, SimulatedClock
+from .const import (
+    CONF_BLOCK_1,
+    CONF_BLOCK_2,
+    CONF_BLOCK_3,
+    CONF_BLOCK_4,
+    CONF_BLOCK_5,
+    CONF_GRID_POWER_ENTITY,
+    CONF_WB_CABLE,
+    CONF_WB_STATUS,
+    CONF_WB_POWER,
+    CONF_WB_SET_CURRENT,
+    CONF_MG_GUN_STATE,
+    CONF_MG_ACTIVE,
+    CONF_MG_SET_CURRENT,
+    CONF_ALLOCATION_POLICY,
+    CONF_SAMPLING_MODE,
+    CONF_INSTRUMENTATION,
+    CHARGER_VOLTAGE_V,
+    CC_FAST_INTERVAL_SECONDS,
+)
+from .consumption_sampler import ConsumptionSampler
+from .decision_trace import DecisionTrace
+from .helpers import get_current_block
+from .scheduler import GVScheduler
+from .settings import GVSettings
+from .store import decode_blob
+
+QUARTER_SECONDS = 15 * 60
+
+_BINARY_MAGIC = b"GVRP"
+_BINARY_VERSION = 1
+_BINARY_HEADER = struct.Struct("<4sBI")
+
+# Entities the replay simulates; replay configs only need the tuning keys
+REPLAY_ENTITIES = {
+    CONF_GRID_POWER_ENTITY: "sensor.replay_grid",
+    CONF_WB_CABLE: "binary_sensor.replay_wallbox_cable",
+    CONF_WB_STATUS: "sensor.replay_wallbox_status",
+    CONF_WB_POWER: "sensor.replay_wallbox_power",
+    CONF_WB_SET_CURRENT: "number.replay_wallbox_current",
+    CONF_MG_GUN_STATE: "binary_sensor.replay_mg4_gun",
+    CONF_MG_ACTIVE: "switch.replay_mg4_active",
+    CONF_MG_SET_CURRENT: "number.replay_mg4_current",
+}
+
+
+# ----------------------------------------------------------------------
+# INPUT
+# ----------------------------------------------------------------------
+def _parse_timestamp(text: str) -> float:
+    try:
+        return float(text)
+    except ValueError:
+        # naive ISO timestamps are local time
+        return datetime.fromisoformat(text).timestamp()
+
+
+def read_csv(path: str) -> tuple[array, array]:
+    """Read ``timestamp,grid_power_w`` rows (a header row is skipped)."""
+    timestamps = array("d")
+    powers = array("d")
+    with open(path, newline="") as handle:
+        for row in csv.reader(handle):
+            if len(row) < 2:
+                continue
+            try:
+                ts = _parse_timestamp(row[0].strip())
+            except ValueError:
+                continue  # header
+            value = row[1].strip()
+            try:
+                power = float(value)
+            except ValueError:
+                power = math.nan
+            timestamps.append(ts)
+            powers.append(power)
+    return timestamps, powers
+
+
+def write_binary(path: str, timestamps: array, powers: array) -> None:
+    """Epoch seconds as float64 and power as float32, zlib compressed."""
+    ts = array("d", timestamps)
+    pw = array("f", powers)
+    if sys.byteorder != "little":
+        ts.byteswap()
+        pw.byteswap()
+    header = _BINARY_HEADER.pack(_BINARY_MAGIC, _BINARY_VERSION, len(ts))
+    with open(path, "wb") as handle:
+        handle.write(zlib.compress(header + ts.tobytes() + pw.tobytes()))
+
+
+def read_binary(path: str) -> tuple[array, array]:
+    with open(path, "rb") as handle:
+        raw = zlib.decompress(handle.read())
+    magic, version, count = _BINARY_HEADER.unpack_from(raw)
+    if magic != _BINARY_MAGIC or version != _BINARY_VERSION:
+        raise ValueError(f"{path} is not a replay file of this version")
+
+    offset = _BINARY_HEADER.size
+    timestamps = array("d")
+    timestamps.frombytes(raw[offset:offset + count * 8])
+    offset += count * 8
+    powers = array("f")
+    powers.frombytes(raw[offset:offset + count * 4])
+    if len(timestamps) != count or len(powers) != count:
+        raise ValueError(f"{path} is truncated")
+    if sys.byteorder != "little":
+        timestamps.byteswap()
+        powers.byteswap()
+    return timestamps, array("d", powers)
+
+
+def read_trace(path: str) -> DecisionTrace:
+    """Decision trace from a binary trace or a JSON export of one.
+
+    JSON is a diagnostics download or an export_decision_trace response in
+    binary format (the first entry is used).
+    """
+    if not path.lower().endswith(".json"):
+        with open(path, "rb") as handle:
+            return DecisionTrace.from_bytes(handle.read())
+
+    with open(path) as handle:
+        data = json.load(handle)
+    # diagnostics downloads wrap the integration's data
+    data = data.get("data", data)
+    if "decision_trace" in data:
+        blob = data["decision_trace"].get("data")
+    else:
+        first: dict[str, Any] = next(iter(data.get("entries", {}).values()), {})
+        blob = first.get("data")
+    if not blob:
+        raise ValueError(f"{path} does not contain a binary decision trace")
+    return DecisionTrace.from_bytes(decode_blob(blob))
+
+
+def trace_series(trace: DecisionTrace) -> tuple[array, array]:
+    """House load (grid power without EV charging) at each traced tick."""
+    timestamps = array("d")
+    powers = array("d")
+    for record in trace:
+        timestamps.append(record.ts)
+        powers.append(record.house_w)
+    return timestamps, powers
+
+
+def write_trace(path: str, trace: DecisionTrace) -> None:
+    """CSV for a .csv path, the compressed binary trace otherwise."""
+    if path.lower().endswith(".csv"):
+        with open(path, "w", newline="") as handle:
+            handle.write(trace.to_csv())
+    else:
+        with open(path, "wb") as handle:
+            handle.write(trace.to_bytes())
+
+
+def load_series(path: str) -> tuple[array, array]:
+    lower = path.lower()
+    if lower.endswith(".csv"):
+        return read_csv(path)
+    if lower.endswith((".json", ".trace")):
+        return trace_series(read_trace(path))
+    return read_binary(path)
+
+
+# ----------------------------------------------------------------------
+# SIMULATED HOME ASSISTANT
+# ----------------------------------------------------------------------
+class _State:
+    __slots__ = ("state", "attributes")
+
+    def __init__(self, state: str, attributes: Optional[dict] = None):
+        self.state = state
+        self.attributes = attributes or {}
+
+
+class _States(dict):
+    def get(self, entity_id, default=None):
+        return dict.get(self, entity_id, default)
+
+
+class _Services:
+    """Applies number writes and switch toggles to the simulated states."""
+
+    def __init__(self, states: _States):
+        self.states = states
+        self.writes: dict[str, int] = {}
+        self.churn_a: dict[str, float] = {}
+        # Calls of any service; unchanged means the EV power is unchanged
+        self.calls = 0
+
+    async def async_call(self, domain, service, data, blocking=False):
+        entity_id = data["entity_id"]
+        old = self.states.get(entity_id)
+        self.calls += 1
+        self.writes[entity_id] = self.writes.get(entity_id, 0) + 1
+        if service in ("turn_on", "turn_off"):
+            self.states[entity_id] = _State("on" if service == "turn_on" else "off")
+            return
+        value = float(data["value"])
+        self.churn_a[entity_id] = self.churn_a.get(entity_id, 0.0) + abs(value - float(old.state))
+        self.states[entity_id] = _State(str(value), old.attributes)
+
+
+class _Hass:
+    def __init__(self):
+        self.states = _States()
+        self.services = _Services(self.states)
+        self._tasks: list[asyncio.Task] = []
+
+    def set_state(self, entity_id: str, state: str, attributes: Optional[dict] = None) -> None:
+        self.states[entity_id] = _State(state, attributes)
+
+    def async_create_task(self, coro) -> asyncio.Task:
+        task = asyncio.get_running_loop().create_task(coro)
+        self._tasks.append(task)
+        return task
+
+    async def async_block_till_done(self) -> None:
+        while self._tasks:
+            await self._tasks.pop()
+
+
+class _Scheduler(GVScheduler):
+    """Shared scheduler ticked by the caller instead of a timer."""
+
+    def __init__(self, hass: _Hass, clock: Clock):
+        # the simulated hass stands in for Home Assistant
+        super().__init__(cast(HomeAssistant, hass), clock)
+
+    def _ensure_running(self) -> None:
+        pass
+
+    def _stop_if_idle(self) -> None:
+        pass
+
+
+class _Coordinator:
+    """Just enough of GVChargingCoordinator for the sampler and controller."""
+
+    def __init__(self, settings: GVSettings):
+        self.settings = settings
+        self.data: dict[str, Any] = {}
+
+    async def async_set(self, **values):
+        self.data.update(values)
+        return list(values)
+
+
+# ----------------------------------------------------------------------
+# REPORT
+# ----------------------------------------------------------------------
+@dataclass
+class ReplayReport:
+    samples: int = 0
+    ticks: int = 0
+    simulated_hours: float = 0.0
+    wall_seconds: float = 0.0
+    ev_energy_kwh: float = 0.0
+    import_energy_kwh: float = 0.0
+    # Highest 15-minute average import per block, kW
+    peak_kw: dict[int, float] = field(default_factory=dict)
+    limit_kw: dict[int, float] = field(default_factory=dict)
+    violations: int = 0
+    worst_excess_kw: float = 0.0
+    worst_quarter: Optional[str] = None
+    setpoint_writes: dict[str, int] = field(default_factory=dict)
+    setpoint_churn_a: dict[str, float] = field(default_factory=dict)
+    # Hot path timings when instrumentation is enabled in the config
+    instrumentation: dict[str, Any] = field(default_factory=dict)
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+    def format(self) -> str:
+        lines = [
+            f"samples          {self.samples} ({self.simulated_hours:.1f} h simulated"
+            f" in {self.wall_seconds:.1f} s)",
+            f"control ticks    {self.ticks}",
+            f"EV energy        {self.ev_energy_kwh:.1f} kWh",
+            f"grid import      {self.import_energy_kwh:.1f} kWh",
+            f"violations       {self.violations} quarter-hours"
+            f" (worst +{self.worst_excess_kw:.2f} kW at {self.worst_quarter or '-'})",
+            "block  peak 15 min  limit",
+        ]
+        for block in sorted(self.peak_kw):
+            lines.append(
+                f"{block:>5}  {self.peak_kw[block]:>8.2f} kW  {self.limit_kw[block]:>5.2f} kW"
+            )
+        for name in sorted(self.setpoint_writes):
+            lines.append(
+                f"{name:<16} {self.setpoint_writes[name]} writes,"
+                f" {self.setpoint_churn_a[name]:.0f} A total change"
+            )
+        for stage, timing in self.instrumentation.get("stages", {}).items():
+            lines.append(
+                f"{stage:<16} mean {timing['mean_us']} us, p95 {timing['p95_us']} us,"
+                f" max {timing['max_us']} us"
+            )
+        for name, count in self.instrumentation.get("counters", {}).items():
+            lines.append(f"{name:<16} {count}")
+        return "\n".join(lines)
+
+
+# ----------------------------------------------------------------------
+# ENGINE
+# ----------------------------------------------------------------------
+class ReplayEngine:
+    """Drives the real sampler and controller from a recorded series.
+
+    Samples are recorded at their own timestamps and control ticks run at
+    the cadence the controller asks for; between events the house load and
+    the EV setpoints are held. Simulated EVs have no battery limit.
+
+    The decision trace of the last run is kept as `trace`; trace_capacity
+    overrides the controller's default size.
+
+    Every tick runs the full control path, so the run time follows the
+    tick count: about 150 us per tick, samples included. With a charger
+    plugged in the cadence is mostly fast, and a month of 10-second data
+    (some 200,000 ticks) takes about half a minute.
+    """
+
+    def __init__(
+        self, config: Mapping[str, Any], plugged_in: Iterable[str] = ("wallbox",),
+        charge_target: Optional[ChargeTarget] = None, trace_capacity: Optional[int] = None,
+    ):
+        self.settings = GVSettings.from_config({**REPLAY_ENTITIES, **config})
+        self.plugged_in = set(plugged_in)
+        self.charge_target = charge_target
+        self.trace_capacity = trace_capacity
+        self.trace: Optional[DecisionTrace] = None
+
+    def build(self, start: datetime, hass=None, clock=None, scheduler=None):
+        """Simulated hass, clock, sampler and controller starting at start.
+
+        A fleet passes its shared hass, clock and scheduler.
+        """
+        hass = hass or _Hass()
+        settings = self.settings
+        wallbox = "wallbox" in self.plugged_in
+        mg4 = "mg4" in self.plugged_in
+        hass.set_state(settings.wb_cable, "on" if wallbox else "off")
+        hass.set_state(settings.wb_status, "ready")
+        hass.set_state(settings.wb_power, "0")
+        hass.set_state(settings.mg_gun_state, "on" if mg4 else "off")
+        hass.set_state(settings.mg_active, "off")
+        hass.set_state(settings.wb_set_current, "0", {"min": 0, "max": 32})
+        # like the car's API, the MG4 stops through its charging switch
+        hass.set_state(settings.mg_set_current, "6", {"min": 6, "max": 32})
+
+        clock = clock or SimulatedClock(start)
+        coordinator = _Coordinator(settings)
+        sampler = ConsumptionSampler(hass, None, coordinator, clock=clock, scheduler=scheduler)
+        controller = HomeChargingController(
+            hass, sampler, None, coordinator, clock=clock, scheduler=scheduler
+        )
+        controller.charger_cache.refresh()
+        if self.trace_capacity:
+            controller.trace = DecisionTrace(self.trace_capacity)
+        if self.charge_target is not None:
+            controller.set_charge_target(self.charge_target.energy_kwh, self.charge_target.departure)
+        return hass, clock, sampler, controller
+
+    def _ev_power_w(self, hass: _Hass, controller: HomeChargingController) -> dict[str, float]:
+        power: dict[str, float] = {}
+        for spec in controller.chargers:
+            state = hass.states.get(spec.entity_id)
+            amps = float(state.state) if state is not None else 0.0
+            pause = hass.states.get(spec.pause_entity_id) if spec.pause_entity_id else None
+            if pause is not None and pause.state == "off":
+                amps = 0.0
+            power[spec.name] = amps_to_watts(amps, spec.phases, CHARGER_VOLTAGE_V)
+        return power
+
+    async def async_run(self, timestamps: array, powers: array) -> ReplayReport:
+        report = ReplayReport()
+        if not timestamps:
+            return report
+
+        started = time.perf_counter()
+        start = datetime.fromtimestamp(timestamps[0])
+        hass, clock, sampler, controller = self.build(start)
+        limits_w = self.settings.block_limits_w
+
+        # Held values between events
+        t = timestamps[0]
+        house_w = math.nan
+        ev_w = 0.0
+        ev_ws = 0.0
+        import_ws = 0.0
+
+        quarter_start = t - (t % QUARTER_SECONDS)
+        quarter_import_ws = 0.0
+
+        def close_quarter(q_start: float, q_import_ws: float) -> None:
+            moment = datetime.fromtimestamp(q_start)
+            block = get_current_block(moment.date(), moment.hour)
+            avg_w = q_import_ws / QUARTER_SECONDS
+            report.limit_kw[block] = limits_w[block] / 1000
+            report.peak_kw[block] = max(report.peak_kw.get(block, 0.0), avg_w / 1000)
+            excess_w = avg_w - limits_w[block]
+            if excess_w > 0:
+                report.violations += 1
+                if excess_w / 1000 > report.worst_excess_kw:
+                    report.worst_excess_kw = excess_w / 1000
+                    report.worst_quarter = moment.isoformat(timespec="minutes")
+
+        def advance(to: float) -> None:
+            """Integrate the held values from t to `to`."""
+            nonlocal t, ev_ws, import_ws, quarter_start, quarter_import_ws
+            while t < to:
+                quarter_end = quarter_start + QUARTER_SECONDS
+                end = min(to, quarter_end)
+                seconds = end - t
+                if not math.isnan(house_w):
+                    grid_w = house_w - ev_w
+                    ev_ws += ev_w * seconds
+                    if grid_w < 0:
+                        import_ws += -grid_w * seconds
+                        quarter_import_ws += -grid_w * seconds
+                t = end
+                if t >= quarter_end:
+                    close_quarter(quarter_start, quarter_import_ws)
+                    quarter_start = quarter_end
+                    quarter_import_ws = 0.0
+
+        settings = self.settings
+        services = hass.services
+        calls = services.calls
+        next_tick = timestamps[0] + controller.interval_s
+        for i in range(len(timestamps)):
+            ts = timestamps[i]
+            while next_tick <= ts:
+                advance(next_tick)
+                clock.set(datetime.fromtimestamp(next_tick))
+                await controller.async_control_tick(None)
+                report.ticks += 1
+                # the EVs only change their draw when a setpoint is written
+                if services.calls != calls:
+                    calls = services.calls
+                    ev_by_charger = self._ev_power_w(hass, controller)
+                    ev_w = sum(ev_by_charger.values())
+                    hass.set_state(settings.wb_power, str(ev_by_charger["wallbox"]))
+                    controller.charger_cache.refresh()
+                next_tick += controller.interval_s
+
+            advance(ts)
+            moment = datetime.fromtimestamp(ts)
+            clock.set(moment)
+            house_w = powers[i]
+            grid_w = None if math.isnan(house_w) else int(house_w - ev_w)
+            sampler._record(moment, grid_w)
+
+        report.samples = len(timestamps)
+        report.simulated_hours = (timestamps[-1] - timestamps[0]) / 3600
+        report.ev_energy_kwh = ev_ws / 3.6e6
+        report.import_energy_kwh = import_ws / 3.6e6
+        for spec in controller.chargers:
+            report.setpoint_writes[spec.name] = hass.services.writes.get(spec.entity_id, 0)
+            report.setpoint_churn_a[spec.name] = hass.services.churn_a.get(spec.entity_id, 0.0)
+        if settings.instrumentation:
+            report.instrumentation = sampler.instrumentation.as_dict()
+        self.trace = controller.trace
+        report.wall_seconds = time.perf_counter() - started
+        return report
+
+    def run(self, timestamps: array, powers: array) -> ReplayReport:
+        return asyncio.run(self.async_run(timestamps, powers))
+
+
+# ----------------------------------------------------------------------
+# FLEET (shared scheduler load test)
+# ----------------------------------------------------------------------
+class ReplayFleet:
+    """Many entries on one simulated hass and one shared scheduler.
+
+    Entries are spread over `sites` grid sensors, so entries of one site
+    share their grid reads; every entry has its own chargers.
+    """
+
+    def __init__(self, config: Mapping[str, Any], entries: int, sites: int, start: datetime):
+        self.hass = _Hass()
+        self.clock = SimulatedClock(start)
+        self.scheduler = _Scheduler(self.hass, self.clock)
+        self.entries = []
+        grid = REPLAY_ENTITIES[CONF_GRID_POWER_ENTITY]
+        for index in range(entries):
+            entities = {key: f"{entity_id}_{index}" for key, entity_id in REPLAY_ENTITIES.items()}
+            entities[CONF_GRID_POWER_ENTITY] = f"{grid}_{index % sites}"
+            engine = ReplayEngine({**config, **entities})
+            _, _, sampler, controller = engine.build(
+                start, hass=self.hass, clock=self.clock, scheduler=self.scheduler
+            )
+            self.entries.append((sampler, controller))
+        for site in range(sites):
+            self.hass.set_state(f"{grid}_{site}", "-1500")
+
+    async def async_start(self) -> None:
+        for sampler, controller in self.entries:
+            await sampler.start()
+            # the charger state cache is refreshed by build(), not subscribed
+            controller._running = True
+            controller._schedule(controller.interval_s)
+
+    async def async_tick(self, seconds: float) -> float:
+        """Advance the clock and run one scheduler tick; returns its wall time."""
+        self.clock.set(self.clock.now() + timedelta(seconds=seconds))
+        started = time.perf_counter()
+        self.scheduler._handle_tick(None)
+        await self.hass.async_block_till_done()
+        return time.perf_counter() - started
+
+
+# ----------------------------------------------------------------------
+# CLI
+# ----------------------------------------------------------------------
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", help="CSV or binary grid power series")
+    parser.add_argument("--limits", default="5,6,7,8,9", help="block 1-5 limits in kW")
+    parser.add_argument("--policy", default=None, help="allocation policy")
+    parser.add_argument("--sampling-mode", default=None, help="interval or event")
+    parser.add_argument("--chargers", default="wallbox", help="plugged-in chargers, comma separated")
+    parser.add_argument("--instrumentation", action="store_true",
+                        help="report hot path timings")
+    parser.add_argument("--target", metavar="KWH@DEPARTURE",
+                        help="charge target, e.g. 30@2025-01-07T07:00")
+    parser.add_argument("--trace", metavar="OUT",
+                        help="write the replayed decisions (CSV for .csv, else binary)")
+    parser.add_argument("--convert", metavar="OUT", help="write the input as a binary file and exit")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    timestamps, powers = load_series(args.path)
+    if args.convert:
+        write_binary(args.convert, timestamps, powers)
+        return
+
+    limits = [float(value) for value in args.limits.split(",")]
+    config: dict[str, Any] = dict(zip(
+        (CONF_BLOCK_1, CONF_BLOCK_2, CONF_BLOCK_3, CONF_BLOCK_4, CONF_BLOCK_5), limits
+    ))
+    if args.policy:
+        config[CONF_ALLOCATION_POLICY] = args.policy
+    if args.sampling_mode:
+        config[CONF_SAMPLING_MODE] = args.sampling_mode
+    if args.instrumentation:
+        config[CONF_INSTRUMENTATION] = True
+
+    charge_target = None
+    if args.target:
+        energy, departure = args.target.split("@")
+        charge_target = ChargeTarget(float(energy), datetime.fromisoformat(departure))
+
+    trace_capacity = None
+    if args.trace and timestamps:
+        # room for every tick of the run at the fast cadence
+        trace_capacity = int((timestamps[-1] - timestamps[0]) / CC_FAST_INTERVAL_SECONDS) + 1
+
+    engine = ReplayEngine(
+        config, plugged_in=args.chargers.split(","), charge_target=charge_target,
+        trace_capacity=trace_capacity,
+    )
+    report = engine.run(timestamps, powers)
+    if args.trace and engine.trace is not None:
+        write_trace(args.trace, engine.trace)
+    print(json.dumps(report.as_dict(), indent=2) if args.json else report.format())
+
+
+if __name__ == "__main__":
+    main()
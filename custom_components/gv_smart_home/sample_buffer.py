@@ -0,0 +1,438 @@
+from __future__ import annotations
+
+import math
+import struct
+import sys
+import zlib
+from array import array
+from collections import deque
+from datetime import datetime
+from typing import Iterator, Optional
+
+_NAN = float("nan")
+
+# Serialized form: version, sample count, then each column (little-endian)
+_EXPORT_VERSION = 1
+_EXPORT_HEADER = struct.Struct("<BI")
+_COLUMNS = (
+    "_ts",
+    "_power",
+    "_current_block",
+    "_next_block",
+    "_minutes_to_next",
+    "_current_limit_w",
+    "_next_limit_w",
+)
+
+
+class SampleBuffer:
+    """Fixed-capacity ring buffer of grid power samples.
+
+    Samples are stored column-wise in typed arrays instead of one dict per
+    sample. Indexing (``buffer[-1]``) and iteration still yield the same
+    dicts the sampler used to store, so readers keep working unchanged.
+
+    Averages and extremes come from trailing windows attached with
+    add_window(); they share the buffer's storage and are updated
+    incrementally as samples come and go.
+    """
+
+    __slots__ = (
+        "capacity",
+        "_ts",
+        "_power",
+        "_current_block",
+        "_next_block",
+        "_minutes_to_next",
+        "_current_limit_w",
+        "_next_limit_w",
+        "_start",
+        "_len",
+        "_seq_end",
+        "_windows",
+    )
+
+    def __init__(self, capacity: int):
+        if capacity <= 0:
+            raise ValueError(f"Invalid capacity: {capacity}")
+
+        self.capacity = capacity
+        self._ts = array("d", [0.0]) * capacity
+        self._power = array("d", [_NAN]) * capacity
+        self._current_block = array("B", [0]) * capacity
+        self._next_block = array("B", [0]) * capacity
+        self._minutes_to_next = array("B", [0]) * capacity
+        self._current_limit_w = array("i", [0]) * capacity
+        self._next_limit_w = array("i", [0]) * capacity
+
+        self._start = 0
+        self._len = 0
+        # Sequence number of the next sample (total number appended)
+        self._seq_end = 0
+        self._windows: list[TimeWindow] = []
+
+    def add_window(self, span_seconds: float) -> TimeWindow:
+        """Attach an incrementally maintained trailing window."""
+        window = TimeWindow(self, span_seconds)
+        self._windows.append(window)
+        return window
+
+    # ------------------------------------------------------------------
+    # WRITE
+    # ------------------------------------------------------------------
+    def append(
+        self,
+        ts: datetime,
+        grid_power_w: Optional[int],
+        current_block: int,
+        next_block: int,
+        minutes_to_next: int,
+        current_block_limit_w: int,
+        next_block_limit_w: int,
+    ) -> None:
+        """Add a sample, overwriting the oldest one when full."""
+        if self._len == self.capacity:
+            self._drop_oldest()
+
+        ts_s = ts.timestamp()
+        if self._len:
+            # Close the segment held by the previous sample
+            last = (self._start + self._len - 1) % self.capacity
+            last_power = self._power[last]
+            if not math.isnan(last_power):
+                dt = ts_s - self._ts[last]
+                for window in self._windows:
+                    window._close_last(last_power, dt)
+
+        i = (self._start + self._len) % self.capacity
+        self._ts[i] = ts_s
+        self._current_block[i] = current_block
+        self._next_block[i] = next_block
+        self._minutes_to_next[i] = minutes_to_next
+        self._current_limit_w[i] = current_block_limit_w
+        self._next_limit_w[i] = next_block_limit_w
+
+        self._power[i] = _NAN if grid_power_w is None else grid_power_w
+
+        self._len += 1
+        seq = self._seq_end
+        self._seq_end += 1
+        for window in self._windows:
+            window._push(seq, self._power[i])
+
+    def clear(self) -> None:
+        self._start = 0
+        self._len = 0
+        for window in self._windows:
+            window._reset()
+
+    # ------------------------------------------------------------------
+    # PERSISTENCE
+    # ------------------------------------------------------------------
+    def to_bytes(self) -> bytes:
+        """Serialize the samples (oldest first) into a compact blob."""
+        order = [(self._start + k) % self.capacity for k in range(self._len)]
+        parts = [_EXPORT_HEADER.pack(_EXPORT_VERSION, self._len)]
+        for name in _COLUMNS:
+            column = getattr(self, name)
+            ordered = array(column.typecode, [column[i] for i in order])
+            if sys.byteorder != "little":
+                ordered.byteswap()
+            parts.append(ordered.tobytes())
+        return zlib.compress(b"".join(parts))
+
+    def restore(self, blob: bytes, not_before: Optional[datetime] = None) -> int:
+        """Append samples from a to_bytes() blob; returns how many were kept.
+
+        Samples taken before not_before are skipped.
+        """
+        raw = zlib.decompress(blob)
+        version, count = _EXPORT_HEADER.unpack_from(raw)
+        if version != _EXPORT_VERSION:
+            raise ValueError(f"Unsupported sample blob version: {version}")
+
+        offset = _EXPORT_HEADER.size
+        columns = []
+        for name in _COLUMNS:
+            column = array(getattr(self, name).typecode)
+            size = count * column.itemsize
+            column.frombytes(raw[offset:offset + size])
+            if sys.byteorder != "little":
+                column.byteswap()
+            columns.append(column)
+            offset += size
+
+        min_ts = not_before.timestamp() if not_before else float("-inf")
+        last_ts = self._ts[self._index(self._seq_end - 1)] if self._len else float("-inf")
+        kept = 0
+        for ts, power, block, next_block, minutes, limit, next_limit in zip(*columns):
+            if ts < min_ts or ts <= last_ts:
+                continue
+            self.append(
+                ts=datetime.fromtimestamp(ts),
+                grid_power_w=None if math.isnan(power) else power,
+                current_block=block,
+                next_block=next_block,
+                minutes_to_next=minutes,
+                current_block_limit_w=limit,
+                next_block_limit_w=next_limit,
+            )
+            kept += 1
+        return kept
+
+    def _drop_oldest(self) -> None:
+        first_seq = self._seq_end - self._len
+        for window in self._windows:
+            if window._head == first_seq:
+                window._drop_head()
+
+        self._start = (self._start + 1) % self.capacity
+        self._len -= 1
+
+    # ------------------------------------------------------------------
+    # READ
+    # ------------------------------------------------------------------
+    def _index(self, seq: int) -> int:
+        """Array index of the sample with the given sequence number."""
+        return (self._start + seq - (self._seq_end - self._len)) % self.capacity
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __getitem__(self, index: int) -> dict:
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError("sample index out of range")
+        return self._sample_at((self._start + index) % self.capacity)
+
+    def __iter__(self) -> Iterator[dict]:
+        for offset in range(self._len):
+            yield self._sample_at((self._start + offset) % self.capacity)
+
+    def _sample_at(self, i: int) -> dict:
+        power = self._power[i]
+        return {
+            "ts": datetime.fromtimestamp(self._ts[i]),
+            "grid_power_w": None if math.isnan(power) else int(power),
+            "current_block": self._current_block[i],
+            "next_block": self._next_block[i],
+            "minutes_to_next": self._minutes_to_next[i],
+            "current_block_limit_w": self._current_limit_w[i],
+            "next_block_limit_w": self._next_limit_w[i],
+        }
+
+
+class TimeWindow:
+    """Trailing time window over a SampleBuffer.
+
+    Keeps the power-time integral and the sum/count of the samples in the
+    window, plus two monotonic deques of (sequence number, power) for the
+    rolling min/max, all updated incrementally by the owning buffer. The sample in
+    effect at the start of the window is kept so the time-weighted mean is
+    exact.
+    """
+
+    __slots__ = (
+        "span_seconds",
+        "_buffer",
+        "_head",
+        "_integral",
+        "_duration",
+        "_sum",
+        "_count",
+        "_min_q",
+        "_max_q",
+    )
+
+    def __init__(self, buffer: SampleBuffer, span_seconds: float):
+        self.span_seconds = span_seconds
+        self._buffer = buffer
+        self._min_q: deque[tuple[int, float]] = deque()
+        self._max_q: deque[tuple[int, float]] = deque()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._head = self._buffer._seq_end
+        self._integral = 0.0
+        self._duration = 0.0
+        self._sum = 0.0
+        self._count = 0
+        self._min_q.clear()
+        self._max_q.clear()
+
+    # ------------------------------------------------------------------
+    # Called by SampleBuffer
+    # ------------------------------------------------------------------
+    def _close_last(self, last_power: float, dt: float) -> None:
+        if self._head < self._buffer._seq_end:
+            self._integral += last_power * dt
+            self._duration += dt
+
+    def _push(self, seq: int, power: float) -> None:
+        if math.isnan(power):
+            return
+        self._sum += power
+        self._count += 1
+
+        max_q = self._max_q
+        while max_q and max_q[-1][1] <= power:
+            max_q.pop()
+        max_q.append((seq, power))
+        min_q = self._min_q
+        while min_q and min_q[-1][1] >= power:
+            min_q.pop()
+        min_q.append((seq, power))
+
+    def _drop_head(self) -> None:
+        buf = self._buffer
+        head = self._head
+        if head >= buf._seq_end:
+            return
+
+        i = buf._index(head)
+        power = buf._power[i]
+        if not math.isnan(power):
+            self._sum -= power
+            self._count -= 1
+            if head + 1 < buf._seq_end:
+                dt = buf._ts[buf._index(head + 1)] - buf._ts[i]
+                self._integral -= power * dt
+                self._duration -= dt
+
+        if self._max_q and self._max_q[0][0] == head:
+            self._max_q.popleft()
+        if self._min_q and self._min_q[0][0] == head:
+            self._min_q.popleft()
+        self._head = head + 1
+
+    # ------------------------------------------------------------------
+    # READ
+    # ------------------------------------------------------------------
+    def advance(self, now: datetime) -> None:
+        """Drop samples whose value is no longer in effect inside the window."""
+        self._advance(now.timestamp())
+
+    def _advance(self, now_ts: float) -> None:
+        buf = self._buffer
+        cutoff_ts = now_ts - self.span_seconds
+        last_seq = buf._seq_end - 1
+        while self._head < last_seq and buf._ts[buf._index(self._head + 1)] <= cutoff_ts:
+            self._drop_head()
+
+    def mean(self, now: datetime) -> Optional[float]:
+        """Time-weighted mean over the window ending at now."""
+        now_ts = now.timestamp()
+        self._advance(now_ts)
+        return self._mean(now_ts)
+
+    def stats(self, now: datetime) -> tuple[Optional[float], Optional[float], Optional[float]]:
+        """Time-weighted mean, min and max, advancing the window once."""
+        now_ts = now.timestamp()
+        self._advance(now_ts)
+        return (
+            self._mean(now_ts),
+            self._min_q[0][1] if self._min_q else None,
+            self._max_q[0][1] if self._max_q else None,
+        )
+
+    def _mean(self, now_ts: float) -> Optional[float]:
+        buf = self._buffer
+        if self._head >= buf._seq_end:
+            return None
+
+        since_ts = now_ts - self.span_seconds
+        integral = self._integral
+        duration = self._duration
+
+        last = buf._index(buf._seq_end - 1)
+        last_power = buf._power[last]
+        if not math.isnan(last_power):
+            dt = max(now_ts - buf._ts[last], 0.0)
+            integral += last_power * dt
+            duration += dt
+
+        head = buf._index(self._head)
+        head_power = buf._power[head]
+        if not math.isnan(head_power) and buf._ts[head] < since_ts:
+            if self._head + 1 < buf._seq_end:
+                end_ts = buf._ts[buf._index(self._head + 1)]
+            else:
+                end_ts = now_ts
+            dt = min(since_ts, end_ts) - buf._ts[head]
+            integral -= head_power * dt
+            duration -= dt
+
+        if duration <= 0:
+            return None if math.isnan(last_power) else last_power
+        return integral / duration
+
+    def sample_mean(self, now: datetime) -> Optional[float]:
+        """Plain mean of the valid samples taken inside the window."""
+        self.advance(now)
+        buf = self._buffer
+        total = self._sum
+        count = self._count
+
+        if self._head < buf._seq_end:
+            head = buf._index(self._head)
+            head_power = buf._power[head]
+            if not math.isnan(head_power) and buf._ts[head] < now.timestamp() - self.span_seconds:
+                total -= head_power
+                count -= 1
+
+        if not count:
+            return None
+        return total / count
+
+    def min(self, now: datetime) -> Optional[float]:
+        """Lowest valid power in the window."""
+        self.advance(now)
+        if not self._min_q:
+            return None
+        return self._min_q[0][1]
+
+    def max(self, now: datetime) -> Optional[float]:
+        """Highest valid power in the window."""
+        self.advance(now)
+        if not self._max_q:
+            return None
+        return self._max_q[0][1]
+
+
+class TimeEwma:
+    """Exponentially weighted moving average for irregularly timed samples.
+
+    Each value is treated as held until the next one arrives, so the decay
+    depends on elapsed time rather than on the number of samples.
+    """
+
+    __slots__ = ("tau_seconds", "_value", "_last_ts", "_last_power")
+
+    def __init__(self, tau_seconds: float):
+        self.tau_seconds = tau_seconds
+        self._value: Optional[float] = None
+        self._last_ts = 0.0
+        self._last_power: Optional[float] = None
+
+    def update(self, ts: datetime, power: Optional[float]) -> None:
+        ts_s = ts.timestamp()
+        self._value = self._value_at(ts_s)
+        if self._value is None:
+            self._value = power
+        self._last_ts = ts_s
+        self._last_power = power
+
+    def value(self, now: datetime) -> Optional[float]:
+        return self._value_at(now.timestamp())
+
+    def reset(self) -> None:
+        self._value = None
+        self._last_power = None
+
+    def _value_at(self, ts_s: float) -> Optional[float]:
+        if self._value is None or self._last_power is None:
+            return self._value
+        dt = max(ts_s - self._last_ts, 0.0)
+        decay = math.exp(-dt / self.tau_seconds)
+        return self._last_power + (self._value - self._last_power) * decay
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import time
+from datetime import timedelta
+from typing import Any, Callable, Coroutine, Optional
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
+
+from .clock import Clock, SYSTEM_CLOCK
+from .const import DATA_SCHEDULER, SCHEDULER_TICK_SECONDS
+
+_LOGGER = logging.getLogger(__name__)
+SCHEDULER_TICK = timedelta(seconds=SCHEDULER_TICK_SECONDS)
+
+
+class _Sampler:
+    """Registration of a sampler with the scheduler."""
+
+    __slots__ = ("sampler", "period_s", "due")
+
+    def __init__(self, sampler, period_s: float, due: float):
+        self.sampler = sampler
+        self.period_s = period_s
+        self.due = due
+
+
+class GVScheduler:
+    """One timer for the sampling and control loops of every config entry.
+
+    Each tick reads the grid sensors of all due samplers once (entries that
+    share a sensor share the read) and starts every control tick that has
+    come due, concurrently, in a single task. Delays are rounded to the
+    tick; a zero delay (a wake-up) still runs right away.
+    """
+
+    def __init__(self, hass: HomeAssistant, clock: Clock = SYSTEM_CLOCK):
+        self.hass = hass
+        self.clock = clock
+        self._tick_s = SCHEDULER_TICK.total_seconds()
+        self._samplers: dict[int, _Sampler] = {}
+        self._timers: dict[int, tuple[float, Callable[[Any], Coroutine[Any, Any, None]]]] = {}
+        self._ids = itertools.count()
+        self._unsub: Optional[CALLBACK_TYPE] = None
+
+        # Event loop time of the last tick, published for inspection
+        self.tick_count = 0
+        self.last_sample_s = 0.0
+        self.last_control_s = 0.0
+        self.max_tick_s = 0.0
+
+    # ------------------------------------------------------------------
+    # REGISTRATION
+    # ------------------------------------------------------------------
+    @callback
+    def add_sampler(self, sampler, period_s: float) -> CALLBACK_TYPE:
+        """Sample every period_s; returns a remove callback."""
+        key = next(self._ids)
+        self._samplers[key] = _Sampler(sampler, period_s, self.clock.monotonic() + period_s)
+        self._ensure_running()
+
+        @callback
+        def remove() -> None:
+            self._samplers.pop(key, None)
+            self._stop_if_idle()
+
+        return remove
+
+    @callback
+    def async_call_later(
+        self, delay_s: float, action: Callable[[Any], Coroutine[Any, Any, None]]
+    ) -> CALLBACK_TYPE:
+        """Run action on the first tick after delay_s; returns a cancel callback."""
+        if delay_s <= 0:
+            return async_call_later(self.hass, 0, action)
+
+        key = next(self._ids)
+        self._timers[key] = (self.clock.monotonic() + delay_s, action)
+        self._ensure_running()
+
+        @callback
+        def cancel() -> None:
+            self._timers.pop(key, None)
+            self._stop_if_idle()
+
+        return cancel
+
+    @callback
+    def _ensure_running(self) -> None:
+        if self._unsub is None:
+            self._unsub = async_track_time_interval(self.hass, self._handle_tick, SCHEDULER_TICK)
+
+    @callback
+    def _stop_if_idle(self) -> None:
+        if self._unsub is not None and not self._samplers and not self._timers:
+            self._unsub()
+            self._unsub = None
+
+    # ------------------------------------------------------------------
+    # TICK
+    # ------------------------------------------------------------------
+    @callback
+    def _handle_tick(self, now) -> None:
+        self.tick_count += 1
+        started = time.perf_counter()
+        # half a tick of slack, so a delay of n ticks is not pushed to n + 1
+        horizon = self.clock.monotonic() + self._tick_s / 2
+
+        self.sample_due(horizon)
+
+        due = [key for key, (at, _) in self._timers.items() if at <= horizon]
+        actions = [self._timers.pop(key)[1] for key in due]
+
+        self.last_sample_s = time.perf_counter() - started
+        self.max_tick_s = max(self.max_tick_s, self.last_sample_s)
+        if actions:
+            self.hass.async_create_task(self.async_run_actions(actions, now))
+
+    def sample_due(self, horizon: float) -> int:
+        """Record one sample for each due sampler; returns how many."""
+        now_dt = self.clock.now()
+        states: dict[str, Any] = {}
+        count = 0
+        for entry in self._samplers.values():
+            if entry.due > horizon:
+                continue
+            entry.due += entry.period_s
+            if entry.due <= horizon:
+                # fell behind (e.g. a blocked event loop): skip, don't burst
+                entry.due = horizon + entry.period_s
+            entity_id = entry.sampler.coordinator.settings.grid_entity
+            if not entity_id:
+                continue
+            if entity_id not in states:
+                states[entity_id] = self.hass.states.get(entity_id)
+            entry.sampler.sample_state(now_dt, states[entity_id])
+            count += 1
+        return count
+
+    async def async_run_actions(self, actions, now=None) -> None:
+        """Run due control ticks concurrently; one failing does not stop the rest."""
+        started = time.perf_counter()
+        results = await asyncio.gather(
+            *(action(now) for action in actions), return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                _LOGGER.error("Scheduled control tick failed", exc_info=result)
+        self.last_control_s = time.perf_counter() - started
+        self.max_tick_s = max(self.max_tick_s, self.last_sample_s + self.last_control_s)
+
+
+@callback
+def async_get_scheduler(hass: HomeAssistant) -> GVScheduler:
+    """The scheduler shared by all entries, created on first use."""
+    scheduler = hass.data.get(DATA_SCHEDULER)
+    if scheduler is None:
+        scheduler = hass.data[DATA_SCHEDULER] = GVScheduler(hass)
+    return scheduler
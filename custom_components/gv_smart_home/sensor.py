@@ -1,9 +1,18 @@
+import importlib
+
 from homeassistant.components.sensor import SensorEntity
+from homeassistant.const import EntityCategory
+from homeassistant.helpers.start import async_at_started
 
 from .const import DOMAIN
-from .sensors.calendar_info import GVSECalendarInfoSensor
-from .sensors.charging_sensor import GVChargingSensor, SENSORS  # SENSORS = lista definicij
-from .sensors.energy_info import GVSEnergyInfoSensor
+from .sensors.charging_sensor import (  # SENSORS = lista definicij
+    GVChargingSensor,
+    SENSORS,
+    STATS_SENSORS,
+    SCHEDULER_SENSORS,
+    PERF_SENSORS,
+    STARTUP_SENSORS,
+)
 
 
 async def async_setup_entry(
@@ -14,10 +23,8 @@ async def async_setup_entry(
     data = hass.data[DOMAIN][entry.entry_id]
     coordinator = data["coordinator"]
 
-    sensors = [
-        GVSECalendarInfoSensor(entry.entry_id),
-        GVSEnergyInfoSensor(entry.entry_id),
-    ]
+    # Coordinator sensors are cheap to add: they publish pushed values only
+    sensors = []
 
     # Add all charging sensors (factory pattern)
     for key, name, unit, icon in SENSORS:
@@ -32,5 +39,71 @@ async def async_setup_entry(
             )
         )
 
-    async_add_entities(sensors, update_before_add=True)
+    # Optional grid power statistics and scheduler counters
+    # (enable in the entity registry)
+    for key, name, unit, icon in STATS_SENSORS + SCHEDULER_SENSORS:
+        sensors.append(
+            GVChargingSensor(
+                coordinator=coordinator,
+                entry_id=entry.entry_id,
+                key=key,
+                name=name,
+                unit=unit,
+                icon=icon,
+                enabled_default=False,
+            )
+        )
+
+    # Hot path timings (enable instrumentation in the options)
+    for key, name, unit, icon in PERF_SENSORS:
+        sensors.append(
+            GVChargingSensor(
+                coordinator=coordinator,
+                entry_id=entry.entry_id,
+                key=key,
+                name=name,
+                unit=unit,
+                icon=icon,
+                enabled_default=False,
+                entity_category=EntityCategory.DIAGNOSTIC,
+            )
+        )
+
+    # Setup and startup time
+    for key, name, unit, icon in STARTUP_SENSORS:
+        sensors.append(
+            GVChargingSensor(
+                coordinator=coordinator,
+                entry_id=entry.entry_id,
+                key=key,
+                name=name,
+                unit=unit,
+                icon=icon,
+                entity_category=EntityCategory.DIAGNOSTIC,
+            )
+        )
+
+    async_add_entities(sensors)
+
+    # The calendar and tariff sensors compute their attributes (and the
+    # year's block table) when added, so they join after startup; their
+    # modules pull in the helpers and are loaded in the import executor
+    async def add_info_sensors(hass) -> None:
+        calendar_info, energy_info = [
+            await hass.async_add_import_executor_job(
+                importlib.import_module, f"{__package__}.sensors.{name}"
+            )
+            for name in ("calendar_info", "energy_info")
+        ]
+        if hass.data.get(DOMAIN, {}).get(entry.entry_id) is not data:
+            return  # unloaded while importing
+
+        async_add_entities([
+            calendar_info.GVSECalendarInfoSensor(entry.entry_id),
+            energy_info.GVSEnergyInfoSensor(
+                entry.entry_id, countdown=coordinator.settings.energy_countdown
+            ),
+        ])
+
+    entry.async_on_unload(async_at_started(hass, add_info_sensors))
 
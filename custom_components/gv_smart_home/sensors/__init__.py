@@ -1,5 +1,6 @@
 from homeassistant.components.sensor import SensorEntity
 
-from .charging_sensor import GVChargingSensor, SENSORS
-from .calendar_info import GVSECalendarInfoSensor
-from .energy_info import GVSEnergyInfoSensor
+from .charging_sensor import GVChargingSensor, SENSORS, STATS_SENSORS
+
+# The calendar and tariff sensors (calendar_info, energy_info) pull in the
+# helpers; sensor.py loads them in the import executor after startup
@@ -13,20 +13,22 @@ from ..helpers.calendar import (
     get_next_holiday,
 )
 
-SCAN_INTERVAL = datetime.timedelta(minutes=1)
-
-
 
 class GVSECalendarInfoSensor(SensorEntity):
-    """Main calendar info sensor."""
+    """Main calendar info sensor.
+
+    The value can only change at midnight, so state and attributes are
+    computed once per date and published at the day boundary.
+    """
 
     _attr_has_entity_name = True
-    _attr_should_poll = True
+    _attr_should_poll = False
 
     def __init__(self, entry_id: str) -> None:
         self._entry_id = entry_id
         self._attr_name = "GV SE Calendar Info"
         self._attr_unique_id = f"{entry_id}_calendar_info"
+        self._cache: tuple[datetime.date, str, dict] | None = None
 
     @staticmethod
     def _today():
@@ -50,19 +52,21 @@ class GVSECalendarInfoSensor(SensorEntity):
     async def _handle_midnight_update(self, now: datetime.datetime):
         self.async_write_ha_state()
 
-    @property
-    def native_value(self):
+    def _day_snapshot(self) -> tuple[str, dict]:
+        """State and attributes for today (cached per date)."""
         today = self._today()
+        if self._cache is not None and self._cache[0] == today:
+            return self._cache[1], self._cache[2]
 
-        if is_holiday(today):
-            return "holiday"
-        if is_weekend(today):
-            return "weekend"
-        return "weekday"
+        weekend = is_weekend(today)
+        holiday = is_holiday(today)
 
-    @property
-    def extra_state_attributes(self):
-        today = self._today()
+        if holiday:
+            value = "holiday"
+        elif weekend:
+            value = "weekend"
+        else:
+            value = "weekday"
 
         current_name = get_holiday_name(today)
         next_date, next_name = get_next_holiday(today)
@@ -74,10 +78,10 @@ class GVSECalendarInfoSensor(SensorEntity):
             days_to_next = None
             next_date_str = None
 
-        return {
-            "is_weekend": is_weekend(today),
-            "is_holiday": is_holiday(today),
-            "is_work_free_day": is_weekend(today) or is_holiday(today),
+        attributes = {
+            "is_weekend": weekend,
+            "is_holiday": holiday,
+            "is_work_free_day": weekend or holiday,
             "holiday_name": current_name,
             "next_holiday_name": next_name,
             "next_holiday_date": next_date_str,
@@ -85,6 +89,17 @@ class GVSECalendarInfoSensor(SensorEntity):
             "today": today.isoformat(),
         }
 
+        self._cache = (today, value, attributes)
+        return value, attributes
+
+    @property
+    def native_value(self):
+        return self._day_snapshot()[0]
+
+    @property
+    def extra_state_attributes(self):
+        return self._day_snapshot()[1]
+
     @property
     def device_info(self):
         return {
@@ -1,14 +1,11 @@
 from __future__ import annotations
 
 from homeassistant.components.sensor import SensorEntity
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EntityCategory
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.config_entries import ConfigEntry
 
-from homeassistant.helpers.update_coordinator import (
-    CoordinatorEntity,
-)
-
-from ..const import DOMAIN
+from ..const import DOMAIN, HC_STATS_WINDOWS_MINUTES
 
 SENSORS = [
     ("avg_grid_power_w", "GV Avg Grid Power", "W", "mdi:flash"),
@@ -18,15 +15,66 @@ SENSORS = [
     ("current_block", "GV Current Block", None, "mdi:calendar-clock"),
     ("next_block", "GV Next Block", None, "mdi:calendar-arrow-right"),
     ("minutes_to_next", "GV Minutes To Next Block", "min", "mdi:timer-outline"),
+    ("forecast_grid_power_w", "GV Forecast Grid Power", "W", "mdi:crystal-ball"),
+    ("quarter_average_w", "GV Quarter-Hour Projected Import", "W", "mdi:chart-timeline-variant"),
+    ("quarter_headroom_w", "GV Quarter-Hour Headroom", "W", "mdi:gauge"),
+    ("wallbox_allocated_w", "GV Wallbox Allocated Power", "W", "mdi:ev-station"),
+    ("mg4_allocated_w", "GV MG4 Allocated Power", "W", "mdi:car-electric"),
+    ("plan_power_w", "GV Planned Charging Power", "W", "mdi:calendar-clock"),
+    ("plan_remaining_kwh", "GV Charge Target Remaining", "kWh", "mdi:battery-charging"),
+    ("plan_shortfall_kwh", "GV Charge Target Shortfall", "kWh", "mdi:battery-alert"),
+]
+
+# Grid power statistics from the sampler (disabled by default)
+STATS_SENSORS = [
+    ("grid_ewma_w", "GV Grid Power EWMA", "W", "mdi:chart-bell-curve"),
+]
+for _minutes in HC_STATS_WINDOWS_MINUTES:
+    STATS_SENSORS += [
+        (f"grid_mean_{_minutes}m_w", f"GV Grid Power Mean {_minutes} min", "W", "mdi:chart-line"),
+        (f"grid_min_{_minutes}m_w", f"GV Grid Power Min {_minutes} min", "W", "mdi:arrow-collapse-down"),
+        (f"grid_max_{_minutes}m_w", f"GV Grid Power Max {_minutes} min", "W", "mdi:arrow-collapse-up"),
+    ]
+
+# Control loop scheduler (disabled by default)
+SCHEDULER_SENSORS = [
+    ("control_interval_s", "GV Control Interval", "s", "mdi:timer-sync-outline"),
+    ("control_tick_count", "GV Control Ticks", None, "mdi:counter"),
+    ("control_wake_count", "GV Control Wakeups", None, "mdi:alarm"),
+]
+
+# Hot path timings, published while instrumentation is enabled (diagnostic)
+PERF_SENSORS = [
+    ("perf_control_tick_ms", "GV Control Tick Time", "ms", "mdi:timer-outline"),
+    ("perf_control_tick_p95_ms", "GV Control Tick Time p95", "ms", "mdi:timer-alert-outline"),
+    ("perf_sample_p95_us", "GV Sample Time p95", "µs", "mdi:timer-outline"),
+    ("perf_late_ticks", "GV Late Control Ticks", None, "mdi:clock-alert-outline"),
+    ("perf_missed_ticks", "GV Missed Control Ticks", None, "mdi:clock-remove-outline"),
+    ("perf_sample_gaps", "GV Sample Gaps", None, "mdi:chart-timeline-variant-shimmer"),
+    ("perf_samples_unavailable", "GV Unavailable Samples", None, "mdi:lan-disconnect"),
+]
+
+# Entry setup and runtime startup time, published once per start (diagnostic)
+STARTUP_SENSORS = [
+    ("setup_ms", "GV Setup Time", "ms", "mdi:timer-play-outline"),
+    ("startup_ms", "GV Startup Time", "ms", "mdi:timer-check-outline"),
 ]
 
 
-class GVChargingSensor(CoordinatorEntity, SensorEntity):
-    """Sensor that exposes values from the charging controller."""
+class GVChargingSensor(SensorEntity):
+    """Sensor that exposes values from the charging controller.
+
+    Subscribes to its own coordinator key, so state is only written when
+    that value actually changes.
+    """
 
-    def __init__(self, coordinator, entry_id, key, name, unit, icon):
-        super().__init__(coordinator)
+    def __init__(
+        self, coordinator, entry_id, key, name, unit, icon, enabled_default=True,
+        entity_category: EntityCategory | None = None,
+    ):
         self._attr_should_poll = False
+        self._attr_entity_registry_enabled_default = enabled_default
+        self._attr_entity_category = entity_category
         self._coordinator = coordinator
         self._key = key
         self._attr_name = name
@@ -34,6 +82,16 @@ class GVChargingSensor(CoordinatorEntity, SensorEntity):
         self._attr_native_unit_of_measurement = unit
         self._attr_icon = icon
 
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self._coordinator.async_add_key_listener(self._key, self._handle_value_update)
+        )
+
+    @callback
+    def _handle_value_update(self) -> None:
+        self.async_write_ha_state()
+
     @property
     def native_value(self):
         return self._coordinator.data.get(self._key)
@@ -45,12 +103,7 @@ class GVChargingSensor(CoordinatorEntity, SensorEntity):
 
     @property
     def device_info(self):
-        return {
-            "identifiers": {(DOMAIN, "gv_charging_controller")},
-            "name": "GV Smart Charging",
-            "manufacturer": "Gogi",
-            "model": "EV Charging Logic",
-        }
+        return self._coordinator.device_info
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities):
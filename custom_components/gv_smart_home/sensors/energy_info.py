@@ -1,14 +1,16 @@
 import datetime
 from homeassistant.components.sensor import SensorEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.event import async_track_time_change
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import (
+    async_track_point_in_time,
+    async_track_time_change,
+)
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from ..const import DOMAIN
 from ..helpers.energy import (
     is_high_season,
-    get_base_block,
     get_current_block,
     get_prev_next_block_info,
     get_blocks_for_today,
@@ -16,9 +18,6 @@ from ..helpers.energy import (
 from ..helpers.calendar import is_weekend, is_holiday
 
 
-SCAN_INTERVAL_MINUTES = 1
-
-
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
@@ -27,19 +26,29 @@ async def async_setup_entry(
     """Register the GV Smart Home Energy Info sensor."""
     sensor = GVSEnergyInfoSensor(entry.entry_id)
 
-    async_add_entities([sensor], update_before_add=True)
+    async_add_entities([sensor])
 
 
 class GVSEnergyInfoSensor(SensorEntity):
-    """Provides detailed energy tariff block information."""
+    """Provides detailed energy tariff block information.
+
+    Push-driven: state is written only when the current, previous or next
+    block changes (and at midnight). Day-level attributes are computed once
+    per date. Minute countdown attributes are opt-in.
+    """
 
     _attr_has_entity_name = True
-    _attr_should_poll = True
+    _attr_should_poll = False
+    # The 24-hour schedule changes once a day; keep it out of the recorder
+    _unrecorded_attributes = frozenset({"blocks"})
 
-    def __init__(self, entry_id: str) -> None:
+    def __init__(self, entry_id: str, countdown: bool = False) -> None:
         self._entry_id = entry_id
+        self._countdown = countdown
         self._attr_name = "GV SE Energy Info"
         self._attr_unique_id = f"{entry_id}_energy_info"
+        self._day_cache: tuple[datetime.date, dict] | None = None
+        self._unsub_scheduled: CALLBACK_TYPE | None = None
 
     @staticmethod
     def _now() -> datetime.datetime:
@@ -49,28 +58,64 @@ class GVSEnergyInfoSensor(SensorEntity):
     async def async_added_to_hass(self):
         await super().async_added_to_hass()
 
-        # Midnight refresh
-        self.async_on_remove(
-            async_track_time_change(
-                self.hass, self._handle_midnight_update,
-                hour=0, minute=0, second=1
+        # Minute countdown refresh (opt-in)
+        if self._countdown:
+            self.async_on_remove(
+                async_track_time_change(
+                    self.hass, self._handle_minute_update,
+                    second=1
+                )
             )
-        )
 
-        # Hourly boundary refresh (block changes)
-        self.async_on_remove(
-            async_track_time_change(
-                self.hass, self._handle_hourly_update,
-                minute=0, second=1
-            )
+        self.async_on_remove(self._cancel_scheduled_update)
+        self._schedule_next_update()
+
+    #
+    # SCHEDULING
+    #
+    @staticmethod
+    def _block_context(moment: datetime.datetime) -> tuple[int, int, int]:
+        """(previous, current, next) block around the given hour."""
+        info = get_prev_next_block_info(moment)
+        return info["previous_block"], info["current_block"], info["next_block"]
+
+    @classmethod
+    def next_update_time(cls, now: datetime.datetime) -> datetime.datetime:
+        """Next hour boundary where the block context changes, or midnight."""
+        hour_start = now.replace(minute=0, second=0, microsecond=0)
+        context = cls._block_context(hour_start)
+
+        candidate = hour_start + datetime.timedelta(hours=1)
+        while candidate.hour != 0:
+            if cls._block_context(candidate) != context:
+                break
+            candidate += datetime.timedelta(hours=1)
+
+        # Same +1 s margin as the former time-change triggers
+        return candidate + datetime.timedelta(seconds=1)
+
+    @callback
+    def _schedule_next_update(self) -> None:
+        self._unsub_scheduled = async_track_point_in_time(
+            self.hass,
+            self._handle_scheduled_update,
+            self.next_update_time(self._now()),
         )
 
-    async def _handle_midnight_update(self, now: datetime.datetime):
-        """Force update at midnight."""
+    @callback
+    def _cancel_scheduled_update(self) -> None:
+        if self._unsub_scheduled:
+            self._unsub_scheduled()
+            self._unsub_scheduled = None
+
+    async def _handle_scheduled_update(self, now: datetime.datetime):
+        """Block context changed (or a new day started)."""
+        self._unsub_scheduled = None
         self.async_write_ha_state()
+        self._schedule_next_update()
 
-    async def _handle_hourly_update(self, now: datetime.datetime):
-        """Force update when hour changes (block change)."""
+    async def _handle_minute_update(self, now: datetime.datetime):
+        """Refresh countdown attributes."""
         self.async_write_ha_state()
 
     #
@@ -85,41 +130,56 @@ class GVSEnergyInfoSensor(SensorEntity):
     #
     # ATTRIBUTES
     #
+    def _day_attributes(self, today: datetime.date) -> dict:
+        """Attributes that only depend on the date (cached per day)."""
+        if self._day_cache is None or self._day_cache[0] != today:
+            high = is_high_season(today)
+            weekend = is_weekend(today)
+            holiday = is_holiday(today)
+            self._day_cache = (today, {
+                # High / Low season info
+                "is_high_season": high,
+                "season": "high" if high else "low",
+
+                # Day classification
+                "is_weekend": weekend,
+                "is_holiday": holiday,
+                "is_work_free_day": weekend or holiday,
+
+                "blocks": get_blocks_for_today(today),
+            })
+        return self._day_cache[1]
+
     @property
     def extra_state_attributes(self):
         now = self._now()
-        today = now.date()
-        hour = now.hour
-
-        high = is_high_season(today)
-        base_block = get_base_block(hour)
-        effective_block = get_current_block(today, hour)
+        day = self._day_attributes(now.date())
         block_info = get_prev_next_block_info(now)
 
-        return {
-            # High / Low season info
-            "is_high_season": high,
-            "season": "high" if high else "low",
-
-            # Day classification
-            "is_weekend": is_weekend(today),
-            "is_holiday": is_holiday(today),
-            "is_work_free_day": is_weekend(today) or is_holiday(today),
+        attributes = {
+            "is_high_season": day["is_high_season"],
+            "season": day["season"],
+            "is_weekend": day["is_weekend"],
+            "is_holiday": day["is_holiday"],
+            "is_work_free_day": day["is_work_free_day"],
 
             # Block logic
-            "effective_block": effective_block,
+            "effective_block": block_info["current_block"],
 
             # Prev / next block meta
             "previous_block": block_info["previous_block"],
             "next_block": block_info["next_block"],
             "same_as_previous": block_info["same_as_previous"],
             "same_as_next": block_info["same_as_next"],
-            "minutes_since_previous": block_info["minutes_since_previous"],
-            "minutes_to_next": block_info["minutes_to_next"],
-
-            "blocks": get_blocks_for_today(today),
         }
 
+        if self._countdown:
+            attributes["minutes_since_previous"] = block_info["minutes_since_previous"]
+            attributes["minutes_to_next"] = block_info["minutes_to_next"]
+
+        attributes["blocks"] = day["blocks"]
+        return attributes
+
     @property
     def device_info(self):
         return {
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import datetime
+from typing import Any
+
+import voluptuous as vol
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    CHARGE_PLAN_MAX_HOURS,
+    DOMAIN,
+    SERVICE_CLEAR_CHARGE_TARGET,
+    SERVICE_EXPORT_DECISION_TRACE,
+    SERVICE_SET_CHARGE_TARGET,
+    SERVICE_TARIFF_SCHEDULE,
+    TARIFF_SCHEDULE_MAX_YEARS,
+)
+from .store import encode_blob
+
+FORMAT_JSON = "json"
+FORMAT_CSV = "csv"
+FORMAT_BINARY = "binary"
+
+TARIFF_SCHEDULE_SCHEMA = vol.Schema({
+    vol.Required("start_date"): cv.date,
+    vol.Required("end_date"): cv.date,
+    vol.Optional("format", default=FORMAT_JSON): vol.In([FORMAT_JSON, FORMAT_CSV]),
+})
+
+CHARGE_TARGET_SCHEMA = vol.Schema({
+    vol.Required("energy_kwh"): vol.All(vol.Coerce(float), vol.Range(min=0.1, max=200)),
+    vol.Required("departure"): cv.datetime,
+    vol.Optional("config_entry_id"): cv.string,
+})
+
+CLEAR_CHARGE_TARGET_SCHEMA = vol.Schema({
+    vol.Optional("config_entry_id"): cv.string,
+})
+
+EXPORT_DECISION_TRACE_SCHEMA = vol.Schema({
+    vol.Optional("format", default=FORMAT_CSV): vol.In([FORMAT_CSV, FORMAT_BINARY]),
+    vol.Optional("config_entry_id"): cv.string,
+})
+
+
+def _controllers_by_entry(hass: HomeAssistant, call: ServiceCall) -> dict:
+    """Controllers addressed by the call, by entry id: one entry, or all of them."""
+    entries = hass.data.get(DOMAIN, {})
+    entry_id = call.data.get("config_entry_id")
+    if entry_id is not None:
+        if entry_id not in entries:
+            raise ServiceValidationError(f"Unknown config entry {entry_id}")
+        entries = {entry_id: entries[entry_id]}
+    controllers = {
+        entry_id: data["controller"]
+        for entry_id, data in entries.items()
+        if "controller" in data
+    }
+    if not controllers:
+        raise ServiceValidationError("No GV Smart Home entry is loaded")
+    return controllers
+
+
+def _controllers(hass: HomeAssistant, call: ServiceCall) -> list:
+    return list(_controllers_by_entry(hass, call).values())
+
+
+def export_decision_trace(trace, fmt: str) -> dict[str, Any]:
+    """Service response for one trace (runs in the executor).
+
+    Binary is the zlib compressed trace, base64 encoded.
+    """
+    result: dict[str, Any] = {"records": len(trace), "capacity": trace.capacity}
+    if fmt == FORMAT_BINARY:
+        result["data"] = encode_blob(trace.to_bytes())
+    else:
+        result["csv"] = trace.to_csv()
+    return result
+
+
+def build_tariff_schedule(start: datetime.date, end: datetime.date, fmt: str) -> dict:
+    """Service response for the given range (runs in the executor)."""
+    from .helpers import get_tariff_schedule, schedule_as_csv, schedule_as_dict
+
+    schedule = get_tariff_schedule(start, end)
+    if fmt == FORMAT_CSV:
+        return {
+            "start": schedule.start.isoformat(),
+            "end": schedule.end.isoformat(),
+            "days": schedule.days,
+            "csv": schedule_as_csv(schedule),
+        }
+    return schedule_as_dict(schedule)
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the domain services (once, independent of config entries)."""
+
+    async def handle_tariff_schedule(call: ServiceCall) -> ServiceResponse:
+        start = call.data["start_date"]
+        end = call.data["end_date"]
+        if end < start:
+            raise ServiceValidationError(f"end_date {end} is before start_date {start}")
+        if end.year - start.year >= TARIFF_SCHEDULE_MAX_YEARS:
+            raise ServiceValidationError(
+                f"Range is limited to {TARIFF_SCHEDULE_MAX_YEARS} years"
+            )
+        return await hass.async_add_executor_job(
+            build_tariff_schedule, start, end, call.data["format"]
+        )
+
+    async def handle_set_charge_target(call: ServiceCall) -> None:
+        departure = call.data["departure"]
+        if departure.tzinfo is not None:
+            # the controller works in naive local time
+            departure = dt_util.as_local(departure).replace(tzinfo=None)
+        hours = (departure - datetime.datetime.now()).total_seconds() / 3600
+        if not 0 < hours <= CHARGE_PLAN_MAX_HOURS:
+            raise ServiceValidationError(
+                f"departure must be within the next {CHARGE_PLAN_MAX_HOURS} hours"
+            )
+        for controller in _controllers(hass, call):
+            controller.set_charge_target(call.data["energy_kwh"], departure)
+
+    async def handle_clear_charge_target(call: ServiceCall) -> None:
+        for controller in _controllers(hass, call):
+            controller.clear_charge_target()
+
+    async def handle_export_decision_trace(call: ServiceCall) -> ServiceResponse:
+        # copied on the event loop, encoded in the executor
+        traces = {
+            entry_id: controller.trace.copy()
+            for entry_id, controller in _controllers_by_entry(hass, call).items()
+        }
+        entries: dict[str, Any] = {}
+        for entry_id, trace in traces.items():
+            entries[entry_id] = await hass.async_add_executor_job(
+                export_decision_trace, trace, call.data["format"]
+            )
+        return {"entries": entries}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_CHARGE_TARGET,
+        handle_set_charge_target,
+        schema=CHARGE_TARGET_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_CLEAR_CHARGE_TARGET,
+        handle_clear_charge_target,
+        schema=CLEAR_CHARGE_TARGET_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_EXPORT_DECISION_TRACE,
+        handle_export_decision_trace,
+        schema=EXPORT_DECISION_TRACE_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_TARIFF_SCHEDULE,
+        handle_tariff_schedule,
+        schema=TARIFF_SCHEDULE_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Mapping, Optional
+
+from .const import (
+    CONF_BLOCK_1,
+    CONF_BLOCK_2,
+    CONF_BLOCK_3,
+    CONF_BLOCK_4,
+    CONF_BLOCK_5,
+    CONF_GRID_POWER_ENTITY,
+    CONF_SAMPLING_MODE,
+    CONF_ENERGY_COUNTDOWN,
+    CONF_RAMP_UP_STEP,
+    CONF_RAMP_DOWN_MINUTES,
+    CONF_ALLOCATION_POLICY,
+    CONF_INSTRUMENTATION,
+    CONF_WB_POWER,
+    CONF_WB_SET_CURRENT,
+    CONF_WB_CABLE,
+    CONF_WB_STATUS,
+    CONF_MG_ACTIVE,
+    CONF_MG_SET_CURRENT,
+    CONF_MG_GUN_STATE,
+    HC_SAMPLING_MODE_INTERVAL,
+    ALLOCATION_POLICY_PRIORITY,
+    RAMP_UP_MAX_STEP_W,
+    RAMP_DOWN_MINUTES_BEFORE,
+)
+
+BLOCK_KEYS = (CONF_BLOCK_1, CONF_BLOCK_2, CONF_BLOCK_3, CONF_BLOCK_4, CONF_BLOCK_5)
+
+
+def _kw_to_w(value: Any) -> int:
+    return int(float(value or 0) * 1000)
+
+
+@dataclass(frozen=True, slots=True)
+class GVSettings:
+    """Typed snapshot of the entry configuration.
+
+    Built once per entry update by the coordinator and shared by all
+    consumers. Block limits are pre-converted to W and indexed by block
+    number (index 0 is unused).
+    """
+
+    block_limits_w: tuple[int, ...]
+    grid_entity: Optional[str]
+    sampling_mode: str
+    ramp_up_step_w: int
+    ramp_down_minutes: int
+    energy_countdown: bool
+    allocation_policy: str
+    instrumentation: bool
+
+    wb_power: Optional[str]
+    wb_set_current: Optional[str]
+    wb_cable: Optional[str]
+    wb_status: Optional[str]
+
+    mg_active: Optional[str]
+    mg_set_current: Optional[str]
+    mg_gun_state: Optional[str]
+
+    @classmethod
+    def from_config(cls, cfg: Mapping[str, Any]) -> GVSettings:
+        return cls(
+            block_limits_w=(0, *(_kw_to_w(cfg.get(key)) for key in BLOCK_KEYS)),
+            grid_entity=cfg.get(CONF_GRID_POWER_ENTITY) or None,
+            sampling_mode=cfg.get(CONF_SAMPLING_MODE, HC_SAMPLING_MODE_INTERVAL),
+            ramp_up_step_w=int(cfg.get(CONF_RAMP_UP_STEP, RAMP_UP_MAX_STEP_W)),
+            ramp_down_minutes=int(cfg.get(CONF_RAMP_DOWN_MINUTES, RAMP_DOWN_MINUTES_BEFORE)),
+            energy_countdown=bool(cfg.get(CONF_ENERGY_COUNTDOWN, False)),
+            allocation_policy=cfg.get(CONF_ALLOCATION_POLICY, ALLOCATION_POLICY_PRIORITY),
+            instrumentation=bool(cfg.get(CONF_INSTRUMENTATION, False)),
+            wb_power=cfg.get(CONF_WB_POWER) or None,
+            wb_set_current=cfg.get(CONF_WB_SET_CURRENT) or None,
+            wb_cable=cfg.get(CONF_WB_CABLE) or None,
+            wb_status=cfg.get(CONF_WB_STATUS) or None,
+            mg_active=cfg.get(CONF_MG_ACTIVE) or None,
+            mg_set_current=cfg.get(CONF_MG_SET_CURRENT) or None,
+            mg_gun_state=cfg.get(CONF_MG_GUN_STATE) or None,
+        )
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import base64
+import logging
+import time
+from datetime import timedelta
+from typing import Any, Callable, Optional
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    DOMAIN,
+    STORAGE_VERSION,
+    STORAGE_SAVE_INTERVAL_MINUTES,
+    STORAGE_SAVE_DELAY_SECONDS,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_SAVE_INTERVAL = timedelta(minutes=STORAGE_SAVE_INTERVAL_MINUTES)
+
+
+def encode_blob(blob: bytes) -> str:
+    """Binary payload -> JSON-safe string."""
+    return base64.b64encode(blob).decode("ascii")
+
+
+def decode_blob(text: str) -> bytes:
+    return base64.b64decode(text)
+
+
+class GVStateStore:
+    """Persists sampler history and controller state for one config entry.
+
+    Writes go through Home Assistant's Store: they are batched with
+    async_delay_save, serialized off the event loop, and pending writes are
+    flushed when Home Assistant shuts down.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str):
+        self.hass = hass
+        self._store: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.state")
+        self._data_func: Optional[Callable[[], dict[str, Any]]] = None
+        self._unsubs: list[CALLBACK_TYPE] = []
+
+    async def async_load(self) -> Optional[dict[str, Any]]:
+        try:
+            return await self._store.async_load()
+        except Exception:  # noqa: BLE001 - a broken store must not block setup
+            _LOGGER.warning("Could not load stored GV Smart Home state", exc_info=True)
+            return None
+
+    def start(self, data_func: Callable[[], dict[str, Any]]) -> None:
+        """Start periodic (batched) saving of data_func()."""
+        self._data_func = data_func
+        self._unsubs.append(
+            async_track_time_interval(
+                self.hass, self._handle_interval, STORAGE_SAVE_INTERVAL
+            )
+        )
+        # Make sure a save is pending when the final write is flushed
+        self._unsubs.append(
+            self.hass.bus.async_listen_once(
+                EVENT_HOMEASSISTANT_STOP, self._handle_interval
+            )
+        )
+
+    async def async_stop(self) -> None:
+        """Stop periodic saving and write the current state now."""
+        while self._unsubs:
+            self._unsubs.pop()()
+        if self._data_func is not None:
+            await self._store.async_save(self._collect())
+
+    async def async_remove(self) -> None:
+        await self._store.async_remove()
+
+    @callback
+    def _handle_interval(self, _now_or_event) -> None:
+        self._store.async_delay_save(self._collect, STORAGE_SAVE_DELAY_SECONDS)
+
+    def _collect(self) -> dict[str, Any]:
+        if self._data_func is None:
+            raise RuntimeError("State store was not started")
+        data = self._data_func()
+        data["saved_at"] = time.time()
+        return data
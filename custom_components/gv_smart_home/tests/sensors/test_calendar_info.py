@@ -1,9 +1,9 @@
 import datetime
 import pytest
 
-from custom_components.gv_smart_home.sensor.calendar_info import GVSECalendarInfoSensor
+from custom_components.gv_smart_home.sensors.calendar_info import GVSECalendarInfoSensor
 from custom_components.gv_smart_home.helpers import calendar as cal_module
-from custom_components.gv_smart_home.sensor import calendar_info as info_module
+from custom_components.gv_smart_home.sensors import calendar_info as info_module
 
 
 def test_calendar_info_weekday(monkeypatch):
@@ -62,3 +62,30 @@ def test_calendar_info_attributes(monkeypatch):
     assert attrs["next_holiday_name"] == "Christmas"
     assert attrs["is_holiday"] is True
     assert attrs["is_weekend"] is False
+
+
+def test_calendar_info_computed_once_per_day(monkeypatch):
+    today = {"date": datetime.date(2024, 5, 8)}
+    calls = []
+
+    monkeypatch.setattr(
+        GVSECalendarInfoSensor,
+        "_today",
+        staticmethod(lambda: today["date"])
+    )
+
+    def fake_next_holiday(d):
+        calls.append(d)
+        return datetime.date(2024, 6, 25), "Dan državnosti"
+
+    monkeypatch.setattr(info_module, "get_next_holiday", fake_next_holiday)
+
+    sensor = GVSECalendarInfoSensor("test_entry")
+    for _ in range(3):
+        assert sensor.native_value == "weekday"
+        assert sensor.extra_state_attributes["days_to_next_holiday"] == 48
+    assert calls == [datetime.date(2024, 5, 8)]
+
+    today["date"] = datetime.date(2024, 5, 11)  # Saturday
+    assert sensor.native_value == "weekend"
+    assert len(calls) == 2
@@ -0,0 +1,56 @@
+import datetime
+
+from custom_components.gv_smart_home.sensors.energy_info import GVSEnergyInfoSensor
+
+
+def _patch_now(monkeypatch, now):
+    monkeypatch.setattr(GVSEnergyInfoSensor, "_now", staticmethod(lambda: now))
+
+
+def test_next_update_before_block_change():
+    # Thursday, high season: blocks 1 (07-13) -> 2 (14-15)
+    now = datetime.datetime(2024, 12, 5, 10, 30)
+    assert GVSEnergyInfoSensor.next_update_time(now) == datetime.datetime(2024, 12, 5, 13, 0, 1)
+
+
+def test_next_update_at_block_change():
+    now = datetime.datetime(2024, 12, 5, 13, 15)
+    assert GVSEnergyInfoSensor.next_update_time(now) == datetime.datetime(2024, 12, 5, 14, 0, 1)
+
+
+def test_next_update_falls_back_to_midnight():
+    # 23:xx -> next is the day boundary
+    now = datetime.datetime(2024, 12, 5, 23, 10)
+    assert GVSEnergyInfoSensor.next_update_time(now) == datetime.datetime(2024, 12, 6, 0, 0, 1)
+
+
+def test_day_attributes_are_cached(monkeypatch):
+    from custom_components.gv_smart_home.sensors import energy_info as info_module
+
+    calls = []
+
+    def fake_blocks(date):
+        calls.append(date)
+        return [1] * 24
+
+    monkeypatch.setattr(info_module, "get_blocks_for_today", fake_blocks)
+    _patch_now(monkeypatch, datetime.datetime(2024, 12, 5, 10, 30))
+
+    sensor = GVSEnergyInfoSensor("test_entry")
+    sensor.extra_state_attributes
+    sensor.extra_state_attributes
+    assert len(calls) == 1
+
+    _patch_now(monkeypatch, datetime.datetime(2024, 12, 6, 0, 0, 1))
+    sensor.extra_state_attributes
+    assert len(calls) == 2
+
+
+def test_countdown_attributes_are_opt_in(monkeypatch):
+    _patch_now(monkeypatch, datetime.datetime(2024, 12, 5, 10, 30))
+
+    assert "minutes_to_next" not in GVSEnergyInfoSensor("test_entry").extra_state_attributes
+
+    attrs = GVSEnergyInfoSensor("test_entry", countdown=True).extra_state_attributes
+    assert attrs["minutes_to_next"] == 30
+    assert attrs["minutes_since_previous"] == 30
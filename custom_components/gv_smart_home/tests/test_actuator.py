@@ -0,0 +1,177 @@
+import asyncio
+
+from custom_components.gv_smart_home.actuator import (
+    ChargerActuator,
+    ChargingActuator,
+    pick_select_option,
+)
+from custom_components.gv_smart_home.allocation import ChargerSpec
+
+
+class _State:
+    def __init__(self, state, attributes=None):
+        self.state = state
+        self.attributes = attributes or {}
+
+
+class _Services:
+    def __init__(self, delay=0.0, failing=()):
+        self.calls = []
+        self.delay = delay
+        self.failing = set(failing)
+
+    async def async_call(self, domain, service, data, blocking=False):
+        self.calls.append((domain, service, data))
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if data["entity_id"] in self.failing:
+            raise RuntimeError("integration bug")
+
+
+class _Hass:
+    def __init__(self, states, delay=0.0, failing=()):
+        self.states = states
+        self.services = _Services(delay, failing)
+
+
+def _spec(entity_id, min_interval_s=60, pause_entity_id=None):
+    return ChargerSpec(
+        "wallbox", entity_id, 3, 16, 0, min_interval_s, pause_entity_id=pause_entity_id
+    )
+
+
+def test_pick_select_option():
+    options = ["6A", "8A", "10A", "13A", "16A"]
+    assert pick_select_option(options, 12) == "10A"
+    assert pick_select_option(options, 16) == "16A"
+    assert pick_select_option(options, 0) is None
+    assert pick_select_option(["0A", "6A"], 0) == "0A"
+    assert pick_select_option(["Max"], 10) is None
+
+
+def test_plan_drops_identical_setpoint():
+    hass = _Hass({"number.wb": _State("6", {"min": 6, "max": 16})})
+    charger = ChargerActuator(hass, _spec("number.wb"))
+
+    domain, service, data, amps = charger.plan(10, now=0)
+    assert (domain, service, data, amps) == (
+        "number", "set_value", {"entity_id": "number.wb", "value": 10.0}, 10
+    )
+
+    charger.last_amps = 10
+    assert charger.plan(10, now=100) is None
+
+
+def test_plan_rate_limits_increases_only():
+    hass = _Hass({"number.wb": _State("8", {"min": 6, "max": 16})})
+    charger = ChargerActuator(hass, _spec("number.wb", min_interval_s=60))
+    charger.last_amps = 8
+    charger._last_change = 0
+
+    assert charger.plan(15, now=30) is None          # increase too soon
+    assert charger.plan(15, now=61)[3] == 15
+    assert charger.plan(6, now=31)[3] == 6           # decrease right away
+
+
+def test_select_entity_already_at_option_is_not_written():
+    hass = _Hass({"select.mg": _State("10A", {"options": ["6A", "10A", "16A"]})})
+    charger = ChargerActuator(hass, _spec("select.mg"))
+
+    assert charger.plan(10, now=0) is None
+    assert charger.last_amps == 10
+
+
+def test_zero_amps_is_not_raised_to_the_entity_minimum():
+    hass = _Hass({"number.wb": _State("8", {"min": 6, "max": 16})})
+    charger = ChargerActuator(hass, _spec("number.wb"))
+    charger.last_amps = 8
+
+    # no pause switch: nothing is written and the setpoint stays what it is
+    assert charger.plan(0, now=0) is None
+    assert charger.last_amps == 8
+
+    select = ChargerActuator(
+        _Hass({"select.mg": _State("6A", {"options": ["6A", "10A", "16A"]})}), _spec("select.mg")
+    )
+    assert select.plan(0, now=0) is None
+    assert select.last_amps is None
+
+
+def test_zero_amps_pauses_and_resumes_through_the_switch():
+    hass = _Hass({
+        "number.mg": _State("6", {"min": 6, "max": 16}),
+        "switch.mg": _State("on"),
+    })
+    charger = ChargerActuator(hass, _spec("number.mg", min_interval_s=0, pause_entity_id="switch.mg"))
+    charger.last_amps = 6
+
+    call = charger.plan(0, now=0)
+    assert call == ("switch", "turn_off", {"entity_id": "switch.mg"}, 0)
+    asyncio.run(charger.async_write(*call, now=0))
+    assert charger.last_amps == 0
+    hass.states["switch.mg"] = _State("off")
+    assert charger.plan(0, now=1) is None
+
+    # the current entity already shows 6 A, but the switch is off
+    call = charger.plan(6, now=2)
+    assert call == ("number", "set_value", {"entity_id": "number.mg", "value": 6.0}, 6)
+    asyncio.run(charger.async_write(*call, now=2))
+    assert hass.services.calls[-1] == ("switch", "turn_on", {"entity_id": "switch.mg"})
+    assert charger.last_amps == 6
+
+
+def test_last_amps_is_the_written_value():
+    hass = _Hass({"number.wb": _State("10", {"min": 8, "max": 16})})
+    charger = ChargerActuator(hass, _spec("number.wb"))
+
+    assert charger.plan(6, now=0)[3] == 8
+    hass.states["number.wb"] = _State("8", {"min": 8, "max": 16})
+    assert charger.plan(6, now=1) is None
+    assert charger.last_amps == 8
+
+
+def test_apply_writes_chargers_concurrently():
+    hass = _Hass(
+        {
+            "number.wb": _State("6", {"min": 6, "max": 16}),
+            "select.mg": _State("6A", {"options": ["6A", "10A", "16A"]}),
+        },
+        delay=0.05,
+    )
+    actuator = ChargingActuator(hass, [
+        ChargerSpec("wallbox", "number.wb", 3, 16, 0, 0),
+        ChargerSpec("mg4", "select.mg", 3, 16, 1, 0),
+    ])
+
+    async def apply_twice():
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await actuator.async_apply({"wallbox": 10, "mg4": 16})
+        elapsed = loop.time() - started
+        await actuator.async_apply({"wallbox": 10, "mg4": 16})
+        return elapsed
+
+    assert asyncio.run(apply_twice()) < 0.09
+    assert sorted(call[1] for call in hass.services.calls) == ["select_option", "set_value"]
+    assert actuator.setpoints() == {"wallbox": 10, "mg4": 16}
+    assert len(hass.services.calls) == 2
+
+
+def test_failing_write_does_not_stop_the_other_charger():
+    hass = _Hass(
+        {
+            "number.wb": _State("6", {"min": 6, "max": 16}),
+            "select.mg": _State("6A", {"options": ["6A", "10A", "16A"]}),
+        },
+        failing={"number.wb"},
+    )
+    actuator = ChargingActuator(hass, [
+        ChargerSpec("wallbox", "number.wb", 3, 16, 0, 0),
+        ChargerSpec("mg4", "select.mg", 3, 16, 1, 0),
+    ])
+
+    asyncio.run(actuator.async_apply({"wallbox": 10, "mg4": 16}))
+
+    assert actuator.setpoints() == {"wallbox": None, "mg4": 16}
+    assert actuator.chargers["wallbox"].failures == 1
+    assert actuator.chargers["mg4"].writes == 1
@@ -0,0 +1,76 @@
+from custom_components.gv_smart_home.allocation import (
+    ChargerSpec,
+    allocate,
+    amps_to_watts,
+    watts_to_amps,
+)
+from custom_components.gv_smart_home.const import (
+    ALLOCATION_POLICY_FAIR_SHARE,
+    ALLOCATION_POLICY_PRIORITY,
+)
+
+WALLBOX = ChargerSpec("wallbox", "number.wb", 3, 16, 0, 10)
+MG4 = ChargerSpec("mg4", "select.mg", 3, 16, 1, 120)
+MG4_1P = ChargerSpec("mg4", "select.mg", 1, 16, 1, 120)
+BOTH = {"wallbox": True, "mg4": True}
+
+
+def _total_w(result, chargers):
+    return sum(amps_to_watts(result[spec.name], spec.phases) for spec in chargers)
+
+
+def test_watts_to_amps_rounds_down_and_respects_minimum():
+    assert watts_to_amps(0, 3) == 0
+    assert watts_to_amps(4000, 3) == 0       # 5.8 A is below 6 A
+    assert watts_to_amps(4140, 3) == 6
+    assert watts_to_amps(7000, 3) == 10
+    assert watts_to_amps(2300, 1) == 10
+
+
+def test_priority_fills_first_charger_then_the_rest():
+    result = allocate(15000, [MG4, WALLBOX], BOTH, ALLOCATION_POLICY_PRIORITY)
+    assert result == {"mg4": 0, "wallbox": 16}     # 11040 W; 3960 W is below 6 A
+
+    result = allocate(20000, [WALLBOX, MG4], BOTH, ALLOCATION_POLICY_PRIORITY)
+    assert result == {"wallbox": 16, "mg4": 12}
+    assert _total_w(result, [WALLBOX, MG4]) <= 20000
+
+
+def test_fair_share_splits_evenly():
+    result = allocate(14000, [WALLBOX, MG4], BOTH, ALLOCATION_POLICY_FAIR_SHARE)
+    assert result == {"wallbox": 10, "mg4": 10}
+
+    # only one minimum fits: the higher priority charger gets it
+    result = allocate(5000, [WALLBOX, MG4], BOTH, ALLOCATION_POLICY_FAIR_SHARE)
+    assert result == {"wallbox": 7, "mg4": 0}
+
+
+def test_fair_share_balances_power_across_phase_counts():
+    # the single-phase MG4 takes amps until it reaches its maximum
+    # (3680 W) while the wallbox sits at its 4140 W minimum
+    result = allocate(9000, [WALLBOX, MG4_1P], BOTH, ALLOCATION_POLICY_FAIR_SHARE)
+    assert result == {"wallbox": 7, "mg4": 16}
+    assert _total_w(result, [WALLBOX, MG4_1P]) <= 9000
+
+
+def test_unavailable_chargers_get_nothing():
+    result = allocate(20000, [WALLBOX, MG4], {"wallbox": False, "mg4": True})
+    assert result == {"wallbox": 0, "mg4": 16}
+
+    assert allocate(20000, [WALLBOX, MG4], {}) == {"wallbox": 0, "mg4": 0}
+    assert allocate(-500, [WALLBOX, MG4], BOTH) == {"wallbox": 0, "mg4": 0}
+
+
+def test_never_exceeds_power_or_limits():
+    import random
+
+    rng = random.Random(7)
+    chargers = [WALLBOX, MG4_1P]
+    for _ in range(500):
+        power = rng.uniform(0, 25000)
+        for policy in (ALLOCATION_POLICY_PRIORITY, ALLOCATION_POLICY_FAIR_SHARE):
+            result = allocate(power, chargers, BOTH, policy)
+            assert _total_w(result, chargers) <= power
+            for spec in chargers:
+                amps = result[spec.name]
+                assert amps == 0 or spec.min_amps <= amps <= spec.max_amps
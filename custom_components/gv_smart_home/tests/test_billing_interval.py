@@ -0,0 +1,90 @@
+import datetime
+
+import pytest
+
+from custom_components.gv_smart_home.billing_interval import (
+    BillingIntervalTracker,
+    interval_start,
+)
+
+T0 = datetime.datetime(2025, 1, 6, 12, 0)
+
+
+def _at(seconds):
+    return T0 + datetime.timedelta(seconds=seconds)
+
+
+def test_interval_start_is_wall_clock_aligned():
+    assert interval_start(datetime.datetime(2025, 1, 6, 12, 44, 59)) == datetime.datetime(2025, 1, 6, 12, 30)
+    assert interval_start(datetime.datetime(2025, 1, 6, 12, 45)) == datetime.datetime(2025, 1, 6, 12, 45)
+
+
+def test_energy_and_rollover():
+    tracker = BillingIntervalTracker()
+    tracker.update(_at(0), -2000)
+    tracker.update(_at(450), 1000)   # export counts as zero
+
+    assert tracker.energy_ws(_at(600)) == pytest.approx(2000 * 450)
+    assert tracker.remaining_seconds(_at(600)) == 300
+
+    tracker.update(_at(960), -4000)
+    assert tracker.last_average_w == pytest.approx(1000)
+    assert tracker.energy_ws(_at(960)) == 0
+    assert tracker.energy_ws(_at(970)) == pytest.approx(40_000)
+
+
+def test_missing_start_is_filled_with_known_average():
+    tracker = BillingIntervalTracker()
+    tracker.update(_at(300), -3000)
+
+    # started mid-interval: the first 300 s are assumed at the same 3 kW
+    assert tracker.energy_ws(_at(600)) == pytest.approx(3000 * 600)
+
+
+def test_gap_realigns_to_wall_clock():
+    tracker = BillingIntervalTracker()
+    tracker.update(_at(0), -1000)
+    tracker.update(_at(3 * 900 + 60), -1000)
+
+    assert tracker.remaining_seconds(_at(3 * 900 + 60)) == 840
+
+
+def test_projection_and_headroom():
+    tracker = BillingIntervalTracker()
+    tracker.update(_at(0), -6000)
+
+    # 6 kW for 450 s, then 2 kW until the end
+    assert tracker.projected_average_w(_at(450), -2000) == pytest.approx(4000)
+
+    # 5 kW limit: 4.5 MWs budget minus 2.7 MWs used over 450 s = 4 kW
+    assert tracker.headroom_w(_at(450), 5000, -2000) == pytest.approx(2000)
+
+    # already over budget: negative headroom
+    assert tracker.headroom_w(_at(850), 5000, -6000) < 0
+
+
+def test_reads_at_one_moment_integrate_once():
+    tracker = BillingIntervalTracker()
+    tracker.update(_at(0), -2000)
+    now = _at(300)
+    tracker.update(now, -4000)
+
+    # a control tick reads several values at the moment of its sample
+    assert tracker.energy_ws(now) == pytest.approx(2000 * 300)
+    assert tracker.remaining_seconds(now) == 600
+    assert tracker.projected_average_w(now, -4000) == pytest.approx((600_000 + 4000 * 600) / 900)
+    assert tracker.energy_ws(_at(400)) == pytest.approx(600_000 + 4000 * 100)
+
+
+def test_completed_average_of_the_previous_interval():
+    tracker = BillingIntervalTracker()
+    tracker.update(_at(600), -3000)
+    tracker.update(_at(800), None)
+
+    # started mid-interval: averaged over the 200 s with data
+    assert tracker.completed_average_w(_at(900)) == pytest.approx(3000)
+    assert tracker.last_average_w == pytest.approx(3000 * 200 / 900)
+
+    # the interval before a gap is not the previous one
+    tracker.update(_at(1000), -1000)
+    assert tracker.completed_average_w(_at(3 * 900 + 60)) is None
@@ -2,7 +2,7 @@ import datetime
 import pytest
 from unittest.mock import patch
 
-from custom_components.gv_smart_home.sensor.calendar_info import (
+from custom_components.gv_smart_home.sensors.calendar_info import (
     GVSECalendarInfoSensor,
 )
 
@@ -31,7 +31,7 @@ async def test_midnight_refresh_triggers_state_update():
 
     # ---- 4) Patch correct import-path of async_track_time_change ----
     with patch(
-        "custom_components.gv_smart_home.sensor.calendar_info.async_track_time_change",
+        "custom_components.gv_smart_home.sensors.calendar_info.async_track_time_change",
         new=fake_track_time_change,
     ):
         await sensor.async_added_to_hass()
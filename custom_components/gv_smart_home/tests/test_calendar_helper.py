@@ -47,3 +47,63 @@ def test_get_next_holiday():
     next_date2, next_name2 = get_next_holiday(datetime.date(2025, 12, 31))
     assert isinstance(next_date2, datetime.date)
     assert isinstance(next_name2, str)
+
+
+def test_get_next_holiday_uses_cached_index():
+    from custom_components.gv_smart_home.helpers import calendar as cal_module
+
+    cal_module._get_holiday_index.cache_clear()
+    for day in range(1, 31):
+        get_next_holiday(datetime.date(2025, 4, day))
+        is_holiday(datetime.date(2025, 4, day))
+
+    info = cal_module._get_holiday_index.cache_info()
+    assert info.misses == 1
+    assert info.currsize <= info.maxsize
+
+
+def test_get_next_holiday_matches_linear_scan():
+    from custom_components.gv_smart_home.helpers import calendar as cal_module
+
+    date = datetime.date(2024, 1, 1)
+    while date.year < 2026:
+        holidays = cal_module._get_holidays_for_year(date.year) + \
+            cal_module._get_holidays_for_year(date.year + 1)
+        expected = next((h for h in holidays if h[0] > date), (None, None))
+        assert get_next_holiday(date) == expected
+        date += datetime.timedelta(days=1)
+
+
+def test_invalidate_block_tables_clears_holiday_caches(monkeypatch):
+    from custom_components.gv_smart_home.helpers import calendar as cal_module
+    from custom_components.gv_smart_home.helpers import (
+        get_current_block,
+        get_work_free_days,
+        invalidate_block_tables,
+    )
+
+    date = datetime.date(2025, 1, 3)  # Friday
+    assert get_current_block(date, 7) == 1
+    assert not get_work_free_days(2025)[2]
+
+    holidays = cal_module._get_holidays_for_year
+    monkeypatch.setattr(
+        cal_module,
+        "_get_holidays_for_year",
+        lambda year: sorted(holidays(year) + [(date, "Test")]),
+    )
+    invalidate_block_tables()
+
+    assert is_holiday(date)
+    assert get_work_free_days(2025)[2]
+    assert get_current_block(date, 7) == 2
+
+    monkeypatch.undo()
+    invalidate_block_tables()
+    assert get_current_block(date, 7) == 1
+
+
+def test_get_next_holiday_on_last_holiday_of_year():
+    next_date, next_name = get_next_holiday(datetime.date(2025, 12, 26))
+    assert next_date == datetime.date(2026, 1, 1)
+    assert next_name == "Novo leto"
@@ -0,0 +1,139 @@
+import asyncio
+import datetime
+
+import pytest
+
+from custom_components.gv_smart_home.charge_controller import CONTROL_INTERVAL
+from custom_components.gv_smart_home.const import (
+    CC_FAST_INTERVAL_SECONDS,
+    CC_IDLE_INTERVAL_SECONDS,
+    CONF_WB_POWER,
+)
+from custom_components.gv_smart_home.replay import ReplayEngine
+
+T0 = datetime.datetime(2025, 1, 6, 12, 0)
+NORMAL = ("normal", CONTROL_INTERVAL.total_seconds())
+FAST = ("fast", CC_FAST_INTERVAL_SECONDS)
+
+
+@pytest.fixture
+def built():
+    _, clock, _, controller = ReplayEngine({}).build(T0)
+    return clock, controller
+
+
+def _scheduled(controller):
+    delays = []
+    controller._schedule = delays.append
+    return delays
+
+
+def test_idle_without_chargers(built):
+    _, controller = built
+    assert controller.compute_next_interval(0, 1, 15, False, 30) == ("idle", CC_IDLE_INTERVAL_SECONDS)
+
+
+def test_fast_when_headroom_is_low(built):
+    _, controller = built
+    assert controller.compute_next_interval(1000, 60, 15, True, 600) == FAST
+    assert controller.compute_next_interval(5000, 60, 15, True, 600) == NORMAL
+
+
+def test_fast_near_the_end_of_the_billing_interval(built):
+    _, controller = built
+    assert controller.compute_next_interval(5000, 60, 15, True, 120) == FAST
+    assert controller.compute_next_interval(5000, 60, 15, True, 121) == NORMAL
+    assert controller.compute_next_interval(5000, 60, 15, True, None) == NORMAL
+
+
+def test_fast_before_a_block_transition(built):
+    _, controller = built
+    # at the transition and at the start of its ramp-down window
+    assert controller.compute_next_interval(5000, 2, 15, True, 600) == FAST
+    assert controller.compute_next_interval(5000, 17, 15, True, 600) == FAST
+    assert controller.compute_next_interval(5000, 15, 15, True, 600) == FAST
+    assert controller.compute_next_interval(5000, 14, 15, True, 600) == NORMAL
+    assert controller.compute_next_interval(5000, 18, 15, True, 600) == NORMAL
+
+
+def test_no_fast_cadence_if_the_block_does_not_change(built):
+    _, controller = built
+    assert controller.compute_next_interval(5000, 2, 15, True, 600, block_changes=False) == NORMAL
+    assert controller.compute_next_interval(5000, 16, 15, True, 600, block_changes=False) == NORMAL
+
+
+def test_ramp_step_scales_with_elapsed_time(built):
+    clock, controller = built
+    # first tick: a full step
+    assert controller.ramp_step_w(600) == 600
+
+    clock.set(T0 + datetime.timedelta(seconds=10))
+    assert controller.ramp_step_w(600) == 100
+
+    # at most one minute's step after a long pause
+    clock.set(T0 + datetime.timedelta(minutes=10))
+    assert controller.ramp_step_w(600) == 600
+
+
+def test_wake_is_ignored_while_stopped(built):
+    _, controller = built
+    delays = _scheduled(controller)
+
+    controller.async_wake()
+
+    assert delays == []
+    assert controller.wake_count == 0
+
+
+def test_wake_schedules_an_immediate_tick(built):
+    _, controller = built
+    controller._running = True
+    delays = _scheduled(controller)
+
+    controller.async_wake()
+
+    assert delays == [0]
+    assert controller.wake_count == 1
+
+
+def test_wake_during_a_tick_runs_the_next_tick_right_after(built):
+    _, controller = built
+    controller._running = True
+    delays = _scheduled(controller)
+
+    async def tick(_now):
+        controller.async_wake()
+        # the running tick is not interrupted
+        assert delays == []
+
+    controller.async_control_tick = tick
+    asyncio.run(controller.async_run_tick())
+    assert delays == [0]
+
+    # without a wake the next tick follows the cadence
+    controller.async_control_tick = lambda _now: asyncio.sleep(0)
+    asyncio.run(controller.async_run_tick())
+    assert delays == [0, controller.interval_s]
+
+
+def _without_power_sensor(plugged_in):
+    _, _, _, controller = ReplayEngine({CONF_WB_POWER: None}, plugged_in=plugged_in).build(T0)
+    controller.last_target_power_w = 5000
+    return controller
+
+
+def test_ev_power_without_a_sensor_is_the_written_current():
+    controller = _without_power_sensor(("wallbox",))
+    # a target alone is not drawn
+    assert controller.ev_power_w() == 0
+
+    controller.actuator.chargers["wallbox"].last_amps = 10
+    assert controller.ev_power_w() == 6900
+
+
+def test_ev_power_of_an_unavailable_charger_is_zero():
+    controller = _without_power_sensor(())
+    controller.actuator.chargers["wallbox"].last_amps = 10
+    controller._allocated_w = {"wallbox": 6900, "mg4": 4140}
+
+    assert controller.ev_power_w() == 0
@@ -0,0 +1,75 @@
+import datetime
+
+import pytest
+
+from custom_components.gv_smart_home.charge_planner import (
+    ChargeTarget,
+    plan_charging,
+    slot_blocks,
+)
+
+# index = block, W
+LIMITS = (0, 5000, 6000, 7000, 8000, 9000)
+MONDAY = datetime.datetime(2025, 1, 6, 12, 0)
+
+
+def _plan(now, departure, kwh, **kwargs):
+    kwargs.setdefault("max_power_w", 11040)
+    kwargs.setdefault("min_power_w", 4140)
+    return plan_charging(now, ChargeTarget(kwh, departure), kwh, LIMITS, **kwargs)
+
+
+def test_slot_blocks_follow_the_tariff():
+    blocks = slot_blocks(datetime.datetime(2025, 1, 6, 5, 30), 8)
+    # 05:30-06:00 block 3, 06:00-07:00 block 2, 07:00 block 1
+    assert list(blocks) == [3, 3, 2, 2, 2, 2, 1, 1]
+
+
+def test_prefers_cheapest_blocks():
+    # Monday noon until Tuesday 07:00: the night (block 3) is cheapest
+    plan = _plan(MONDAY, datetime.datetime(2025, 1, 7, 7, 0), 10)
+
+    assert plan.shortfall_kwh == 0
+    assert plan.energy_kwh == pytest.approx(10, abs=0.01)
+    for power, block in zip(plan.power_w, plan.blocks):
+        if power:
+            assert block == 3
+    # nothing during the day
+    assert plan.power_at(MONDAY) == 0
+    assert plan.power_at(datetime.datetime(2025, 1, 6, 22, 0)) > 0
+
+
+def test_respects_limit_minus_house_load():
+    departure = datetime.datetime(2025, 1, 6, 13, 0)
+    plan = _plan(MONDAY, departure, 50, house_w=[-2000] * 4)
+
+    # block 1 limit 5 kW with 2 kW house load leaves 3 kW: below the
+    # charger minimum, so nothing can be planned
+    assert plan.power_w == (0, 0, 0, 0)
+    assert plan.shortfall_kwh == pytest.approx(50)
+
+    plan = _plan(MONDAY, departure, 50, default_house_w=500)   # exporting
+    assert plan.power_w == (5000, 5000, 5000, 5000)
+
+
+def test_partial_first_slot_and_departure():
+    now = datetime.datetime(2025, 1, 6, 12, 5)
+    departure = datetime.datetime(2025, 1, 6, 12, 40)
+    plan = _plan(now, departure, 100)
+
+    assert plan.start == datetime.datetime(2025, 1, 6, 12, 0)
+    assert len(plan.power_w) == 3
+    # 10 + 15 + 10 minutes at the 5 kW block 1 limit
+    assert plan.energy_kwh == pytest.approx(5 * 35 / 60)
+    assert plan.power_at(departure) == 0
+
+
+def test_small_remainder_runs_at_charger_minimum():
+    plan = _plan(MONDAY, datetime.datetime(2025, 1, 6, 13, 0), 0.5)
+
+    assert plan.power_w[0] == 4140
+    assert sum(1 for p in plan.power_w if p) == 1
+
+
+def test_departure_in_the_past():
+    assert _plan(MONDAY, MONDAY, 10) is None
@@ -0,0 +1,101 @@
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from custom_components.gv_smart_home.charger_state import (
+    ChargerStateCache,
+    ChargerStatus,
+    evaluate_mg4,
+    evaluate_wallbox,
+)
+from custom_components.gv_smart_home.const import (
+    CONF_MG_ACTIVE,
+    CONF_MG_GUN_STATE,
+    CONF_WB_CABLE,
+    CONF_WB_POWER,
+    CONF_WB_STATUS,
+)
+from custom_components.gv_smart_home.settings import GVSettings
+
+
+def _state(value, **attributes):
+    return SimpleNamespace(state=value, attributes=attributes)
+
+
+class _States(dict):
+    def get(self, entity_id):
+        return dict.get(self, entity_id)
+
+
+SETTINGS = GVSettings.from_config({
+    CONF_WB_CABLE: "binary_sensor.wb_cable",
+    CONF_WB_STATUS: "sensor.wb_status",
+    CONF_WB_POWER: "sensor.wb_power",
+    CONF_MG_GUN_STATE: "binary_sensor.mg_gun",
+    CONF_MG_ACTIVE: "switch.mg_active",
+})
+
+
+def test_evaluate_wallbox():
+    state = evaluate_wallbox("on", "charging", 7000.0, True)
+    assert state.available and state.connected
+    assert state.state is ChargerStatus.CHARGING
+    assert state.power_w == 7000.0
+
+    state = evaluate_wallbox("off", "ready", None, True)
+    assert not state.available and not state.connected
+    assert state.reasons == ("cable_disconnected",)
+
+    state = evaluate_wallbox("on", "error", None, True)
+    assert state.connected and not state.available
+    assert state.state is ChargerStatus.IDLE
+
+    assert evaluate_wallbox(None, None, None, False).state is ChargerStatus.UNAVAILABLE
+
+
+def test_evaluate_mg4():
+    assert evaluate_mg4("on", "on").state is ChargerStatus.CHARGING
+    assert evaluate_mg4("on", "off").state is ChargerStatus.READY
+    assert evaluate_mg4(None, "off").reasons == ("gun_disconnected",)
+
+
+def test_cache_follows_events_and_reports_plug_in():
+    states = _States({
+        "binary_sensor.wb_cable": _state("off"),
+        "sensor.wb_status": _state("ready"),
+        "sensor.wb_power": _state("1.5", unit_of_measurement="kW"),
+        "binary_sensor.mg_gun": _state("unavailable"),
+    })
+    changes = []
+    handlers = []
+
+    def fake_track(hass, entity_ids, action):
+        handlers.append((entity_ids, action))
+        return lambda: None
+
+    cache = ChargerStateCache(
+        SimpleNamespace(states=states), SETTINGS,
+        lambda name, old, new: changes.append((name, new.connected)),
+    )
+    with patch(
+        "custom_components.gv_smart_home.charger_state.async_track_state_change_event",
+        new=fake_track,
+    ):
+        cache.start()
+
+    entity_ids, action = handlers[0]
+    assert set(entity_ids) == {
+        "binary_sensor.wb_cable", "sensor.wb_status", "sensor.wb_power",
+        "binary_sensor.mg_gun", "switch.mg_active",
+    }
+    assert not cache.wallbox.connected
+    assert cache.wallbox.power_w == 1500.0
+    changes.clear()
+
+    # power updates do not count as a change
+    action(SimpleNamespace(data={"entity_id": "sensor.wb_power", "new_state": _state("900")}))
+    assert cache.wallbox.power_w == 900.0
+    assert changes == []
+
+    action(SimpleNamespace(data={"entity_id": "binary_sensor.wb_cable", "new_state": _state("on")}))
+    assert cache.wallbox.available
+    assert changes == [("wallbox", True)]
@@ -0,0 +1,83 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from custom_components.gv_smart_home.coordinator import GVChargingCoordinator
+
+
+@pytest.fixture
+def coordinator():
+    entry = SimpleNamespace(entry_id="entry", data={}, options={})
+    return GVChargingCoordinator(SimpleNamespace(), entry)
+
+
+def _listen(coordinator, *keys):
+    calls = []
+    removers = [
+        coordinator.async_add_key_listener(key, lambda key=key: calls.append(key))
+        for key in keys
+    ]
+    return calls, removers
+
+
+def _set(coordinator, **values):
+    return asyncio.run(coordinator.async_set(**values))
+
+
+def test_first_value_is_published(coordinator):
+    calls, _ = _listen(coordinator, "avg_grid_power_w", "current_block")
+
+    assert _set(coordinator, avg_grid_power_w=-1000, current_block=3) == ["avg_grid_power_w", "current_block"]
+    assert calls == ["avg_grid_power_w", "current_block"]
+    assert coordinator.data == {"avg_grid_power_w": -1000, "current_block": 3}
+
+
+def test_unchanged_keys_do_not_notify(coordinator):
+    _set(coordinator, avg_grid_power_w=-1000, current_block=3)
+    calls, _ = _listen(coordinator, "avg_grid_power_w", "current_block")
+
+    assert _set(coordinator, avg_grid_power_w=-1000, current_block=2) == ["current_block"]
+    assert calls == ["current_block"]
+
+
+def test_drift_is_measured_from_the_last_published_value(coordinator):
+    # avg_grid_power_w has a 20 W deadband
+    _set(coordinator, avg_grid_power_w=-1000)
+    calls, _ = _listen(coordinator, "avg_grid_power_w")
+
+    for value in (-1015, -1020, -1010):
+        _set(coordinator, avg_grid_power_w=value)
+    assert calls == []
+    assert coordinator.data["avg_grid_power_w"] == -1000
+
+    # small steps add up against the published value
+    _set(coordinator, avg_grid_power_w=-1021)
+    assert calls == ["avg_grid_power_w"]
+    assert coordinator.data["avg_grid_power_w"] == -1021
+
+
+def test_stats_keys_use_a_20_w_band(coordinator):
+    _set(coordinator, grid_mean_5m_w=-500, grid_ewma_w=-500)
+    calls, _ = _listen(coordinator, "grid_mean_5m_w", "grid_ewma_w")
+
+    _set(coordinator, grid_mean_5m_w=-520, grid_ewma_w=-479)
+    assert calls == ["grid_ewma_w"]
+    assert coordinator.data == {"grid_mean_5m_w": -500, "grid_ewma_w": -479}
+
+
+def test_none_and_booleans_always_publish(coordinator):
+    _set(coordinator, avg_grid_power_w=-1000, charging=False)
+    calls, _ = _listen(coordinator, "avg_grid_power_w", "charging")
+
+    _set(coordinator, avg_grid_power_w=None, charging=True)
+    assert calls == ["avg_grid_power_w", "charging"]
+
+
+def test_removed_listener_is_not_called(coordinator):
+    calls, (remove_first, _) = _listen(coordinator, "current_block", "current_block")
+
+    remove_first()
+    _set(coordinator, current_block=3)
+
+    assert calls == ["current_block"]
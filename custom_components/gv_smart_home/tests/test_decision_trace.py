@@ -0,0 +1,98 @@
+import datetime
+import json
+import zlib
+from array import array
+
+import pytest
+
+from custom_components.gv_smart_home.decision_trace import (
+    FIELDS,
+    FLAG_WALLBOX_AVAILABLE,
+    DecisionTrace,
+)
+from custom_components.gv_smart_home.replay import ReplayEngine, load_series
+from custom_components.gv_smart_home.store import encode_blob
+
+CONFIG = {
+    "block_1_power": 5,
+    "block_2_power": 6,
+    "block_3_power": 7,
+    "block_4_power": 8,
+    "block_5_power": 9,
+}
+START = datetime.datetime(2025, 1, 6, 0, 0)
+
+
+def _record(trace, moment, grid_w=-1500, forecast=None, minutes_to_next=30):
+    trace.record(
+        moment, grid_w, -1500, -1400.0, forecast, 2000.0,
+        3, 2, minutes_to_next, 7000, 7000, -5500.0, 1500.0, None,
+        3500, 3500, 3000, {"wallbox": True, "mg4": False}, {"wallbox": 4, "mg4": 0},
+        "normal", 60.0,
+    )
+
+
+def test_ring_buffer_keeps_the_latest_records():
+    trace = DecisionTrace(3)
+    for minute in range(5):
+        _record(trace, START + datetime.timedelta(minutes=minute))
+
+    records = list(trace)
+    assert len(trace) == 3
+    assert [record.ts for record in records] == [
+        (START + datetime.timedelta(minutes=minute)).timestamp() for minute in (2, 3, 4)
+    ]
+    assert records[-1].charger_flags == FLAG_WALLBOX_AVAILABLE
+    assert records[-1].wallbox_amps == 4
+    assert records[-1].house_w == pytest.approx(500.0)
+    assert [record.ts for record in trace.last(2)] == [r.ts for r in records[1:]]
+
+
+def test_binary_round_trip_and_csv():
+    trace = DecisionTrace(4)
+    for minute in range(6):
+        _record(trace, START + datetime.timedelta(minutes=minute))
+    _record(trace, START + datetime.timedelta(minutes=6), grid_w=None, minutes_to_next=None)
+
+    restored = DecisionTrace.from_bytes(trace.to_bytes())
+
+    assert len(restored) == 4
+    assert restored.to_bytes() == trace.to_bytes()
+    assert restored.to_csv() == trace.to_csv()
+    lines = trace.to_csv().splitlines()
+    assert lines[0] == ",".join(("time", *FIELDS[1:]))
+    assert len(lines) == 5
+    last = dict(zip(lines[0].split(","), lines[-1].split(",")))
+    assert last["time"] == "2025-01-06T00:06:00"
+    assert last["grid_w"] == "" and last["minutes_to_next"] == "" and last["plan_power_w"] == ""
+    assert last["cadence"] == "normal"
+
+
+def test_from_bytes_rejects_other_data():
+    with pytest.raises(ValueError):
+        DecisionTrace.from_bytes(zlib.compress(b"GVRP\x01" + bytes(16)))
+
+
+def test_replay_records_every_tick_and_replays_the_trace(tmp_path):
+    t0 = START.timestamp()
+    timestamps = array("d", (t0 + i * 10 for i in range(720)))
+    powers = array("d", [-1000.0] * len(timestamps))
+
+    engine = ReplayEngine(CONFIG, plugged_in=("wallbox",), trace_capacity=1000)
+    report = engine.run(timestamps, powers)
+
+    trace = engine.trace
+    assert len(trace) == report.ticks
+    assert any(record.target_power_w > 0 for record in trace)
+    # grid power plus EV power gives back the recorded house load
+    assert all(record.house_w == pytest.approx(-1000, abs=1) for record in list(trace)[1:])
+
+    # a diagnostics download replays as the house load it traced
+    path = tmp_path / "diagnostics.json"
+    path.write_text(json.dumps({"data": {"decision_trace": {"data": encode_blob(trace.to_bytes())}}}))
+    ts2, pw2 = load_series(str(path))
+
+    assert list(ts2) == [record.ts for record in trace]
+    replayed = ReplayEngine(CONFIG, plugged_in=("wallbox",)).run(ts2, pw2)
+    assert replayed.ev_energy_kwh > 0
+    assert replayed.violations == 0
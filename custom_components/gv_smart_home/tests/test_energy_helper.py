@@ -5,7 +5,9 @@ from custom_components.gv_smart_home.helpers import (
     get_base_block,
     get_current_block,
     get_prev_next_block_info,
+    invalidate_block_tables,
 )
+from custom_components.gv_smart_home.helpers import energy as energy_module
 
 # --- Mocking imported calendar functions ---
 # We mock because real holiday/weekend logic is irrelevant for helper correctness.
@@ -25,6 +27,10 @@ def patch_calendar(monkeypatch):
         "custom_components.gv_smart_home.helpers.energy.is_holiday",
         mock_holiday,
     )
+    # Block tables are built from the (mocked) calendar functions
+    invalidate_block_tables()
+    yield
+    invalidate_block_tables()
 
 
 # ---------------------------------------------------------------------
@@ -134,3 +140,73 @@ def test_season_boundary_feb_28():
 def test_season_boundary_mar_1():
     date = datetime.date(2024, 3, 1)
     assert get_current_block(date, 7) == 2  # low season workday (base=1 +1)
+
+
+# ---------------------------------------------------------------------
+# precomputed block tables
+# ---------------------------------------------------------------------
+
+def test_block_table_matches_rules(monkeypatch):
+    monkeypatch.setattr(
+        "custom_components.gv_smart_home.helpers.energy.is_weekend",
+        lambda d: d.weekday() >= 5,
+    )
+    invalidate_block_tables()
+
+    date = datetime.date(2024, 1, 1)
+    while date.year == 2024:
+        for hour in range(24):
+            assert get_current_block(date, hour) == energy_module._compute_block(date, hour)
+        date += datetime.timedelta(days=1)
+
+
+def test_blocks_for_today_uses_table():
+    date = datetime.date(2024, 12, 5)
+    blocks = energy_module.get_blocks_for_today(date)
+    assert blocks == [get_current_block(date, hour) for hour in range(24)]
+
+
+def test_block_table_year_rollover():
+    now = datetime.datetime(2024, 12, 31, 23, 30)
+    info = get_prev_next_block_info(now)
+    assert info["next_block"] == energy_module._compute_block(datetime.date(2025, 1, 1), 0)
+    assert 2024 in energy_module._BLOCK_TABLES
+    assert 2025 in energy_module._BLOCK_TABLES
+
+
+def test_block_tables_are_bounded():
+    for year in range(2000, 2020):
+        get_current_block(datetime.date(year, 6, 1), 12)
+    assert len(energy_module._BLOCK_TABLES) <= energy_module._BLOCK_TABLES_MAX_YEARS
+    assert 2019 in energy_module._BLOCK_TABLES
+
+
+def test_block_table_for_year_does_not_evict():
+    for year in range(2020, 2020 + energy_module._BLOCK_TABLES_MAX_YEARS):
+        get_current_block(datetime.date(year, 6, 1), 12)
+    cached = dict(energy_module._BLOCK_TABLES)
+
+    assert energy_module.block_table_for_year(2020) is cached[2020]
+    first_ordinal, table = energy_module.block_table_for_year(1990)
+    assert first_ordinal == datetime.date(1990, 1, 1).toordinal()
+    assert len(table) == 365 * 24
+    assert energy_module._BLOCK_TABLES == cached
+
+
+def test_invalidate_block_tables(monkeypatch):
+    date = datetime.date(2024, 12, 5)
+    assert get_current_block(date, 7) == 1
+
+    monkeypatch.setattr(
+        "custom_components.gv_smart_home.helpers.energy.is_holiday",
+        lambda d: True,
+    )
+    # Cached table still reflects the old rules until invalidated
+    assert get_current_block(date, 7) == 1
+    invalidate_block_tables()
+    assert get_current_block(date, 7) == 2
+
+
+def test_current_block_invalid_hour():
+    with pytest.raises(ValueError):
+        get_current_block(datetime.date(2024, 12, 5), 24)
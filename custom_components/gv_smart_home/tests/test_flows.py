@@ -0,0 +1,10 @@
+import importlib
+
+import pytest
+
+
+@pytest.mark.parametrize("module", ["config_flow", "options_flow"])
+def test_flows_import_from_the_package(module):
+    # Home Assistant loads the integration as custom_components.gv_smart_home
+    flow = importlib.import_module(f"custom_components.gv_smart_home.{module}")
+    assert flow.schema_step_blocks.__module__ == "custom_components.gv_smart_home.flow_schema"
@@ -0,0 +1,71 @@
+import datetime
+import math
+from array import array
+
+import pytest
+
+from custom_components.gv_smart_home.const import CONF_INSTRUMENTATION
+from custom_components.gv_smart_home.instrumentation import (
+    SAMPLE_GAPS,
+    SAMPLES_UNAVAILABLE,
+    STAGE_ACTUATION,
+    STAGE_BLOCK_LOOKUP,
+    STAGE_CONTROL_TICK,
+    STAGE_SAMPLE,
+    LatencyHistogram,
+)
+from custom_components.gv_smart_home.replay import ReplayEngine
+
+CONFIG = {
+    "block_1_power": 5,
+    "block_2_power": 6,
+    "block_3_power": 7,
+    "block_4_power": 8,
+    "block_5_power": 9,
+}
+START = datetime.datetime(2025, 1, 6, 0, 0)
+
+
+def test_histogram_buckets_and_quantiles():
+    histogram = LatencyHistogram()
+    for _ in range(90):
+        histogram.record(15e-6)     # 20 µs bucket
+    for _ in range(10):
+        histogram.record(3e-3)      # 5 ms bucket
+    histogram.record(60.0)          # open bucket
+
+    assert histogram.count == 101
+    assert histogram.quantile_us(0.5) == 20
+    assert histogram.quantile_us(0.95) == 5000
+    assert histogram.quantile_us(1.0) == pytest.approx(60e6)
+
+    data = histogram.as_dict()
+    assert data["buckets"] == {"20": 90, "5000": 10, "inf": 1}
+    assert data["max_us"] == pytest.approx(60e6)
+
+
+def _series_with_gap():
+    # 30 minutes every 10 s, with 2 unavailable samples and a 5 minute gap
+    t0 = START.timestamp()
+    times = [t0 + i * 10 for i in range(180) if not 60 <= i < 90]
+    powers = [math.nan if i in (10, 11) else -1500.0 for i in range(len(times))]
+    return array("d", times), array("d", powers)
+
+
+def test_enabled_records_stages_and_counters():
+    report = ReplayEngine({**CONFIG, CONF_INSTRUMENTATION: True}).run(*_series_with_gap())
+    stages = report.instrumentation["stages"]
+    counters = report.instrumentation["counters"]
+
+    for stage in (STAGE_SAMPLE, STAGE_BLOCK_LOOKUP, STAGE_CONTROL_TICK, STAGE_ACTUATION):
+        assert stages[stage]["count"] > 0
+    assert stages[STAGE_SAMPLE]["count"] == 150
+    assert counters[SAMPLES_UNAVAILABLE] == 2
+    assert counters[SAMPLE_GAPS] == 1
+    assert "actuation" in report.format()
+
+
+def test_disabled_records_nothing():
+    report = ReplayEngine(CONFIG).run(*_series_with_gap())
+
+    assert report.instrumentation == {}
@@ -0,0 +1,99 @@
+import datetime
+import pytest
+
+from custom_components.gv_smart_home.load_forecaster import (
+    LoadForecaster,
+    SLOTS_PER_WEEK,
+    slot_of,
+)
+
+
+MONDAY = datetime.datetime(2025, 1, 6, 0, 0)
+
+
+def test_slot_of_week():
+    assert slot_of(MONDAY) == 0
+    assert slot_of(MONDAY + datetime.timedelta(minutes=14)) == 0
+    assert slot_of(MONDAY + datetime.timedelta(minutes=15)) == 1
+    assert slot_of(datetime.datetime(2025, 1, 12, 23, 59)) == SLOTS_PER_WEEK - 1
+
+
+def test_predict_needs_learned_slots():
+    fc = LoadForecaster()
+    assert fc.predict(MONDAY, 30) is None
+
+    fc.learn(0, -1000)
+    assert fc.slot_stats(0) is None  # a single observation is not trusted yet
+
+
+def test_mean_variance_and_prediction():
+    fc = LoadForecaster()
+    for value in (-1000, -3000, -1000, -3000):
+        fc.learn(0, value)
+        fc.learn(1, -500)
+
+    stats = fc.slot_stats(0)
+    assert stats["count"] == 4
+    assert -3000 < stats["mean"] < -1000
+    assert stats["std"] > 0
+    assert stats["q10"] <= stats["q50"] <= stats["q90"]
+
+    # 20 minutes ahead from 00:05: 10 min of slot 0, 10 min of slot 1
+    now = MONDAY + datetime.timedelta(minutes=5)
+    expected = (stats["mean"] * 10 + fc.slot_stats(1)["mean"] * 10) / 20
+    assert fc.predict(now, 20) == pytest.approx(expected)
+
+
+def test_quantiles_track_distribution():
+    import random
+
+    rng = random.Random(1)
+    fc = LoadForecaster()
+    for _ in range(2000):
+        fc.learn(5, rng.uniform(-4000, 0))
+
+    stats = fc.slot_stats(5)
+    assert stats["q10"] == pytest.approx(-3600, abs=500)
+    assert stats["q90"] == pytest.approx(-400, abs=500)
+
+
+def test_round_trip():
+    fc = LoadForecaster()
+    for value in (-1000, -2000, -1500):
+        fc.learn(42, value)
+
+    restored = LoadForecaster()
+    restored.restore(fc.to_bytes())
+    assert restored.slot_stats(42) == fc.slot_stats(42)
+
+
+@pytest.mark.parametrize("blob", [b"not zlib", b"x\x9c\x03\x00"])
+def test_controller_discards_corrupt_profile(blob):
+    from custom_components.gv_smart_home.replay import ReplayEngine
+    from custom_components.gv_smart_home.store import encode_blob
+
+    _, _, _, controller = ReplayEngine({}).build(datetime.datetime(2025, 1, 6))
+    controller.restore({"load_profile": encode_blob(blob)}, saved_at=None)
+
+    assert controller.forecaster.slot_stats(0) is None
+
+
+def test_controller_learns_the_billed_average_plus_ev_energy():
+    from custom_components.gv_smart_home.replay import ReplayEngine
+
+    hass, _, sampler, controller = ReplayEngine({}).build(MONDAY)
+    hass.set_state(controller.coordinator.settings.wb_power, "1000")
+    controller.charger_cache.refresh()
+
+    for week in range(2):
+        start = MONDAY + datetime.timedelta(days=7 * week, hours=12)
+        for minute in range(-1, 16):
+            moment = start + datetime.timedelta(minutes=minute)
+            # 3 kW import, 1 kW of it the EV; a spike in the last minute
+            sampler.billing.update(moment, -9000 if minute == 14 else -3000)
+            controller.learn_load_profile(moment, controller.ev_power_w())
+
+    # billed average (14 * 3 + 9) / 15 = 3.4 kW, minus the EV's 1 kW
+    stats = controller.forecaster.slot_stats(slot_of(MONDAY.replace(hour=12)))
+    assert stats["count"] == 2
+    assert stats["mean"] == pytest.approx(-2400)
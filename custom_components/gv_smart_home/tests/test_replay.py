@@ -0,0 +1,121 @@
+import datetime
+from array import array
+
+import pytest
+
+from custom_components.gv_smart_home.charge_planner import ChargeTarget
+from custom_components.gv_smart_home.const import CONF_WB_POWER
+from custom_components.gv_smart_home.replay import (
+    ReplayEngine,
+    read_binary,
+    read_csv,
+    write_binary,
+)
+
+CONFIG = {
+    "block_1_power": 5,
+    "block_2_power": 6,
+    "block_3_power": 7,
+    "block_4_power": 8,
+    "block_5_power": 9,
+}
+START = datetime.datetime(2025, 1, 6, 0, 0)
+
+
+def _series(hours, power_w, step_s=10):
+    t0 = START.timestamp()
+    n = int(hours * 3600 / step_s)
+    return array("d", (t0 + i * step_s for i in range(n))), array("d", [power_w] * n)
+
+
+def test_binary_round_trip(tmp_path):
+    timestamps, powers = _series(1, -1234.5)
+    path = tmp_path / "grid.bin"
+
+    write_binary(str(path), timestamps, powers)
+    ts2, pw2 = read_binary(str(path))
+
+    assert list(ts2) == list(timestamps)
+    assert list(pw2) == list(powers)
+
+
+def test_read_csv_skips_header_and_parses_iso(tmp_path):
+    path = tmp_path / "grid.csv"
+    path.write_text(
+        "timestamp,grid_power_w\n"
+        "2025-01-06T00:00:00,-1500\n"
+        "2025-01-06T00:00:10,unavailable\n"
+    )
+
+    timestamps, powers = read_csv(str(path))
+
+    assert list(timestamps) == [START.timestamp(), START.timestamp() + 10]
+    assert powers[0] == -1500
+    assert powers[1] != powers[1]   # NaN
+
+
+def test_replay_house_load_only():
+    # no car plugged in: only the house load is imported
+    timestamps, powers = _series(2, -2000)
+
+    report = ReplayEngine(CONFIG, plugged_in=()).run(timestamps, powers)
+
+    assert report.samples == len(timestamps)
+    assert report.ticks > 0
+    assert report.ev_energy_kwh == 0
+    assert report.import_energy_kwh == pytest.approx(4.0, rel=0.01)
+    assert report.peak_kw[3] == pytest.approx(2.0)
+    assert report.violations == 0
+    assert report.setpoint_writes["wallbox"] == 0
+
+
+def test_replay_charges_ev_within_limit():
+    timestamps, powers = _series(4, -1000)
+
+    report = ReplayEngine(CONFIG, plugged_in=("wallbox",)).run(timestamps, powers)
+
+    assert report.ev_energy_kwh > 0
+    assert report.setpoint_writes["wallbox"] > 0
+    assert report.setpoint_writes["mg4"] == 0
+    assert report.violations == 0
+    for block, peak in report.peak_kw.items():
+        assert peak <= report.limit_kw[block]
+
+
+def test_replay_follows_charge_target():
+    # Monday 00:00-12:00: the night is block 3, the day from 07:00 block 1
+    timestamps, powers = _series(12, -1000)
+    target = ChargeTarget(10.0, START + datetime.timedelta(hours=12))
+
+    report = ReplayEngine(CONFIG, plugged_in=("wallbox",), charge_target=target).run(
+        timestamps, powers
+    )
+
+    # the target is met in the cheap night hours, then charging stops
+    assert report.ev_energy_kwh == pytest.approx(10.0, abs=0.5)
+    assert report.violations == 0
+    assert 1 not in report.peak_kw or report.peak_kw[1] == pytest.approx(1.0, abs=0.05)
+
+
+def test_no_target_without_a_charger_or_power_sensor():
+    # without measured EV power the target must not feed back on itself
+    timestamps, powers = _series(3, -1000)
+    engine = ReplayEngine({**CONFIG, CONF_WB_POWER: None}, plugged_in=(), trace_capacity=2000)
+
+    report = engine.run(timestamps, powers)
+
+    assert report.ev_energy_kwh == 0
+    records = list(engine.trace)
+    assert records
+    assert all(record.ev_power_w == 0 and record.target_power_w == 0 for record in records)
+
+
+def test_replay_throughput():
+    # a day at the fast cadence; about 150 us per tick here, including the
+    # samples, so a year of 10-second data takes 6-7 minutes
+    timestamps, powers = _series(24, -1500)
+
+    report = ReplayEngine(CONFIG, plugged_in=("wallbox",)).run(timestamps, powers)
+
+    assert report.ticks > 5000
+    assert report.wall_seconds / report.ticks < 500e-6
@@ -0,0 +1,222 @@
+import datetime
+import pytest
+
+from custom_components.gv_smart_home.sample_buffer import SampleBuffer
+
+
+T0 = datetime.datetime(2025, 1, 6, 12, 0, 0)
+
+
+def _append(buf, seconds, power, block=1):
+    buf.append(
+        ts=T0 + datetime.timedelta(seconds=seconds),
+        grid_power_w=power,
+        current_block=block,
+        next_block=block + 1,
+        minutes_to_next=30,
+        current_block_limit_w=5000,
+        next_block_limit_w=6000,
+    )
+
+
+def _ts(seconds):
+    return T0 + datetime.timedelta(seconds=seconds)
+
+
+def test_empty_buffer():
+    buf = SampleBuffer(3)
+    window = buf.add_window(60)
+    assert not buf
+    assert len(buf) == 0
+    assert window.sample_mean(T0) is None
+    assert window.mean(T0) is None
+    with pytest.raises(IndexError):
+        buf[-1]
+
+
+def test_latest_sample_has_dict_shape():
+    buf = SampleBuffer(3)
+    _append(buf, 0, -1200, block=2)
+
+    latest = buf[-1]
+    assert latest == {
+        "ts": T0,
+        "grid_power_w": -1200,
+        "current_block": 2,
+        "next_block": 3,
+        "minutes_to_next": 30,
+        "current_block_limit_w": 5000,
+        "next_block_limit_w": 6000,
+    }
+
+
+def test_overwrites_oldest_and_keeps_running_mean():
+    buf = SampleBuffer(3)
+    window = buf.add_window(3600)
+    for i, power in enumerate([100, 200, 300, 400, 500]):
+        _append(buf, i * 10, power)
+
+    assert len(buf) == 3
+    assert [s["grid_power_w"] for s in buf] == [300, 400, 500]
+    assert window.sample_mean(_ts(40)) == 400
+
+
+def test_unknown_power_is_excluded_from_mean():
+    buf = SampleBuffer(4)
+    window = buf.add_window(3600)
+    _append(buf, 0, 100)
+    _append(buf, 10, None)
+    _append(buf, 20, 300)
+
+    assert window.sample_mean(_ts(20)) == 200
+    assert buf[1]["grid_power_w"] is None
+
+
+def test_window_drops_old_samples():
+    buf = SampleBuffer(10)
+    window = buf.add_window(60)
+    for i, power in enumerate([100, 200, 300, 400]):
+        _append(buf, i * 60, power)
+
+    assert window.sample_mean(_ts(180)) == 350
+    assert window.sample_mean(_ts(3600)) is None
+
+
+def test_time_weighted_mean_holds_values():
+    buf = SampleBuffer(10)
+    window = buf.add_window(60)
+    _append(buf, 0, 1000)
+    _append(buf, 10, 4000)   # 1000 W held for 10 s
+    _append(buf, 40, 0)      # 4000 W held for 30 s
+
+    # 0 W held for 20 s until "now"
+    assert window.mean(_ts(60)) == pytest.approx((1000 * 10 + 4000 * 30) / 60)
+
+
+def test_time_weighted_mean_clips_window_start():
+    buf = SampleBuffer(10)
+    window = buf.add_window(100)
+    _append(buf, 0, 1000)
+    _append(buf, 100, 3000)
+
+    # window 50..150: 1000 W for 50 s, 3000 W for 50 s
+    assert window.mean(_ts(150)) == pytest.approx(2000)
+
+    # window 120..220: the boundary sample is no longer needed
+    assert window.mean(_ts(220)) == pytest.approx(3000)
+
+
+def test_time_weighted_mean_skips_unknown_periods():
+    buf = SampleBuffer(10)
+    window = buf.add_window(60)
+    _append(buf, 0, 1000)
+    _append(buf, 10, None)
+    _append(buf, 50, 2000)
+
+    assert window.mean(_ts(60)) == pytest.approx((1000 * 10 + 2000 * 10) / 20)
+
+
+def test_time_weighted_mean_survives_overwrite():
+    buf = SampleBuffer(3)
+    window = buf.add_window(30)
+    for i, power in enumerate([100, 200, 300, 400, 500]):
+        _append(buf, i * 10, power)
+
+    # buffer holds 300@20, 400@30, 500@40
+    assert window.mean(_ts(50)) == pytest.approx(400)
+
+
+def test_windows_match_brute_force():
+    import random
+
+    rng = random.Random(42)
+    buf = SampleBuffer(50)
+    windows = {span: buf.add_window(span) for span in (30, 120, 400)}
+
+    t = 0.0
+    history = []
+    for _ in range(300):
+        t += rng.uniform(1, 15)
+        power = None if rng.random() < 0.1 else rng.randint(-8000, 3000)
+        _append(buf, t, power)
+        history.append((t, power))
+        kept = history[-buf.capacity:]
+
+        now_s = t + rng.uniform(0, 5)
+        for span, window in windows.items():
+            since = now_s - span
+            # values in effect inside (since, now]
+            inside = [p for i, (ts, p) in enumerate(kept)
+                      if p is not None and (i + 1 == len(kept) or kept[i + 1][0] > since)]
+            if inside:
+                assert window.max(_ts(now_s)) == max(inside)
+                assert window.min(_ts(now_s)) == min(inside)
+
+            taken = [p for ts, p in kept if p is not None and ts >= since]
+            mean = window.sample_mean(_ts(now_s))
+            if taken:
+                assert mean == pytest.approx(sum(taken) / len(taken))
+            else:
+                assert mean is None
+
+
+def test_window_time_weighted_mean():
+    buf = SampleBuffer(10)
+    window = buf.add_window(60)
+    _append(buf, 0, 1000)
+    _append(buf, 30, 4000)
+    _append(buf, 90, 0)
+
+    # window 40..100: 4000 W for 50 s, 0 W for 10 s
+    assert window.mean(_ts(100)) == pytest.approx(4000 * 50 / 60)
+    assert window.max(_ts(100)) == 4000
+    assert window.min(_ts(100)) == 0
+
+
+def test_time_ewma_decays_with_time():
+    from custom_components.gv_smart_home.sample_buffer import TimeEwma
+    import math
+
+    ewma = TimeEwma(tau_seconds=60)
+    assert ewma.value(_ts(0)) is None
+
+    ewma.update(_ts(0), 0)
+    ewma.update(_ts(10), 1000)
+    assert ewma.value(_ts(10)) == 0
+    assert ewma.value(_ts(70)) == pytest.approx(1000 * (1 - math.exp(-1)))
+
+
+def test_serialization_round_trip_drops_old_samples():
+    buf = SampleBuffer(3)
+    for i, power in enumerate([100, None, 300, 400]):
+        _append(buf, i * 60, power, block=2)
+
+    blob = buf.to_bytes()
+
+    restored = SampleBuffer(10)
+    window = restored.add_window(600)
+    kept = restored.restore(blob, not_before=_ts(120))
+
+    assert kept == 2
+    assert [s["grid_power_w"] for s in restored] == [300, 400]
+    assert restored[-1] == buf[-1]
+    assert window.max(_ts(200)) == 400
+
+
+def test_restore_rejects_unknown_version():
+    import zlib
+
+    buf = SampleBuffer(3)
+    with pytest.raises(ValueError):
+        buf.restore(zlib.compress(b"\x09\x00\x00\x00\x00"))
+
+
+@pytest.mark.parametrize("blob", [b"not zlib", b"x\x9c\x03\x00"])
+def test_sampler_discards_corrupt_history(blob):
+    from custom_components.gv_smart_home.replay import ReplayEngine
+    from custom_components.gv_smart_home.store import encode_blob
+
+    _, _, sampler, _ = ReplayEngine({}).build(T0)
+    sampler.restore({"samples": encode_blob(blob)})
+
+    assert len(sampler.samples) == 0
@@ -0,0 +1,72 @@
+import datetime
+
+import pytest
+
+from custom_components.gv_smart_home.helpers import (
+    get_block_transitions,
+    get_current_block,
+    get_tariff_schedule,
+    get_work_free_days,
+    is_holiday,
+    is_weekend,
+    schedule_as_csv,
+    schedule_as_dict,
+)
+
+
+def test_work_free_days_match_calendar():
+    flags = get_work_free_days(2025)
+    first = datetime.date(2025, 1, 1)
+
+    assert len(flags) == 365
+    for day in range(365):
+        date = first + datetime.timedelta(days=day)
+        assert flags[day] == (is_weekend(date) or is_holiday(date))
+
+
+def test_schedule_spans_years_and_matches_lookups():
+    start = datetime.date(2024, 12, 30)
+    end = datetime.date(2026, 1, 2)
+
+    schedule = get_tariff_schedule(start, end)
+
+    assert schedule.days == (end - start).days + 1
+    assert schedule.end == end
+    assert len(schedule.blocks) == schedule.days * 24
+    for day in range(schedule.days):
+        date = start + datetime.timedelta(days=day)
+        for hour in (0, 6, 7, 14, 16, 20, 22):
+            assert schedule.blocks[day * 24 + hour] == get_current_block(date, hour)
+
+
+def test_schedule_rejects_reversed_range():
+    with pytest.raises(ValueError):
+        get_tariff_schedule(datetime.date(2025, 2, 1), datetime.date(2025, 1, 1))
+
+
+def test_transitions():
+    # Monday, high season workday
+    schedule = get_tariff_schedule(datetime.date(2025, 1, 6), datetime.date(2025, 1, 6))
+
+    transitions = get_block_transitions(schedule)
+
+    assert transitions[0] == (datetime.datetime(2025, 1, 6, 0, 0), 3)
+    assert [block for _, block in transitions] == [3, 2, 1, 2, 1, 2, 3]
+    assert transitions[-1][0] == datetime.datetime(2025, 1, 6, 22, 0)
+
+
+def test_dict_and_csv_forms():
+    # Friday and Saturday
+    schedule = get_tariff_schedule(datetime.date(2025, 1, 10), datetime.date(2025, 1, 11))
+
+    data = schedule_as_dict(schedule)
+    assert data["days"] == 2
+    assert data["blocks"] == ["333333211111112211112233", "444444322222223322223344"]
+    assert data["work_free"] == "01"
+    assert data["transitions"][0] == ["2025-01-10T00:00", 3]
+
+    lines = schedule_as_csv(schedule).splitlines()
+    assert lines[0] == "date,hour,block,work_free"
+    assert len(lines) == 1 + 48
+    assert lines[1] == "2025-01-10,0,3,0"
+    assert lines[-1] == "2025-01-11,23,4,1"
@@ -0,0 +1,73 @@
+import asyncio
+import datetime
+
+from custom_components.gv_smart_home.const import SCHEDULER_TICK_SECONDS
+from custom_components.gv_smart_home.replay import ReplayFleet
+
+CONFIG = {
+    "block_1_power": 5,
+    "block_2_power": 6,
+    "block_3_power": 7,
+    "block_4_power": 8,
+    "block_5_power": 9,
+}
+START = datetime.datetime(2025, 1, 6, 12, 0)
+ENTRIES = 50
+SITES = 10
+# Event loop time per scheduler tick for the whole fleet, about 5x what
+# it takes here: sampling only, and sampling plus every entry's control
+SAMPLE_TICK_BUDGET_MS = 5
+CONTROL_TICK_BUDGET_MS = 40
+
+
+def test_fifty_entries_share_one_tick(record_property):
+    fleet = ReplayFleet(CONFIG, ENTRIES, SITES, START)
+    reads = []
+    states_get = fleet.hass.states.get
+
+    def counting_get(entity_id, default=None):
+        reads.append(entity_id)
+        return states_get(entity_id, default)
+
+    fleet.hass.states.get = counting_get
+
+    async def run():
+        await fleet.async_start()
+        durations = []
+        for _ in range(6):
+            reads.clear()
+            durations.append(await fleet.async_tick(SCHEDULER_TICK_SECONDS))
+            # one read per site, not per entry
+            assert len([r for r in reads if "grid" in r]) == SITES
+        return durations
+
+    durations = asyncio.run(run())
+
+    for sampler, controller in fleet.entries:
+        assert len(sampler.samples) == 6
+        # the first control tick is due after a minute
+        assert controller.tick_count == 1
+        assert controller.coordinator.data["available_power_w"] > 0
+
+    # the first five ticks only sample, the sixth also runs the control ticks
+    sample_ms = sum(durations[:5]) / 5 * 1000
+    control_ms = durations[5] * 1000
+    record_property("sample_tick_ms", round(sample_ms, 2))
+    record_property("control_tick_ms", round(control_ms, 2))
+    assert sample_ms < SAMPLE_TICK_BUDGET_MS, f"sampling tick took {sample_ms:.2f} ms"
+    assert control_ms < CONTROL_TICK_BUDGET_MS, f"control tick took {control_ms:.2f} ms"
+
+
+def test_cancelled_timer_does_not_run():
+    fleet = ReplayFleet(CONFIG, 2, 1, START)
+
+    async def run():
+        await fleet.async_start()
+        fleet.entries[0][1].stop()
+        for _ in range(6):
+            await fleet.async_tick(SCHEDULER_TICK_SECONDS)
+
+    asyncio.run(run())
+
+    assert fleet.entries[0][1].tick_count == 0
+    assert fleet.entries[1][1].tick_count == 1
@@ -0,0 +1,45 @@
+import asyncio
+import sys
+from types import SimpleNamespace
+
+from custom_components.gv_smart_home import sensor
+from custom_components.gv_smart_home.const import DOMAIN
+from custom_components.gv_smart_home.coordinator import GVChargingCoordinator
+
+INFO_MODULES = (
+    "custom_components.gv_smart_home.sensors.calendar_info",
+    "custom_components.gv_smart_home.sensors.energy_info",
+)
+
+
+def test_info_sensors_are_imported_in_the_executor(monkeypatch):
+    for module in INFO_MODULES:
+        monkeypatch.delitem(sys.modules, module, raising=False)
+    entry = SimpleNamespace(entry_id="entry", data={}, options={}, async_on_unload=lambda _unsub: None)
+    imported = []
+    added = []
+
+    async def import_job(func, name):
+        imported.append(name)
+        return func(name)
+
+    async def run():
+        tasks = []
+        hass = SimpleNamespace(
+            async_add_import_executor_job=import_job,
+            async_create_task=lambda coro: tasks.append(asyncio.ensure_future(coro)),
+        )
+        coordinator = GVChargingCoordinator(hass, entry)
+        hass.data = {DOMAIN: {"entry": {"coordinator": coordinator}}}
+        await sensor.async_setup_entry(hass, entry, added.extend)
+        # only the coordinator sensors are set up before startup
+        assert not any(module in sys.modules for module in INFO_MODULES)
+        await asyncio.gather(*tasks)
+
+    asyncio.run(run())
+
+    assert imported == list(INFO_MODULES)
+    assert [type(entity).__name__ for entity in added[-2:]] == [
+        "GVSECalendarInfoSensor",
+        "GVSEnergyInfoSensor",
+    ]